@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Compare the vectorized A/B simulator with the original per-iteration loop.
+
+Times one ``run_ab_test``-style simulation per product with the old loop and
+then the whole catalog in a single ``simulate_ab_tests`` call.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from scipy import stats
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import price_optimizer as po  # noqa: E402
+
+
+def legacy_run_ab_test(current_price, new_price, unit_cost, avg_competitor,
+                       demand_base=100.0, elasticity=1.2, saturation=1.0, noise=0.1, n=1000):
+    """The loop ``run_ab_test`` used before it was vectorized."""
+    profits_control = []
+    profits_test = []
+    for _ in range(n):
+        base_a = demand_base * saturation / (1 + (current_price / max(avg_competitor, 0.01)) ** elasticity)
+        base_b = demand_base * saturation / (1 + (new_price / max(avg_competitor, 0.01)) ** elasticity)
+        demand_a = base_a * max(0.0, random.gauss(1.0, noise))
+        demand_b = base_b * max(0.0, random.gauss(1.0, noise))
+        profits_control.append(demand_a * (current_price - unit_cost))
+        profits_test.append(demand_b * (new_price - unit_cost))
+    mean_a = statistics.mean(profits_control)
+    mean_b = statistics.mean(profits_test)
+    _, p_value = stats.ttest_ind(profits_test, profits_control, equal_var=False)
+    return mean_b - mean_a, float(p_value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--n", type=int, default=1000, help="simulated customers per arm")
+    parser.add_argument("--bootstrap", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    avg = rng.uniform(10, 150, args.products)
+    cur = avg * rng.uniform(0.6, 1.5, args.products)
+    new = cur * rng.uniform(0.8, 1.3, args.products)
+    unit = cur * rng.uniform(0.2, 0.6, args.products)
+
+    random.seed(args.seed)
+    start = time.perf_counter()
+    old = [legacy_run_ab_test(c, p, u, a, n=args.n) for c, p, u, a in zip(cur, new, unit, avg)]
+    t_old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = po.simulate_ab_tests(cur, new, unit, avg, n=args.n, seed=args.seed)
+    t_new = time.perf_counter() - start
+
+    old_delta = np.array([d for d, _ in old])
+    print(f"products:          {args.products} x {args.n} draws per arm")
+    print(f"per-iteration loop: {t_old:8.3f} s")
+    print(f"vectorized:         {t_new:8.3f} s ({t_old / t_new:.1f}x)")
+    # different random streams, so the deltas agree only up to the noise
+    rel = np.abs(result["profit_delta"] - old_delta) / np.maximum(np.abs(old_delta), 1.0)
+    print(f"median relative delta difference: {np.median(rel):.3%}")
+    if args.bootstrap:
+        start = time.perf_counter()
+        boot = po.simulate_ab_tests(cur, new, unit, avg, n=args.n, seed=args.seed, bootstrap=args.bootstrap)
+        t_boot = time.perf_counter() - start
+        width = np.median(boot["ci_high"] - boot["ci_low"])
+        print(f"with {args.bootstrap} bootstrap resamples: {t_boot:.3f} s, median CI width {width:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Time the Bayesian catalog search with different numbers of worker processes.
+
+Builds a synthetic catalog (several products per category, with shared
+competitor prices) and runs ``suggest_prices`` with 1, 2, 4, ... workers up to
+the core count. It reports the wall time, the speedup and whether every run
+returns the same prices.
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import price_optimizer as po  # noqa: E402
+
+
+def make_catalog(categories, per_category, seed):
+    rng = np.random.default_rng(seed)
+    names = list(po.PROFIT_MARGINS)
+    products = []
+    for c in range(categories):
+        category = names[c % len(names)]
+        avg = rng.uniform(15, 80)
+        prices = list(np.maximum(1.0, rng.normal(avg, avg * 0.4, 150)))
+        for i in range(per_category):
+            cur = avg * rng.uniform(0.9, 1.3)
+            products.append((f"{category} {c}-{i}", category, prices, cur, cur * rng.uniform(0.25, 0.5)))
+    return products
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--categories", type=int, default=8)
+    parser.add_argument("--per-category", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    warnings.simplefilter("ignore")  # skopt warns about repeated boundary points
+
+    products = make_catalog(args.categories, args.per_category, args.seed)
+    counts = [1]
+    while counts[-1] * 2 <= (os.cpu_count() or 1):
+        counts.append(counts[-1] * 2)
+
+    print(f"products: {len(products)}, cores: {os.cpu_count()}")
+    baseline = reference = None
+    for workers in counts:
+        start = time.perf_counter()
+        prices = po.suggest_prices(products, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        reference = reference or prices
+        same = "same prices" if prices == reference else "PRICES DIFFER"
+        print(f"workers={workers:3d}  {elapsed:7.2f} s  {baseline / elapsed:5.2f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Time the typed catalog loader against the old per-module parsing.
+
+Writes a synthetic overview (Windows-1252, padded headers, ``" € 1,234.50 "``
+prices) and a matching ``recommended_prices.csv`` with ``--rows`` products.
+It times the old ``dashboard.load_data`` and ``price_optimizer.read_overview``
+code against ``catalog.pricing_frame`` and ``catalog.read_overview``, and the
+table formatting with ``.apply`` lambdas against ``render_table``'s. It also
+checks that the results agree.
+"""
+import argparse
+import csv
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import catalog  # noqa: E402
+
+
+def write_files(tmp: Path, rows: int, seed: int):
+    rng = np.random.default_rng(seed)
+    current = rng.uniform(5, 2500, rows).round(2)
+    cost = (current * rng.uniform(0.2, 0.6, rows)).round(2)
+    recommended = (current * rng.uniform(0.7, 1.3, rows)).round(2)
+    names = [f"Product {i} (Incl. cork casing)" for i in range(rows)]
+    ids = [f"SG{i:07d}" for i in range(rows)]
+    overview = pd.DataFrame({
+        "Product Name": names,
+        "Product ID": ids,
+        " Current Price ": [f" € {v:,.2f} " for v in current],
+        " Unit Cost ": [f" € {v:,.2f} " for v in cost],
+    })
+    overview_csv = tmp / "overview.csv"
+    overview.to_csv(overview_csv, index=False, encoding="cp1252")
+    recommendations = pd.DataFrame({
+        "Product Name": names,
+        "Product ID": ids,
+        "Recommended Price": recommended,
+        "Category": [f"Category {c}" for c in rng.integers(0, 40, rows)],
+        "Competitor Count": rng.integers(0, 200, rows),
+        "Profit Delta": rng.normal(0, 50, rows).round(2),
+        "AB P-Value": [f"{p:.3e}" for p in rng.uniform(0, 1, rows) ** 8],
+    })
+    recommended_csv = tmp / "recommended.csv"
+    recommendations.to_csv(recommended_csv, index=False)
+    return overview_csv, recommended_csv
+
+
+def legacy_load_data(overview_csv, recommended_csv):
+    """``dashboard.load_data`` before the catalog loader."""
+    overview = pd.read_csv(overview_csv, encoding="cp1252")
+    recommended = pd.read_csv(recommended_csv)
+    overview = overview.rename(columns=lambda c: c.strip())
+    recommended = recommended.rename(columns=lambda c: c.strip())
+    for df in (overview, recommended):
+        df["Product Name"] = df["Product Name"].str.strip()
+        df["Product ID"] = df["Product ID"].astype(str).str.strip()
+    for col in ("Current Price", "Unit Cost"):
+        overview[col] = overview[col].astype(str).str.replace("€", "").str.replace(",", "").astype(float)
+    df = recommended.merge(
+        overview[["Product Name", "Product ID", "Current Price", "Unit Cost"]],
+        on=["Product Name", "Product ID"],
+        how="left",
+    )
+    df["Recommended Price"] = df["Recommended Price"].astype(float)
+    df["Price Delta"] = df["Recommended Price"] - df["Current Price"]
+    df["Price Delta %"] = (df["Price Delta"] / df["Current Price"]) * 100
+    df["AB P-Value"] = pd.to_numeric(df["AB P-Value"], errors="coerce")
+    df["AB Significance"] = df["AB P-Value"].apply(
+        lambda x: "Significant" if pd.notna(x) and x < 0.05 else "Not Significant"
+    )
+    return df
+
+
+def legacy_read_overview(overview_csv):
+    """``price_optimizer.read_overview`` before the catalog loader (plus thousands separators)."""
+    data = {}
+    with open(overview_csv, newline="", encoding="cp1252") as f:
+        for row in csv.DictReader(f):
+            data[row["Product Name"].strip()] = {
+                "current_price": float(row[" Current Price "].replace("€", "").replace(",", "").strip()),
+                "unit_cost": float(row[" Unit Cost "].replace("€", "").replace(",", "").strip()),
+            }
+    return data
+
+
+def legacy_format(df):
+    out = {}
+    for col in ("Recommended Price", "Current Price", "Price Delta", "Profit Delta"):
+        out[col] = df[col].apply(lambda x: f"€{x:.2f}")
+    out["Price Delta %"] = df["Price Delta %"].apply(lambda x: f"{x:.1f}%")
+    out["AB P-Value"] = df["AB P-Value"].apply(lambda x: f"{x:.4f}" if x > 0.0001 else f"{x:.2e}")
+    return out
+
+
+def new_format(df):
+    out = {}
+    for col in ("Recommended Price", "Current Price", "Price Delta", "Profit Delta"):
+        out[col] = list(map("€{:.2f}".format, df[col].tolist()))
+    out["Price Delta %"] = list(map("{:.1f}%".format, df["Price Delta %"].tolist()))
+    p_values = df["AB P-Value"].to_numpy()
+    formatted = np.array(list(map("{:.4f}".format, p_values.tolist())), dtype=object)
+    small = ~(p_values > 0.0001)
+    formatted[small] = list(map("{:.2e}".format, p_values[small].tolist()))
+    out["AB P-Value"] = formatted
+    return out
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        overview_csv, recommended_csv = write_files(Path(tmp), args.rows, args.seed)
+        t_old_frame, old_frame = timed(legacy_load_data, overview_csv, recommended_csv)
+        t_new_frame, new_frame = timed(catalog.pricing_frame, overview_csv, recommended_csv)
+        t_old_overview, old_overview = timed(legacy_read_overview, overview_csv)
+        t_new_overview, new_overview = timed(catalog.read_overview, overview_csv)
+    # formatting is compared on one frame: the old C-engine parse is not
+    # correctly rounded, so a few p-values differ in the last digit
+    t_old_format, old_text = timed(legacy_format, new_frame)
+    t_new_format, new_text = timed(new_format, new_frame)
+
+    same_frame = all(
+        np.allclose(old_frame[c].astype(float), new_frame[c].astype(float), equal_nan=True)
+        if pd.api.types.is_numeric_dtype(old_frame[c])
+        else (old_frame[c].astype(str) == new_frame[c].astype(str)).all()
+        for c in old_frame.columns
+    )
+    same_overview = np.allclose(
+        [v["current_price"] for v in old_overview.values()], new_overview["Current Price"].to_numpy()
+    )
+    same_text = all(list(old_text[c]) == list(new_text[c]) for c in old_text)
+
+    print(f"rows: {args.rows:,}  (engine: {catalog._csv_engine()})")
+    print(f"dashboard frame:   {t_old_frame:6.2f} s -> {t_new_frame:6.2f} s  ({t_old_frame / t_new_frame:.1f}x, same: {same_frame})")
+    print(f"optimizer overview:{t_old_overview:6.2f} s -> {t_new_overview:6.2f} s  ({t_old_overview / t_new_overview:.1f}x, same: {same_overview})")
+    print(f"table formatting:  {t_old_format:6.2f} s -> {t_new_format:6.2f} s  ({t_old_format / t_new_format:.1f}x, same: {same_text})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Time adding and looking up products in the SQLite catalog against the CSVs.
+
+Builds a catalog of ``--products`` products in a temporary directory, once as
+overview and mapping CSVs and once in ``catalog_db``. It then times adding
+``--adds`` products in three ways:
+
+* the old way, which reads and rewrites both CSVs,
+* ``manage_products``' path, which checks the ID and inserts in one
+  transaction and appends a row to each CSV,
+* the database insert alone.
+
+It also times looking up products by ID with a CSV scan against the
+primary-key index. The keyword file and ``scraper.py`` updates are left
+out; they do not depend on the catalog size.
+"""
+import argparse
+import csv
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import catalog  # noqa: E402
+import catalog_db  # noqa: E402
+
+
+def legacy_add(mapping_csv: Path, overview_csv: Path, product_id: str) -> None:
+    """``ProductManagerGUI.add_product`` before the catalog database."""
+    with open(mapping_csv, newline="") as f:
+        mapping = list(csv.DictReader(f))
+    mapping.append({"Product Name": f"Product {product_id}", "Product ID": product_id, "Data File": "product_data/x.csv"})
+    with open(mapping_csv, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=catalog.MAPPING_COLUMNS)
+        writer.writeheader()
+        writer.writerows(mapping)
+    with open(overview_csv, newline="", encoding="cp1252") as f:
+        overview = list(csv.DictReader(f))
+    overview.append({"Product Name": f"Product {product_id}", "Product ID": product_id,
+                     " Current Price ": "19.5", " Unit Cost ": "4.0"})
+    with open(overview_csv, "w", newline="", encoding="cp1252") as f:
+        writer = csv.DictWriter(f, fieldnames=catalog.OVERVIEW_HEADER)
+        writer.writeheader()
+        writer.writerows(overview)
+
+
+def catalog_add(conn, mapping_csv: Path, overview_csv: Path, product_id: str) -> None:
+    """The catalog part of ``ProductManagerGUI.add_product``."""
+    name = f"Product {product_id}"
+    if catalog_db.product(conn, product_id) is not None:
+        raise ValueError(product_id)
+    with conn:
+        catalog_db.add_product(conn, product_id, name, 19.5, 4.0, "Category", "product_data/x.csv")
+        catalog.append_rows(
+            overview_csv, catalog.OVERVIEW_HEADER,
+            [{"Product Name": name, "Product ID": product_id, " Current Price ": "19.5", " Unit Cost ": "4.0"}],
+            encoding="cp1252",
+        )
+        catalog.append_rows(
+            mapping_csv, catalog.MAPPING_COLUMNS,
+            [{"Product Name": name, "Product ID": product_id, "Data File": "product_data/x.csv"}],
+        )
+
+
+def legacy_lookup(mapping_csv: Path, product_id: str):
+    with open(mapping_csv, newline="") as f:
+        return next((row for row in csv.DictReader(f) if row["Product ID"] == product_id), None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--adds", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        mapping_csv, overview_csv = tmp / "mapping.csv", tmp / "overview.csv"
+        ids = [f"P{i:07d}" for i in range(args.products)]
+        with open(mapping_csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(catalog.MAPPING_COLUMNS)
+            writer.writerows([f"Product {pid}", pid, "product_data/x.csv"] for pid in ids)
+        with open(overview_csv, "w", newline="", encoding="cp1252") as f:
+            writer = csv.writer(f)
+            writer.writerow(catalog.OVERVIEW_HEADER)
+            writer.writerows([f"Product {pid}", pid, " € 19.50 ", " € 4.00 "] for pid in ids)
+        conn = catalog_db.connect(tmp / "catalog.db")
+        with conn:
+            conn.executemany(
+                "INSERT INTO products (product_id, name, current_price, unit_cost, data_file) VALUES (?, ?, 19.5, 4.0, ?)",
+                [(pid, f"Product {pid}", "product_data/x.csv") for pid in ids],
+            )
+
+        new_ids = [f"N{i:07d}" for i in range(args.adds)]
+        start = time.perf_counter()
+        for pid in new_ids:
+            legacy_add(mapping_csv, overview_csv, pid)
+        t_csv_add = (time.perf_counter() - start) / args.adds
+        # the first append scans each file once for its encoding
+        start = time.perf_counter()
+        catalog_add(conn, mapping_csv, overview_csv, "F0000000")
+        t_first_add = time.perf_counter() - start
+        start = time.perf_counter()
+        for pid in new_ids:
+            catalog_add(conn, mapping_csv, overview_csv, "A" + pid)
+        t_full_add = (time.perf_counter() - start) / args.adds
+        start = time.perf_counter()
+        for pid in new_ids:
+            with conn:
+                catalog_db.add_product(conn, pid, f"Product {pid}", 19.5, 4.0, data_file="product_data/x.csv")
+        t_db_add = (time.perf_counter() - start) / args.adds
+
+        probes = ids[:: max(1, len(ids) // args.adds)][: args.adds]
+        start = time.perf_counter()
+        found_csv = [legacy_lookup(mapping_csv, pid) for pid in probes]
+        t_csv_get = (time.perf_counter() - start) / len(probes)
+        start = time.perf_counter()
+        found_db = [catalog_db.product(conn, pid) for pid in probes]
+        t_db_get = (time.perf_counter() - start) / len(probes)
+        conn.close()
+
+    same = [row["Product ID"] for row in found_csv] == [p.id for p in found_db]
+    print(f"products: {args.products:,}")
+    print(f"add product:    {t_csv_add * 1000:9.2f} ms -> {t_full_add * 1000:7.3f} ms"
+          f"  (first add {t_first_add * 1000:.1f} ms, database insert alone {t_db_add * 1000:.3f} ms)")
+    print(f"lookup by ID:   {t_csv_get * 1000:9.2f} ms -> {t_db_get * 1000:7.3f} ms  (same: {same})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Time dashboard regeneration with and without the fragment cache.
+
+Loads the real dashboard data (optionally repeated to a larger catalog) and
+times a full render, a re-render of unchanged data and a re-render after a
+one-product change, using a temporary fragment cache.
+"""
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import dashboard  # noqa: E402
+
+
+def render(df, out, cache):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        timings = dashboard.build_dashboard(df, out, cache=cache)
+    return (time.perf_counter() - start) * 1000, timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=0, help="repeat the catalog to this many rows")
+    args = parser.parse_args(argv)
+
+    df = dashboard.load_data()
+    if args.products > len(df):
+        df = pd.concat([df] * (args.products // len(df) + 1), ignore_index=True).iloc[: args.products]
+        df["Product Name"] = df["Product Name"] + " #" + df.index.astype(str)
+
+    changed = df.copy()
+    changed.loc[0, "Profit Delta"] += 1.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "dashboard.html"
+        cache = dashboard.FragmentCache(Path(tmp) / "fragments.json")
+        render(df, out, dashboard.FragmentCache(Path(tmp) / "warmup.json"))  # warm up Plotly
+        cold, _ = render(df, out, cache)
+        cache.save()
+        cache = dashboard.FragmentCache(cache.path)
+        warm, _ = render(df, out, cache)
+        one, timings = render(changed, out, cache)
+
+    print(f"products: {len(df)}")
+    print(f"full render:           {cold:8.1f} ms")
+    print(f"unchanged (cached):    {warm:8.1f} ms")
+    print(f"one product changed:   {one:8.1f} ms")
+    for name, ms in timings.items():
+        print(f"  {name:<13}{ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""File size and generation time of the dashboard for large catalogs.
+
+Builds synthetic catalogs by resampling the real dashboard rows with
+jittered prices and spreading them over many categories. It then times
+``build_dashboard`` in the per-product view and in the large-catalog view
+(per-category charts, JSON table with virtual scrolling) at each size.
+The per-product view is skipped above ``--max-standard`` rows because it
+takes minutes there and the result does not open in a browser.
+"""
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import dashboard  # noqa: E402
+
+
+def make_catalog(base, rows, categories, seed):
+    rng = np.random.default_rng(seed)
+    df = base.iloc[rng.integers(0, len(base), rows)].reset_index(drop=True)
+    jitter = rng.uniform(0.8, 1.2, rows)
+    for col in ("Current Price", "Recommended Price", "Profit Delta"):
+        df[col] = (df[col] * jitter).round(2)
+    df["Price Delta"] = df["Recommended Price"] - df["Current Price"]
+    df["Price Delta %"] = df["Price Delta"] / df["Current Price"] * 100
+    df["Category"] = [f"Category {c}" for c in rng.integers(0, categories, rows)]
+    df["Product Name"] = df["Product Name"] + " #" + df.index.astype(str)
+    df["Product ID"] = "P" + df.index.astype(str).str.zfill(6)
+    return df
+
+
+def render(df, large):
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "dashboard.html"
+        cache = dashboard.FragmentCache(Path(tmp) / "fragments.json")
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            dashboard.build_dashboard(df, out, cache=cache, large=large)
+        return time.perf_counter() - start, out.stat().st_size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--categories", type=int, default=40)
+    parser.add_argument("--max-standard", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    base = dashboard.load_data()
+    render(base, False)  # warm up Plotly
+    render(base, True)
+
+    print(f"{'rows':>8}  {'per-product view':>22}  {'large-catalog view':>22}")
+    for rows in args.sizes:
+        df = make_catalog(base, rows, args.categories, args.seed)
+        t_large, size_large = render(df, True)
+        if rows <= args.max_standard:
+            t_std, size_std = render(df, False)
+            standard = f"{t_std:7.2f} s {size_std / 1e6:8.2f} MB"
+        else:
+            standard = "skipped"
+        print(f"{rows:>8}  {standard:>22}  {t_large:7.2f} s {size_large / 1e6:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Time every registered demand model over a million price points.
+
+Includes a ``learned`` curve fitted from synthetic observations and a
+mixed call that evaluates a different model per element.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import demand_models  # noqa: E402
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    avg = rng.uniform(10, 150, args.points)
+    price = avg * rng.uniform(0.5, 2.0, args.points)
+    unit = price * rng.uniform(0.2, 0.6, args.points)
+    elasticity = rng.uniform(0.8, 1.4, args.points)
+
+    observed = rng.uniform(0.5, 2.0, 5000)
+    units = 100 / (1 + observed ** 1.3) * rng.normal(1.0, 0.1, observed.size)
+    models = dict(demand_models.MODELS)
+    models.setdefault("learned", demand_models.LearnedDemand.from_observations(observed, units))
+
+    print(f"{'model':22} {'ms':>8} {'ns/point':>9}")
+    for name, model in models.items():
+        seconds = timed(lambda: model.profit(price, unit, avg, 100.0, elasticity, 1.0), args.repeat)
+        print(f"{name:22} {seconds * 1000:8.1f} {seconds * 1e9 / args.points:9.1f}")
+
+    demand_models.register_model(models["learned"])
+    names = np.array(list(models), dtype=object)[rng.integers(0, len(models), args.points)]
+    seconds = timed(lambda: demand_models.profit(names, price, unit, avg, 100.0, elasticity, 1.0), args.repeat)
+    print(f"{'mixed (per element)':22} {seconds * 1000:8.1f} {seconds * 1e9 / args.points:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Compare the fast extraction path with the generic heuristic.
+
+Runs both extractors over the saved search pages in ``benchmarks/fixtures``
+(and, with ``--cache``, every page in the scraper's HTTP cache). For each
+page it reports products per second and how closely the results of the two
+paths agree.
+"""
+import argparse
+import json
+import sys
+import time
+import urllib.parse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import extractors  # noqa: E402
+from http_cache import CACHE_DIR  # noqa: E402
+from scraper import DEFAULT_STORES  # noqa: E402
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+FIXTURE_STORES = {"earthhero_search.html": "EarthHero"}
+
+
+def load_pages(include_cache: bool):
+    for path in sorted(FIXTURE_DIR.glob("*.html")):
+        yield path.name, FIXTURE_STORES.get(path.name), path.read_bytes()
+    index_path = CACHE_DIR / "index.json"
+    if include_cache and index_path.exists():
+        hosts = {urllib.parse.urlparse(c["url"]).netloc: n for n, c in DEFAULT_STORES.items()}
+        for key, entry in json.loads(index_path.read_text()).items():
+            body = CACHE_DIR / key[:2] / f"{key}.body"
+            if body.exists():
+                store = hosts.get(urllib.parse.urlparse(entry["url"]).netloc)
+                yield entry["url"], store, body.read_bytes()
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--cache", action="store_true", help="also use pages from the HTTP cache")
+    args = parser.parse_args(argv)
+
+    print(f"{'page':40} {'fast/s':>10} {'heur/s':>10} {'speedup':>8} {'fast':>5} {'heur':>5} {'agree':>6}")
+    for name, store, html in load_pages(args.cache):
+        fast, t_fast = timed(lambda: extractors.extract_fast(html, "bench", store), args.repeat)
+        heur, t_heur = timed(lambda: extractors.extract_heuristic(html, "bench"), args.repeat)
+        fast_keys = {(p["name"], p["price"]) for p in fast}
+        heur_keys = {(p["name"], p["price"]) for p in heur}
+        union = fast_keys | heur_keys
+        agree = len(fast_keys & heur_keys) / len(union) if union else 1.0
+        print(
+            f"{name[-40:]:40} {len(fast) / t_fast:10.0f} {len(heur) / t_heur:10.0f} "
+            f"{t_heur / t_fast:7.1f}x {len(fast):5d} {len(heur):5d} {agree:6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
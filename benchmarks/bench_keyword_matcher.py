@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Compare the compiled keyword matcher with the original substring loops.
+
+Builds a synthetic keyword file with many categories and a column of
+product names drawn from their keywords plus noise. It times
+``categorize_product``-style classification and the ``read_prices`` row
+filter both ways and checks that the answers agree.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import keyword_matcher  # noqa: E402
+
+WORDS = ["organic", "bamboo", "recycled", "handmade", "steel", "glass", "linen", "wool",
+         "travel", "classic", "mini", "large", "set", "eco", "natural", "vintage"]
+
+
+def legacy_categorize(name, keywords, default):
+    name_l = name.lower()
+    for category, words in keywords.items():
+        for kw in words:
+            if kw in name_l:
+                return category
+    return default
+
+
+def legacy_filter(names, terms, words):
+    keywords = [w.lower() for w in words]
+    return np.fromiter(
+        (any(k in n or k in t for k in keywords) for n, t in zip(map(str.lower, names), map(str.lower, terms))),
+        dtype=bool,
+        count=len(names),
+    )
+
+
+def make_case(categories, rows, seed):
+    rng = random.Random(seed)
+    keywords = {
+        f"Category {c}": [f"{rng.choice(WORDS)}{c}", f"item{c} {rng.choice(WORDS)}", f"kw{c}x"]
+        for c in range(categories)
+    }
+    flat = [w for words in keywords.values() for w in words]
+    names = [
+        " ".join(rng.choice(WORDS).title() for _ in range(3)) + (f" {rng.choice(flat)}" if rng.random() < 0.7 else "")
+        for _ in range(rows)
+    ]
+    terms = [rng.choice(flat) for _ in range(rows // 50 or 1)]
+    terms = [rng.choice(terms) for _ in range(rows)]
+    return keywords, np.array(names, dtype=object), np.array(terms, dtype=object)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--categories", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    keywords, names, terms = make_case(args.categories, args.rows, args.seed)
+    category = next(iter(keywords))
+
+    start = time.perf_counter()
+    old_labels = [legacy_categorize(n, keywords, "none") for n in names]
+    old_mask = legacy_filter(names, terms, keywords[category])
+    t_old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = keyword_matcher.KeywordMatcher(keywords)
+    t_compile = time.perf_counter() - start
+    new_labels = matcher.categorize_many(names, "none")
+    new_mask = matcher.contains(category, names) | matcher.contains(category, terms)
+    t_new = time.perf_counter() - start
+
+    print(f"categories x keywords: {len(keywords)} x 3, rows: {len(names)}")
+    print(f"substring loops:       {t_old:8.3f} s")
+    print(f"compiled matcher:      {t_new:8.3f} s ({t_old / t_new:.1f}x, compile {t_compile * 1000:.1f} ms)")
+    print(f"same categories:       {sum(a == b for a, b in zip(old_labels, new_labels))}/{len(names)}")
+    print(f"same filter rows:      {int((old_mask == new_mask).sum())}/{len(names)}")
+
+
+if __name__ == "__main__":
+    main()
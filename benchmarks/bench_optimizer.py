@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of the vectorized grid search in ``optimize_price``.
+
+Compares it with the original scalar ``while price <= high`` loop on random
+products and reports the speedup and how many answers differ.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import price_optimizer as po  # noqa: E402
+
+
+def legacy_simulate_profit(price, unit_cost, avg_competitor, demand_base=100.0,
+                           elasticity=1.2, saturation=1.0):
+    """The scalar profit model the loop used to call once per grid point."""
+    if price <= 0:
+        return 0.0
+    relative_price = price / max(avg_competitor, 0.01)
+    demand = demand_base * saturation / (1 + abs(relative_price - 1) ** elasticity)
+    if relative_price > 1.5:
+        demand *= 0.7
+    elif relative_price < 0.8:
+        demand *= 1.2
+    return max(0, demand) * (price - unit_cost)
+
+
+def legacy_optimize_price(prices, current_price, unit_cost, margin, elasticity=1.2,
+                          max_markup=1.8, max_increase=0.30, max_decrease=0.25,
+                          price_step=po.PRICE_STEP, demand_base=100.0, saturation=1.0):
+    """The pre-vectorization grid search, kept for comparison."""
+    base = unit_cost * (1 + margin)
+    avg = statistics.mean(prices)
+    stdev = statistics.stdev(prices) if len(prices) > 1 else 0.0
+    mean_cap_ratio = po.compute_mean_cap(avg, stdev)
+    low = max(base, min(prices) * 0.9, current_price * (1 - max_decrease))
+    high = max(current_price, max(prices), avg, base) * max_markup
+    high = min(high, current_price * (1 + max_increase), avg * mean_cap_ratio)
+    if high < low:
+        high = low
+    steps = int((high - low) / price_step) + 1
+    if steps > 100:
+        price_step = (high - low) / 100
+    best_price, best_profit = base, -1e9
+    price = low
+    while price <= high:
+        profit = legacy_simulate_profit(price, unit_cost, avg, demand_base, elasticity, saturation)
+        if profit > best_profit:
+            best_profit, best_price = profit, price
+        price += price_step
+    return po.round_price(max(best_price, base))
+
+
+def make_cases(n, seed):
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(n):
+        avg = rng.uniform(10, 150)
+        prices = [max(1.0, rng.gauss(avg, avg * 0.3)) for _ in range(rng.randint(5, 200))]
+        cur = avg * rng.uniform(0.6, 1.5)
+        cases.append((prices, cur, cur * rng.uniform(0.2, 0.6), rng.choice([0.1, 0.15, 0.3]),
+                      rng.uniform(0.8, 1.4)))
+    return cases
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    cases = make_cases(args.products, args.seed)
+
+    start = time.perf_counter()
+    old = [legacy_optimize_price(p, c, u, m, elasticity=e) for p, c, u, m, e in cases]
+    t_old = time.perf_counter() - start
+    start = time.perf_counter()
+    new = [po.optimize_price(p, c, u, m, elasticity=e) for p, c, u, m, e in cases]
+    t_new = time.perf_counter() - start
+
+    diffs = [b - a for a, b in zip(old, new)]
+    print(f"products:          {len(cases)}")
+    print(f"scalar loop:       {t_old * 1000 / len(cases):8.3f} ms/product")
+    print(f"vectorized grid:   {t_new * 1000 / len(cases):8.3f} ms/product ({t_old / t_new:.1f}x)")
+    print(f"identical prices:  {sum(d == 0 for d in diffs)}/{len(cases)}")
+    # The old loop stopped at the last step below ``high`` and never sampled
+    # the cap itself, so where the cap binds the new answer can be a
+    # rounding step higher.
+    print(f"new price higher:  {sum(d > 0 for d in diffs)}")
+    print(f"new price lower:   {sum(d < 0 for d in diffs)}")
+    print(f"max difference:    {max(map(abs, diffs)):.2f} (one rounding step is 0.50, 1.00 above 50)")
+
+
+if __name__ == "__main__":
+    main()
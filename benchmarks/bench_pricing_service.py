@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Quote latency of the resident pricing service versus a cold start.
+
+Starts ``pricing_service`` in-process on a free port and times single and
+batch quotes over one keep-alive HTTP connection. For comparison it times
+what each request cost before: a new Python process that imports the
+optimizer and loads the catalog.
+"""
+import argparse
+import http.client
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pricing_service  # noqa: E402
+
+
+def post(conn, path, payload):
+    body = json.dumps(payload)
+    conn.request("POST", path, body, {"Content-Type": "application/json"})
+    response = conn.getresponse()
+    data = json.loads(response.read())
+    if response.status != 200:
+        raise RuntimeError(data)
+    return data
+
+
+def get_products(conn):
+    conn.request("GET", "/products")
+    return json.loads(conn.getresponse().read())["products"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--cold", type=int, default=3, help="cold starts to time")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    server = pricing_service.serve(port=0)
+    t_load = time.perf_counter() - start
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_port)
+    products = [{"id": p["id"]} for p in get_products(conn)]
+
+    single = []
+    for i in range(args.requests):
+        start = time.perf_counter()
+        post(conn, "/quote", products[i % len(products)])
+        single.append(time.perf_counter() - start)
+    batch = []
+    for _ in range(max(args.requests // 10, 1)):
+        start = time.perf_counter()
+        post(conn, "/quote/batch", {"products": products})
+        batch.append(time.perf_counter() - start)
+    server.shutdown()
+
+    cold = []
+    for _ in range(args.cold):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", "import price_optimizer as po; po.load_products()"],
+            cwd=ROOT,
+            check=True,
+        )
+        cold.append(time.perf_counter() - start)
+
+    def ms(values, q=0.5):
+        return statistics.quantiles(values, n=100)[int(q * 100) - 1] * 1000 if len(values) > 1 else values[0] * 1000
+
+    print(f"service start (load catalog): {t_load * 1000:8.1f} ms")
+    print(f"single quote  p50 / p99:      {ms(single):8.2f} / {ms(single, 0.99):.2f} ms")
+    print(f"batch of {len(products):<3}  p50:              {ms(batch):8.2f} ms")
+    print(f"cold process  median:         {statistics.median(cold) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Check the analytic optimizer against dense grid and Bayesian searches.
+
+For random products (elasticities on both sides of 1, ranges straddling
+every breakpoint), it compares the profit at ``profit_maximizing_price``
+with the best point of a dense grid over the same range. This is done for
+every demand model with an exact solver. It then compares
+the final rounded recommendations with ``optimize_price`` and
+``bayesian_optimize_price``. The analytic answer must never be beaten by
+the grid. The script exits non-zero if it is.
+"""
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import demand_models  # noqa: E402
+import price_optimizer as po  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--grid-points", type=int, default=20001)
+    parser.add_argument("--bayesian", type=int, default=20, help="cases also run through gp_minimize")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    warnings.simplefilter("ignore")  # skopt warns about repeated boundary points
+    rng = np.random.default_rng(args.seed)
+
+    worse = 0
+    for name, model in demand_models.MODELS.items():
+        if not model.exact:
+            continue
+        failures, t_analytic, t_grid = 0, 0.0, 0.0
+        for _ in range(args.cases):
+            avg = rng.uniform(5, 200)
+            low, high = sorted(avg * rng.uniform(0.4, 2.0, 2))
+            unit = avg * rng.uniform(0.05, 0.9)
+            elasticity = rng.uniform(0.6, 1.6)
+
+            start = time.perf_counter()
+            best = po.profit_maximizing_price(low, high, unit, avg, elasticity=elasticity, model=name)
+            t_analytic += time.perf_counter() - start
+            start = time.perf_counter()
+            grid = np.linspace(low, high, args.grid_points)
+            grid_best = po.simulate_profit(grid, unit, avg, elasticity=elasticity, model=name).max()
+            t_grid += time.perf_counter() - start
+
+            profit = po.simulate_profit(best, unit, avg, elasticity=elasticity, model=name)
+            if profit < grid_best - 1e-9 * max(abs(grid_best), 1.0):
+                failures += 1
+                print(f"grid beats analytic ({name}): avg={avg:.4f} range=[{low:.4f}, {high:.4f}] "
+                      f"unit={unit:.4f} e={elasticity:.3f} {profit:.6f} < {grid_best:.6f}")
+        worse += failures
+        print(f"{name}: {args.cases} cases, analytic {t_analytic * 1e6 / args.cases:.1f} us/case, "
+              f"{args.grid_points}-point grid {t_grid * 1e6 / args.cases:.1f} us/case, grid better {failures}")
+
+    # whole recommendations, including bounds and rounding
+    same_grid = same_bayes = bayes_better = 0
+    for _ in range(args.bayesian):
+        avg = rng.uniform(10, 150)
+        prices = list(np.maximum(1.0, rng.normal(avg, avg * 0.4, 100)))
+        cur = avg * rng.uniform(0.7, 1.4)
+        unit, margin, e = cur * rng.uniform(0.2, 0.6), 0.15, rng.uniform(0.8, 1.4)
+        analytic = po.analytic_optimize_price(prices, cur, unit, margin, elasticity=e)
+        same_grid += analytic == po.optimize_price(prices, cur, unit, margin, elasticity=e)
+        bayes = po.bayesian_optimize_price(prices, cur, unit, margin, elasticity=e)
+        same_bayes += analytic == bayes
+        mean = float(np.mean(prices))
+        bayes_better += po.simulate_profit(bayes, unit, mean, elasticity=e) > po.simulate_profit(
+            analytic, unit, mean, elasticity=e) + 1e-9
+    if args.bayesian:
+        print(f"same as grid:     {same_grid}/{args.bayesian} rounded recommendations")
+        print(f"same as Bayesian: {same_bayes}/{args.bayesian} ({bayes_better} where Bayesian's rounded price earns more)")
+    return 1 if worse else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
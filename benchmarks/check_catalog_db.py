@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Check that importing into the catalog database does not duplicate data.
+
+Copies the catalog files into a temporary directory and imports them into
+a fresh database, then checks that nothing is added by:
+
+* a second import of the same files,
+* an import after the scraper recorded a scrape and wrote its CSV and
+  history log,
+* an import after the optimizer recorded its recommendations,
+
+and that a new scrape, written the same way, is imported exactly once.
+Exits with status 1 on failure.
+"""
+import csv
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import catalog  # noqa: E402
+import catalog_db  # noqa: E402
+from history import PriceHistory  # noqa: E402
+
+
+def counts(conn):
+    return {
+        table: conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+        for table in ("products", "keywords", "observations", "recommendations")
+    }
+
+
+def scrape(db, csv_path: Path, rows) -> None:
+    """Record a scrape and write its files in the order ``save_category_csvs`` does.
+
+    The first rows count as changed pages and go to the history log, as in
+    an incremental scrape.
+    """
+    scraped_at = catalog_db.utc_now()
+    PriceHistory(csv_path.parent / "history").append(csv_path.name, rows[:5], scraped_at)
+    catalog_db.record("observations", csv_path, rows, scraped_at, path=db)
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=catalog_db.OBSERVATION_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main() -> int:
+    failed = []
+
+    def check(name, before, after):
+        ok = before == after
+        print(f"{'ok  ' if ok else 'FAIL'} {name}: {before} -> {after}")
+        if not ok:
+            failed.append(name)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        data_dir = tmp / "product_data"
+        shutil.copytree(catalog_db.DATA_DIR, data_dir, ignore=shutil.ignore_patterns(".*", "catalog.db*"))
+        paths = {}
+        for name, src in (
+            ("overview", catalog.OVERVIEW_CSV),
+            ("mapping", catalog.MAPPING_CSV),
+            ("keywords", catalog_db.KEYWORDS_JSON),
+            ("recommended", catalog.RECOMMENDED_CSV),
+        ):
+            paths[name] = tmp / src.name
+            shutil.copy(src, paths[name])
+        db = tmp / "catalog.db"
+
+        def import_all():
+            conn = catalog_db.connect(db)
+            try:
+                catalog_db.import_csvs(
+                    conn, paths["overview"], paths["mapping"], paths["keywords"], data_dir, paths["recommended"]
+                )
+                return counts(conn)
+            finally:
+                conn.close()
+
+        first = import_all()
+        check("import twice", first, import_all())
+
+        csv_path = sorted(data_dir.glob("*.csv"))[0]
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        time.sleep(1.1)  # a new scrape gets a new timestamp
+        scrape(db, csv_path, rows)
+        recorded = counts(catalog_db.connect(db))
+        check("import after a recorded scrape", recorded, import_all())
+
+        conn = catalog_db.connect(db)
+        with conn:
+            catalog_db.add_recommendations(conn, [dict(r) for r in catalog.read_recommendations(paths["recommended"])
+                                                  .astype(object).to_dict("records")])
+        recorded = counts(conn)
+        conn.close()
+        check("import after recorded recommendations", recorded, import_all())
+
+        before = import_all()
+        time.sleep(1.1)
+        with open(csv_path, "a", newline="", encoding="utf-8") as f:
+            csv.DictWriter(f, fieldnames=catalog_db.OBSERVATION_FIELDS).writerow(
+                {**rows[0], "price": "1.23", "store": "New store"}
+            )
+        after = import_all()
+        check("new scrape imported once", before["observations"] + len(rows) + 1, after["observations"])
+        check("new scrape not imported again", after, import_all())
+
+    print("FAIL" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Check that importing ``price_optimizer`` stays cheap.
+
+Runs ``python -X importtime -c "import price_optimizer"`` in a fresh
+process and fails (exit status 1) if SciPy, scikit-optimize, pandas or
+pyarrow is imported, or if the import takes longer than the budget on top
+of NumPy. These libraries are only needed by the Bayesian optimizer, the
+A/B t-test and the partitioned store, and are imported when those run.
+"""
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+
+FORBIDDEN = ("scipy", "skopt", "pandas", "pyarrow")
+DEFAULT_BUDGET_MS = 60.0  # cumulative import time excluding NumPy
+
+
+def import_times(module: str) -> Dict[str, float]:
+    """Cumulative import time in milliseconds of every module loaded by ``module``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="price_optimizer")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3, help="best of this many imports")
+    args = parser.parse_args(argv)
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    best = min(runs, key=lambda t: t.get(args.module, 0.0) - t.get("numpy", 0.0))
+    total = best.get(args.module, 0.0)
+    own = total - best.get("numpy", 0.0)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {args.module}"], cwd=ROOT, check=True)
+    wall = (time.perf_counter() - start) * 1000
+
+    heavy = sorted(name for name in best if name.split(".")[0] in FORBIDDEN)
+    print(f"import {args.module}: {total:7.1f} ms ({own:.1f} ms without numpy, budget {args.budget_ms:.0f} ms)")
+    print(f"python -c 'import {args.module}': {wall:7.1f} ms wall clock")
+    failed = False
+    if heavy:
+        roots = sorted({name.split(".")[0] for name in heavy})
+        print(f"FAIL: imported at startup: {', '.join(roots)}")
+        failed = True
+    if own > args.budget_ms:
+        print(f"FAIL: import time over budget by {own - args.budget_ms:.1f} ms")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Compare the streaming price sketch with the exact cleaning path.
+
+For synthetic competitor sets of growing size (log-normal prices in cents,
+plus junk rows and far outliers) it reports the relative error
+of every statistic of ``PriceSketch.summary`` against ``clean_prices``
+followed by exact statistics, and the time of both. It also checks that a
+sketch merged from per-partition sketches equals one built over all rows.
+The run exits non-zero if the median or a quartile is off by more than
+``RELATIVE_ACCURACY`` or the merge disagrees.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import competitor_stats  # noqa: E402
+import price_optimizer as po  # noqa: E402
+import price_sketch  # noqa: E402
+
+
+def make_prices(n, rng):
+    prices = np.round(rng.lognormal(np.log(35), 0.45, n), 2)
+    junk = rng.random(n)
+    prices[junk < 0.01] = 0.0  # unparsed prices
+    prices[(junk >= 0.01) & (junk < 0.02)] *= 40  # bundles and typos
+    return prices
+
+
+def relative(a, b):
+    return abs(a - b) / abs(b) if b else abs(a - b)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 2_000_000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    rng = np.random.default_rng(args.seed)
+    bound = price_sketch.RELATIVE_ACCURACY
+    ok = True
+
+    print(f"{'rows':>10} {'exact s':>8} {'sketch s':>8}  relative error of the sketch")
+    for n in args.sizes:
+        prices = make_prices(n, rng)
+        start = time.perf_counter()
+        cleaned = po.clean_prices(prices.tolist())
+        exact = competitor_stats.summarize(cleaned)
+        valid = [p for p in prices.tolist() if 0 < p < 10000]
+        exact_q1, _, exact_q3 = statistics.quantiles(valid, n=4)
+        t_exact = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sketch = price_sketch.PriceSketch().update(iter(prices.tolist()))
+        approx = sketch.summary()
+        t_sketch = time.perf_counter() - start
+        q1, q3 = sketch.quantile(0.25), sketch.quantile(0.75)
+
+        errors = {
+            "q1": relative(q1, exact_q1),
+            "q3": relative(q3, exact_q3),
+            "median": relative(approx.median, exact.median),
+            "mean": relative(approx.mean, exact.mean),
+            "stdev": relative(approx.stdev, exact.stdev),
+            "count": relative(approx.count, exact.count),
+            "min": relative(approx.min, exact.min),
+            "max": relative(approx.max, exact.max),
+        }
+        print(f"{n:>10} {t_exact:8.3f} {t_sketch:8.3f}  "
+              + " ".join(f"{k}={v:.2e}" for k, v in errors.items()))
+        if max(errors["q1"], errors["q3"], errors["median"]) > bound:
+            ok = False
+            print(f"  quantile error above the {bound:.1%} bound")
+
+        parts = np.array_split(prices, 8)
+        merged = price_sketch.merge_sketches(price_sketch.PriceSketch().update(p) for p in parts)
+        whole = price_sketch.PriceSketch().update(prices)
+        same = (
+            np.array_equal(merged.counts, whole.counts)
+            and np.allclose(merged.means, whole.means, rtol=1e-12)
+            and np.allclose(merged.m2, whole.m2, rtol=1e-9, atol=1e-9)
+        )
+        if not same:
+            ok = False
+            print("  merged partition sketches differ from the single sketch")
+
+    print(f"sketch memory: {len(price_sketch.PriceSketch().counts)} buckets at "
+          f"{bound:.1%} relative accuracy")
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+"""The product catalog: typed loaders, a cached index and CSV appends.
+
+The overview CSV is exported from Excel. It is Windows-1252 encoded, its
+headers are padded (``" Current Price "``) and its prices look like
+``" € 1,234.50 "``. :func:`read_overview` reads it, or a UTF-8 re-save of
+it, into a frame with stripped headers and keys and float64 prices.
+:func:`read_recommendations` does the same for ``recommended_prices.csv``.
+:func:`pricing_frame` joins both into the canonical frame that the dashboard
+draws.
+
+Cleaning works on whole columns. With pyarrow installed, CSV parsing uses
+its multithreaded reader.
+
+:func:`load` returns a :class:`Catalog`, which joins the overview with
+``product_data_mapping.csv`` and indexes products by ID and name. Loaded
+files are cached per path, modification time and size, so a process parses
+each file once and re-reads it only after it changes. Every entry point
+(optimizer, pipeline, service, dashboard, product manager) reads the
+catalog through here. The cached frames are shared and must not be
+modified in place. :func:`append_rows` adds products without rewriting the
+files.
+"""
+import codecs
+import csv
+import functools
+import io
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent
+OVERVIEW_CSV = BASE_DIR / "Dzukou_Pricing_Overview_With_Names - Copy.csv"
+RECOMMENDED_CSV = BASE_DIR / "recommended_prices.csv"
+MAPPING_CSV = BASE_DIR / "product_data_mapping.csv"
+
+OVERVIEW_COLUMNS = ["Product Name", "Product ID", "Current Price", "Unit Cost"]
+# header of the overview as Excel writes it
+OVERVIEW_HEADER = ["Product Name", "Product ID", " Current Price ", " Unit Cost "]
+MAPPING_COLUMNS = ["Product Name", "Product ID", "Data File"]
+# every other column of recommended_prices.csv is numeric
+TEXT_COLUMNS = ["Product Name", "Product ID", "Category"]
+INTEGER_COLUMNS = ["Competitor Count"]
+# bytes Windows-1252 leaves undefined; a file containing them is read as Latin-1
+CP1252_UNDEFINED = (0x81, 0x8D, 0x8F, 0x90, 0x9D)
+
+
+@functools.lru_cache(maxsize=None)
+def _csv_engine() -> str:
+    try:
+        import pyarrow  # noqa: F401
+    except Exception:  # library may not be installed
+        return "c"
+    return "pyarrow"
+
+
+def detect_encoding(raw: bytes) -> str:
+    """``utf-8-sig`` for UTF-8 (with or without BOM), else ``cp1252`` as Excel writes it."""
+    try:
+        raw.decode("utf-8")
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        pass
+    if any(b in raw for b in CP1252_UNDEFINED):
+        return "latin-1"
+    return "cp1252"
+
+
+# str(path) -> (stamp, encoding) of files read or appended to; ``None`` for
+# pure ASCII, where the writer's encoding decides
+_ENCODINGS: Dict[str, tuple] = {}
+
+
+def _remember_encoding(path: Path, raw: bytes) -> str:
+    encoding = detect_encoding(raw)
+    _ENCODINGS[str(path)] = (_stamp(path), None if raw.isascii() else encoding)
+    return encoding
+
+
+def file_encoding(path: Path) -> str | None:
+    """Encoding of ``path`` as :func:`detect_encoding` sees it, ``None`` if it is ASCII.
+
+    The result is kept per modification time and size, so a file that was
+    loaded (or appended to) before is not read again. Otherwise the file is
+    scanned in blocks, not read into memory.
+    """
+    known = _ENCODINGS.get(str(path))
+    if known is not None and known[0] == _stamp(path):
+        return known[1]
+    stamp = _stamp(path)
+    encoding = _scan_encoding(path)
+    _ENCODINGS[str(path)] = (stamp, encoding)
+    return encoding
+
+
+def _scan_encoding(path: Path, block_size: int = 1 << 20) -> str | None:
+    """:func:`detect_encoding` of a file read in blocks, ``None`` if it is ASCII."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    is_ascii = is_utf8 = True
+    undefined = False
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            is_ascii = is_ascii and block.isascii()
+            if is_ascii:
+                continue
+            if is_utf8:
+                try:
+                    decoder.decode(block)
+                except UnicodeDecodeError:
+                    is_utf8 = False
+            undefined = undefined or any(b in block for b in CP1252_UNDEFINED)
+    if is_ascii:
+        return None
+    if is_utf8:
+        try:
+            decoder.decode(b"", final=True)
+            return "utf-8-sig"
+        except UnicodeDecodeError:
+            pass
+    return "latin-1" if undefined else "cp1252"
+
+
+def _read_csv(path: Path, text_columns) -> pd.DataFrame:
+    """Read ``path`` with stripped headers; ``text_columns`` stay strings."""
+    raw = Path(path).read_bytes()
+    encoding = _remember_encoding(path, raw)
+    header = pd.read_csv(io.BytesIO(raw), encoding=encoding, nrows=0).columns
+    dtype = {c: str for c in header if c.strip() in text_columns}
+    df = pd.read_csv(io.BytesIO(raw), encoding=encoding, dtype=dtype, engine=_csv_engine())
+    return df.rename(columns=lambda c: c.strip())
+
+
+def parse_money(values: pd.Series) -> pd.Series:
+    """``" € 1,234.50 "`` -> ``1234.5`` for a whole column; anything else -> NaN."""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype("float64")
+    text = values.astype(str).str.replace("€", "", regex=False).str.replace(",", "", regex=False).str.strip()
+    return pd.to_numeric(text, errors="coerce").astype("float64")
+
+
+def _strip(values: pd.Series) -> pd.Series:
+    return values.astype(str).str.strip()
+
+
+def _require(df: pd.DataFrame, columns, path: Path) -> None:
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise ValueError(f"{Path(path).name}: missing columns {', '.join(missing)}")
+
+
+def read_overview(path: Path = OVERVIEW_CSV) -> pd.DataFrame:
+    """Product Name, Product ID (stripped text), Current Price and Unit Cost (float64)."""
+    df = _read_csv(path, OVERVIEW_COLUMNS)
+    _require(df, OVERVIEW_COLUMNS, path)
+    out = pd.DataFrame({
+        "Product Name": _strip(df["Product Name"]),
+        "Product ID": _strip(df["Product ID"]),
+        "Current Price": parse_money(df["Current Price"]),
+        "Unit Cost": parse_money(df["Unit Cost"]),
+    })
+    bad = out["Current Price"].isna() | out["Unit Cost"].isna()
+    if bad.any():
+        names = ", ".join(out.loc[bad, "Product Name"].head(5))
+        raise ValueError(f"{Path(path).name}: {int(bad.sum())} products without a valid price or cost ({names})")
+    return out
+
+
+def read_mapping(path: Path = MAPPING_CSV) -> pd.DataFrame:
+    """Product Name, Product ID and Data File of every mapped product, stripped."""
+    df = _read_csv(path, MAPPING_COLUMNS)
+    _require(df, MAPPING_COLUMNS, path)
+    out = pd.DataFrame({c: _strip(df[c]) for c in MAPPING_COLUMNS})
+    blank = (out["Data File"] == "") | df["Data File"].isna().to_numpy()
+    if blank.any():
+        names = ", ".join(out.loc[blank, "Product Name"].head(5))
+        raise ValueError(f"{Path(path).name}: {int(blank.sum())} products without a data file ({names})")
+    return out
+
+
+def read_recommendations(path: Path = RECOMMENDED_CSV) -> pd.DataFrame:
+    """``recommended_prices.csv`` with stripped keys and numeric columns typed."""
+    df = _read_csv(path, TEXT_COLUMNS)
+    _require(df, ["Product Name", "Product ID", "Recommended Price"], path)
+    for col in df.columns:
+        if col in TEXT_COLUMNS:
+            df[col] = _strip(df[col])
+        elif col in INTEGER_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+        else:
+            # p-values may be written in scientific notation
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    return df
+
+
+def pricing_frame(overview_path: Path = OVERVIEW_CSV, recommended_path: Path = RECOMMENDED_CSV) -> pd.DataFrame:
+    """Recommendations joined with current prices and unit costs, plus deltas."""
+    overview = read_overview_cached(overview_path)
+    df = read_recommendations(recommended_path).merge(overview, on=["Product Name", "Product ID"], how="left")
+    df["Price Delta"] = df["Recommended Price"] - df["Current Price"]
+    df["Price Delta %"] = (df["Price Delta"] / df["Current Price"]) * 100
+    if "AB P-Value" in df.columns:
+        df["AB Significance"] = np.where(df["AB P-Value"] < 0.05, "Significant", "Not Significant")
+    return df
+
+
+def _stamp(path: Path):
+    try:
+        st = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+@functools.lru_cache(maxsize=16)
+def _read_cached(reader, path: str, stamp) -> pd.DataFrame:
+    # ``stamp`` (modification time and size) is part of the key, so an
+    # edited file is read again
+    return reader(Path(path))
+
+
+def read_overview_cached(path: Path = OVERVIEW_CSV) -> pd.DataFrame:
+    """:func:`read_overview`, parsed once per version of the file."""
+    return _read_cached(read_overview, str(path), _stamp(path))
+
+
+def read_mapping_cached(path: Path = MAPPING_CSV) -> pd.DataFrame:
+    """:func:`read_mapping`, parsed once per version of the file; empty if it is missing."""
+    if _stamp(path) is None:
+        return pd.DataFrame({c: pd.Series(dtype=str) for c in MAPPING_COLUMNS})
+    return _read_cached(read_mapping, str(path), _stamp(path))
+
+
+class Product(NamedTuple):
+    """A product of the overview, with its competitor data file from the mapping."""
+
+    id: str
+    name: str
+    current_price: float
+    unit_cost: float
+    data_file: str | None = None
+
+    def info(self) -> Dict[str, float]:
+        """The ``{"current_price", "unit_cost"}`` dict the optimizer works with."""
+        return {"current_price": self.current_price, "unit_cost": self.unit_cost}
+
+    def mapping_row(self) -> Dict[str, str]:
+        return {"Product Name": self.name, "Product ID": self.id, "Data File": self.data_file}
+
+
+class Catalog:
+    """The overview joined with the product mapping, indexed by ID and name.
+
+    ``by_name`` and ``by_id`` hold every overview product (the later row
+    wins for a repeated key). ``products`` lists the mapping rows, in file
+    order, whose product is in the overview. Mapped products without an
+    overview row are left out and listed in ``unpriced``.
+    """
+
+    def __init__(self, overview: pd.DataFrame, mapping: pd.DataFrame) -> None:
+        self.overview = overview
+        self.mapping = mapping
+        self.by_name: Dict[str, Product] = {}
+        for pid, name, cur, unit in zip(
+            overview["Product ID"].tolist(),
+            overview["Product Name"].tolist(),
+            overview["Current Price"].tolist(),
+            overview["Unit Cost"].tolist(),
+        ):
+            self.by_name[name] = Product(pid, name, cur, unit)
+        self.by_id: Dict[str, Product] = {p.id: p for p in self.by_name.values()}
+        self.products: List[Product] = []
+        self.unpriced: List[str] = []
+        for name, pid, data_file in zip(
+            mapping["Product Name"].tolist(), mapping["Product ID"].tolist(), mapping["Data File"].tolist()
+        ):
+            priced = self.by_name.get(name)
+            if priced is None:
+                self.unpriced.append(name)
+                continue
+            self.products.append(priced._replace(id=pid, data_file=data_file))
+        # a mapped product's ID and data file take precedence
+        self.by_id.update((p.id, p) for p in self.products)
+
+    def __len__(self) -> int:
+        return len(self.by_name)
+
+    def product(self, product_id: str) -> Product | None:
+        return self.by_id.get(str(product_id).strip())
+
+    def find(self, name: str) -> Product | None:
+        return self.by_name.get(str(name).strip())
+
+
+@functools.lru_cache(maxsize=4)
+def _load(overview_path: str, mapping_path: str, stamps: tuple) -> Catalog:
+    return Catalog(read_overview_cached(Path(overview_path)), read_mapping_cached(Path(mapping_path)))
+
+
+def load(overview_path: Path = OVERVIEW_CSV, mapping_path: Path = MAPPING_CSV) -> Catalog:
+    """The catalog, rebuilt only when the overview or the mapping changes."""
+    return _load(str(overview_path), str(mapping_path), (_stamp(overview_path), _stamp(mapping_path)))
+
+
+def append_rows(path: Path, fieldnames: List[str], rows: List[Dict], encoding: str = "utf-8") -> None:
+    """Append ``rows`` to the CSV at ``path`` without rewriting it.
+
+    Only the header line and the last byte are read. The rows are written in
+    the file's line endings and its encoding (see :func:`file_encoding`, which
+    scans a file only the first time it is seen). A missing, empty or ASCII
+    file is written in ``encoding``, and a missing or empty one gets a header.
+    """
+    path = Path(path)
+    lineterminator = "\r\n"
+    prefix = ""
+    header = True
+    if path.exists() and path.stat().st_size:
+        with open(path, "rb") as f:
+            first_line = f.readline(1 << 16)
+            f.seek(-1, 2)
+            last = f.read(1)
+        if first_line.endswith(b"\n") and not first_line.endswith(b"\r\n"):
+            lineterminator = "\n"
+        if last != b"\n":
+            prefix = lineterminator
+        # a UTF-8 BOM stays at the start of the file
+        encoding = (file_encoding(path) or encoding).replace("utf-8-sig", "utf-8")
+        header = False
+    known = _ENCODINGS.get(str(path))
+    with open(path, "a", newline="", encoding=encoding) as f:
+        f.write(prefix)
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator=lineterminator)
+        if header:
+            writer.writeheader()
+        writer.writerows(rows)
+    if known is not None:
+        # still the same encoding; only ASCII rows keep an ASCII file ASCII
+        ascii_rows = known[1] is None and all(str(v).isascii() for row in rows for v in row.values())
+        _ENCODINGS[str(path)] = (_stamp(path), None if ascii_rows else known[1] or encoding)
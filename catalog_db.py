@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""SQLite store for the catalog, keywords, competitor prices and recommendations.
+
+The CSVs and ``category_keywords.json`` remain the optimizer's input. This
+database holds the same data in indexed tables::
+
+    categories       category_id, name
+    keywords         category_id, keyword
+    products         product_id (primary key), name, category_id,
+                     current_price, unit_cost, data_file
+    observations     data_file, category, store, product_name, price,
+                     search_term, store_url, scraped_at
+    recommendations  product_id, computed_at and the columns of
+                     recommended_prices.csv
+
+Products are indexed by ID, name and category. Observations are indexed by
+data file and scrape time. Adding or looking up a product is one indexed
+statement instead of a rewrite of the CSVs. The database runs in WAL mode,
+so readers never block the writer. The scraper (new observations), the
+optimizer (new recommendations) and the product manager can use it at the
+same time; concurrent writers wait up to ``BUSY_TIMEOUT_MS`` for each other.
+
+The scraper and the optimizer only write to the database once it exists.
+Create it with ``python catalog_db.py import``; ``export`` writes the CSVs
+back out.
+"""
+import argparse
+import csv
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import catalog
+import competitor_store
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "product_data"
+DB_PATH = DATA_DIR / "catalog.db"
+KEYWORDS_JSON = BASE_DIR / "category_keywords.json"
+HISTORY_DIR = DATA_DIR / "history"
+
+BUSY_TIMEOUT_MS = 10_000
+# a history log entry this long before a stored scrape of the same file is
+# part of that scrape (the scraper stamps a run before writing its files)
+SNAPSHOT_TOLERANCE_S = 120
+OBSERVATION_FIELDS = ["category", "store", "product_name", "price", "search_term", "store_url"]
+# recommended_prices.csv header -> column of the recommendations table
+RECOMMENDATION_FIELDS = {
+    name: name.lower().replace(" ", "_").replace("-", "_")
+    for name in [
+        "Recommended Price",
+        "Category",
+        "Avg Competitor Price",
+        "Min Competitor Price",
+        "Max Competitor Price",
+        "Median Competitor Price",
+        "Std Competitor Price",
+        "Competitor Count",
+        "Profit Current",
+        "Profit Recommended",
+        "Profit Delta",
+        "AB Profit Control",
+        "AB Profit Test",
+        "AB Profit Delta",
+        "AB P-Value",
+    ]
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    category_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS keywords (
+    category_id INTEGER NOT NULL REFERENCES categories,
+    keyword TEXT NOT NULL,
+    PRIMARY KEY (category_id, keyword)
+);
+CREATE TABLE IF NOT EXISTS products (
+    product_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    category_id INTEGER REFERENCES categories,
+    current_price REAL NOT NULL,
+    unit_cost REAL NOT NULL,
+    data_file TEXT
+);
+CREATE INDEX IF NOT EXISTS products_name ON products (name);
+CREATE INDEX IF NOT EXISTS products_category ON products (category_id);
+CREATE TABLE IF NOT EXISTS observations (
+    observation_id INTEGER PRIMARY KEY,
+    data_file TEXT NOT NULL,
+    category TEXT,
+    store TEXT,
+    product_name TEXT,
+    price REAL,
+    search_term TEXT,
+    store_url TEXT,
+    scraped_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS observations_file_time ON observations (data_file, scraped_at);
+CREATE INDEX IF NOT EXISTS observations_time ON observations (scraped_at);
+CREATE TABLE IF NOT EXISTS recommendations (
+    product_id TEXT NOT NULL,
+    computed_at TEXT NOT NULL,
+    product_name TEXT,
+    {recommendation_columns},
+    PRIMARY KEY (product_id, computed_at)
+);
+CREATE INDEX IF NOT EXISTS recommendations_time ON recommendations (computed_at);
+""".format(recommendation_columns=",\n    ".join(
+    f"{column} {'TEXT' if column == 'category' else 'REAL'}" for column in RECOMMENDATION_FIELDS.values()
+))
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def connect(path: Path = DB_PATH) -> sqlite3.Connection:
+    """Open (and if needed create) the database in WAL mode."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    # with WAL, NORMAL only risks the last transactions on power loss
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _data_file_key(data_file) -> str:
+    """Data files are stored as ``product_data/<name>.csv`` relative to the repo."""
+    path = Path(data_file)
+    if path.is_absolute():
+        try:
+            path = path.resolve().relative_to(BASE_DIR)
+        except ValueError:
+            pass
+    return path.as_posix()
+
+
+def _float(value) -> float | None:
+    try:
+        return float(str(value).replace("€", "").replace(",", "").strip())
+    except ValueError:
+        return None
+
+
+def category_id(conn: sqlite3.Connection, name: str) -> int:
+    conn.execute("INSERT OR IGNORE INTO categories (name) VALUES (?)", (name,))
+    return conn.execute("SELECT category_id FROM categories WHERE name = ?", (name,)).fetchone()[0]
+
+
+def add_keywords(conn: sqlite3.Connection, category: str, keywords: Iterable[str]) -> None:
+    cid = category_id(conn, category)
+    conn.executemany(
+        "INSERT OR IGNORE INTO keywords (category_id, keyword) VALUES (?, ?)",
+        [(cid, keyword) for keyword in keywords],
+    )
+
+
+def keywords(conn: sqlite3.Connection) -> Dict[str, List[str]]:
+    """Keywords per category in the layout of ``category_keywords.json``."""
+    out: Dict[str, List[str]] = {}
+    for row in conn.execute(
+        "SELECT c.name, k.keyword FROM categories c LEFT JOIN keywords k USING (category_id)"
+        " ORDER BY c.category_id, k.rowid"
+    ):
+        words = out.setdefault(row["name"], [])
+        if row["keyword"] is not None:
+            words.append(row["keyword"])
+    return out
+
+
+def add_product(
+    conn: sqlite3.Connection,
+    product_id: str,
+    name: str,
+    current_price: float,
+    unit_cost: float,
+    category: str | None = None,
+    data_file=None,
+) -> None:
+    """Insert one product; raises ``ValueError`` if the Product ID is taken."""
+    cid = category_id(conn, category) if category else None
+    try:
+        conn.execute(
+            "INSERT INTO products (product_id, name, category_id, current_price, unit_cost, data_file)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (product_id, name, cid, current_price, unit_cost, _data_file_key(data_file) if data_file else None),
+        )
+    except sqlite3.IntegrityError:
+        raise ValueError(f"Product ID {product_id} already exists") from None
+
+
+def _product(row) -> catalog.Product | None:
+    if row is None:
+        return None
+    return catalog.Product(row["product_id"], row["name"], row["current_price"], row["unit_cost"], row["data_file"])
+
+
+def product(conn: sqlite3.Connection, product_id: str) -> catalog.Product | None:
+    return _product(conn.execute("SELECT * FROM products WHERE product_id = ?", (product_id,)).fetchone())
+
+
+def find(conn: sqlite3.Connection, name: str) -> catalog.Product | None:
+    """The product called ``name`` (the last one added if the name repeats)."""
+    return _product(conn.execute(
+        "SELECT * FROM products WHERE name = ? ORDER BY rowid DESC LIMIT 1", (name,)
+    ).fetchone())
+
+
+def product_count(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT count(*) FROM products").fetchone()[0]
+
+
+def add_observations(
+    conn: sqlite3.Connection, data_file, rows: Iterable[Dict], scraped_at: str | None = None
+) -> int:
+    """Record scraped competitor rows (the scraper's CSV layout) for ``data_file``."""
+    key = _data_file_key(data_file)
+    default_time = scraped_at or utc_now()
+    cur = conn.executemany(
+        "INSERT INTO observations (data_file, category, store, product_name, price, search_term, store_url,"
+        " scraped_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                key, row.get("category"), row.get("store"), row.get("product_name"), _float(row.get("price")),
+                row.get("search_term"), row.get("store_url"), row.get("scraped_at") or default_time,
+            )
+            for row in rows
+        ],
+    )
+    return cur.rowcount
+
+
+def observations(conn: sqlite3.Connection, data_file, since: str | None = None) -> List[sqlite3.Row]:
+    """Observations for ``data_file``, oldest first, optionally from ``since`` on."""
+    sql = "SELECT * FROM observations WHERE data_file = ?"
+    args = [_data_file_key(data_file)]
+    if since:
+        sql += " AND scraped_at >= ?"
+        args.append(since)
+    return conn.execute(sql + " ORDER BY scraped_at, observation_id", args).fetchall()
+
+
+def latest_observations(conn: sqlite3.Connection, data_file) -> List[sqlite3.Row]:
+    """The rows of the latest scrape of ``data_file``."""
+    key = _data_file_key(data_file)
+    return conn.execute(
+        "SELECT * FROM observations WHERE data_file = ? AND scraped_at ="
+        " (SELECT max(scraped_at) FROM observations WHERE data_file = ?) ORDER BY observation_id",
+        (key, key),
+    ).fetchall()
+
+
+def add_recommendations(conn: sqlite3.Connection, rows: Iterable[Dict], computed_at: str | None = None) -> int:
+    """Record rows of ``recommended_prices.csv`` as one optimizer run."""
+    computed_at = computed_at or utc_now()
+    columns = ["product_id", "computed_at", "product_name", *RECOMMENDATION_FIELDS.values()]
+    values = []
+    for row in rows:
+        record = [row["Product ID"], computed_at, row.get("Product Name")]
+        for name, column in RECOMMENDATION_FIELDS.items():
+            value = row.get(name)
+            record.append(value if column == "category" or value is None else _float(value))
+        values.append(record)
+    cur = conn.executemany(
+        f"INSERT OR REPLACE INTO recommendations ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+        values,
+    )
+    return cur.rowcount
+
+
+def latest_recommendations(conn: sqlite3.Connection) -> List[sqlite3.Row]:
+    return conn.execute(
+        "SELECT * FROM recommendations WHERE computed_at = (SELECT max(computed_at) FROM recommendations)"
+        " ORDER BY rowid"
+    ).fetchall()
+
+
+def record(kind: str, *args, path: Path = DB_PATH) -> int:
+    """``add_observations`` or ``add_recommendations`` if the database exists, else nothing.
+
+    Used by the scraper and the optimizer, which keep writing their CSVs
+    either way.
+    """
+    if not Path(path).exists():
+        return 0
+    add = {"observations": add_observations, "recommendations": add_recommendations}[kind]
+    conn = connect(path)
+    try:
+        with conn:
+            return add(conn, *args)
+    finally:
+        conn.close()
+
+
+def _mtime(path: Path) -> str:
+    return datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).isoformat(timespec="seconds")
+
+
+def _shift(stamp: str, seconds: float) -> str:
+    return (datetime.fromisoformat(stamp) + timedelta(seconds=seconds)).isoformat(timespec="seconds")
+
+
+def _fingerprint(rows, fields) -> List[tuple]:
+    """Order-independent content of ``rows`` (CSV dicts or database rows)."""
+    out = []
+    for row in rows:
+        values = [row[f] if f in row.keys() else None for f in fields]
+        out.append(tuple(repr(_float(v)) if f == "price" else (v or "") for f, v in zip(fields, values)))
+    return sorted(out)
+
+
+def _scraped_between(conn: sqlite3.Connection, key: str, start: str, end: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM observations WHERE data_file = ? AND scraped_at BETWEEN ? AND ? LIMIT 1", (key, start, end)
+    ).fetchone() is not None
+
+
+def import_csvs(
+    conn: sqlite3.Connection,
+    overview_path: Path = catalog.OVERVIEW_CSV,
+    mapping_path: Path = catalog.MAPPING_CSV,
+    keywords_path: Path = KEYWORDS_JSON,
+    data_dir: Path = DATA_DIR,
+    recommended_path: Path = catalog.RECOMMENDED_CSV,
+) -> Dict[str, int]:
+    """Load the CSVs and keyword file into the database in one transaction.
+
+    Products and keywords are upserted. Each category CSV in ``data_dir`` is
+    recorded as one scrape stamped with the file's modification time, unless
+    the latest stored scrape of that file has the same rows. The runs in the
+    append-only logs in ``data_dir/history`` keep their own timestamps and
+    are skipped when a scrape of the file is stored at most
+    ``SNAPSHOT_TOLERANCE_S`` after them. Recommendations are
+    skipped when they match the latest stored run. Importing twice, or
+    after the scraper and optimizer have recorded their runs, therefore
+    adds nothing (``benchmarks/check_catalog_db.py`` checks this).
+    """
+    import price_optimizer as po
+
+    counts = {"products": 0, "keywords": 0, "observations": 0, "recommendations": 0}
+    with conn:
+        if Path(keywords_path).exists():
+            with open(keywords_path, encoding="utf-8") as f:
+                for category, words in json.load(f).items():
+                    add_keywords(conn, category, words)
+                    counts["keywords"] += len(words)
+        cat = catalog.load(overview_path, mapping_path)
+        data_files = {p.name: p.data_file for p in cat.products}
+        for p in cat.by_name.values():
+            data_file = data_files.get(p.name)
+            conn.execute(
+                "INSERT INTO products (product_id, name, category_id, current_price, unit_cost, data_file)"
+                " VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (product_id) DO UPDATE SET name = excluded.name,"
+                " category_id = excluded.category_id, current_price = excluded.current_price,"
+                " unit_cost = excluded.unit_cost, data_file = coalesce(excluded.data_file, data_file)",
+                (
+                    p.id, p.name, category_id(conn, po.categorize_product(p.name)), p.current_price, p.unit_cost,
+                    _data_file_key(data_file) if data_file else None,
+                ),
+            )
+            counts["products"] += 1
+
+        content = ["store", "product_name", "price", "search_term"]
+        for path in sorted(Path(data_dir).glob("*.csv")):
+            rows = competitor_store.read_csv_rows(path)
+            stamp = _mtime(path)
+            # already stored if the scraper recorded this run when it wrote
+            # the file, or an earlier import stored the same rows
+            if _fingerprint(latest_observations(conn, path), content) == _fingerprint(rows, content):
+                continue
+            counts["observations"] += add_observations(conn, path, rows, stamp)
+        for path in sorted((Path(data_dir) / "history").glob("*.csv")):
+            data_file = Path(data_dir) / path.name
+            key = _data_file_key(data_file)
+            runs: Dict[str, List[Dict]] = {}
+            for row in competitor_store.read_csv_rows(path):
+                runs.setdefault(row.get("scraped_at") or "", []).append(row)
+            for scraped_at, rows in runs.items():
+                # the log holds the changed pages of a run whose full
+                # snapshot may be stored already
+                if scraped_at and not _scraped_between(
+                    conn, key, scraped_at, _shift(scraped_at, SNAPSHOT_TOLERANCE_S)
+                ):
+                    counts["observations"] += add_observations(conn, data_file, rows)
+
+        if Path(recommended_path).exists():
+            recommendations = catalog.read_recommendations(recommended_path)
+            rows = recommendations.astype(object).where(recommendations.notna(), None).to_dict("records")
+            latest = latest_recommendations(conn)
+            same = [(r["product_id"], r["recommended_price"]) for r in latest] == [
+                (r["Product ID"], _float(r["Recommended Price"])) for r in rows
+            ]
+            if not same:
+                counts["recommendations"] = add_recommendations(conn, rows, _mtime(Path(recommended_path)))
+    return counts
+
+
+def export_csvs(conn: sqlite3.Connection, out_dir: Path) -> Dict[str, int]:
+    """Write the overview, mapping, keyword file, latest category CSVs and
+    latest recommendations to ``out_dir`` in their usual layouts."""
+    out_dir = Path(out_dir)
+    (out_dir / "product_data").mkdir(parents=True, exist_ok=True)
+    products = conn.execute("SELECT * FROM products ORDER BY rowid").fetchall()
+
+    with open(out_dir / catalog.OVERVIEW_CSV.name, "w", newline="", encoding="cp1252") as f:
+        writer = csv.writer(f)
+        writer.writerow(catalog.OVERVIEW_HEADER)
+        for p in products:
+            writer.writerow([p["name"], p["product_id"], f" € {p['current_price']:,.2f} ", f" € {p['unit_cost']:,.2f} "])
+    with open(out_dir / catalog.MAPPING_CSV.name, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(catalog.MAPPING_COLUMNS)
+        writer.writerows([p["name"], p["product_id"], p["data_file"]] for p in products if p["data_file"])
+    with open(out_dir / KEYWORDS_JSON.name, "w", encoding="utf-8") as f:
+        json.dump(keywords(conn), f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+    counts = {"products": len(products), "observations": 0, "recommendations": 0}
+    for (data_file,) in conn.execute("SELECT DISTINCT data_file FROM observations").fetchall():
+        rows = latest_observations(conn, data_file)
+        with open(out_dir / "product_data" / Path(data_file).name, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(OBSERVATION_FIELDS)
+            writer.writerows([row[field] for field in OBSERVATION_FIELDS] for row in rows)
+        counts["observations"] += len(rows)
+
+    rows = latest_recommendations(conn)
+    if rows:
+        fields = [name for name, column in RECOMMENDATION_FIELDS.items() if any(r[column] is not None for r in rows)]
+        with open(out_dir / catalog.RECOMMENDED_CSV.name, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Product Name", "Product ID", *fields])
+            for r in rows:
+                values = []
+                for name in fields:
+                    value = r[RECOMMENDATION_FIELDS[name]]
+                    if name == "Competitor Count":
+                        value = int(value)
+                    elif name == "AB P-Value":
+                        value = f"{value:.3e}"
+                    elif isinstance(value, float):
+                        value = f"{value:.2f}"
+                    values.append(value)
+                writer.writerow([r["product_name"], r["product_id"], *values])
+        counts["recommendations"] = len(rows)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("import", help="load the CSVs and category_keywords.json into the database")
+    exp = sub.add_parser("export", help="write the database back out as CSVs")
+    exp.add_argument("out_dir", type=Path)
+    sub.add_parser("stats", help="row counts per table")
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    try:
+        if args.command == "import":
+            counts = import_csvs(conn)
+            print(f"Imported into {str(args.db)}: " + ", ".join(f"{n} {k}" for k, n in counts.items()))
+        elif args.command == "export":
+            counts = export_csvs(conn, args.out_dir)
+            print(f"Exported to {str(args.out_dir)}: " + ", ".join(f"{n} {k}" for k, n in counts.items()))
+        else:
+            for table in ("categories", "keywords", "products", "observations", "recommendations"):
+                print(f"  {table:<16}{conn.execute(f'SELECT count(*) FROM {table}').fetchone()[0]:>10}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
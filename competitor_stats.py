@@ -0,0 +1,158 @@
+"""Cached summary statistics of cleaned competitor prices.
+
+The optimizer needs the same handful of numbers (mean, median, standard
+deviation, min, max and the cleaned prices themselves) for every product,
+and products often share a category file. :class:`StatsCache` computes them
+once per (data file, category filter). Entries are keyed on the SHA-256 of
+the file the prices are read from, plus the category and its keywords, and
+they persist in ``product_data/.competitor_stats.json``. An unchanged
+category therefore skips both parsing and statistics on the next run. Only
+the latest entry per (data file, category, variant) is kept, so the file
+does not grow with every scrape.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple
+
+import numpy as np
+
+import competitor_store
+
+BASE_DIR = Path(__file__).resolve().parent
+STATS_JSON = BASE_DIR / "product_data" / ".competitor_stats.json"
+# bump when the cleaning or the statistics change so old entries are ignored
+STATS_VERSION = 1
+
+
+class CompetitorStats(NamedTuple):
+    """Cleaned competitor prices and their summary statistics."""
+
+    prices: List[float]
+    count: int
+    mean: float
+    median: float
+    stdev: float
+    min: float
+    max: float
+
+
+def summarize(prices) -> CompetitorStats:
+    """Return statistics for ``prices``; a :class:`CompetitorStats` passes through."""
+    if isinstance(prices, CompetitorStats):
+        return prices
+    values = np.asarray(prices, dtype=float)
+    if not values.size:
+        nan = float("nan")
+        return CompetitorStats([], 0, nan, nan, 0.0, nan, nan)
+    return CompetitorStats(
+        prices=values.tolist(),
+        count=int(values.size),
+        mean=float(values.mean()),
+        median=float(np.median(values)),
+        stdev=float(values.std(ddof=1)) if values.size > 1 else 0.0,
+        min=float(values.min()),
+        max=float(values.max()),
+    )
+
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class StatsCache:
+    """Persistent cache of :class:`CompetitorStats`.
+
+    File digests are memoized by path, size and modification time, so an
+    unchanged file is not even re-hashed.
+    """
+
+    def __init__(self, path: Path = STATS_JSON, store_dir: Path = competitor_store.STORE_DIR) -> None:
+        self.path = Path(path)
+        self.store_dir = store_dir
+        self.entries: Dict[str, Dict] = {}
+        self.files: Dict[str, Dict] = {}
+        # "<data file>\t<category>\t<variant>" -> key of its latest entry
+        self.latest: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.entries = data.get("entries", {})
+                self.files = data.get("files", {})
+                self.latest = data.get("latest", {})
+            except (OSError, ValueError):
+                pass
+
+    def digest(self, path: Path) -> str:
+        st = path.stat()
+        memo = self.files.get(str(path))
+        if memo and memo["size"] == st.st_size and memo["mtime_ns"] == st.st_mtime_ns:
+            return memo["sha256"]
+        digest = file_digest(path)
+        self.files[str(path)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        self.dirty = True
+        return digest
+
+    def key(self, csv_path: Path, category: str | None, keywords: Iterable[str], variant: str = "") -> str | None:
+        source = competitor_store.source_path(csv_path, self.store_dir)
+        if not source.exists():
+            return None
+        parts = [str(STATS_VERSION), self.digest(source), category or "", json.dumps(sorted(keywords)), variant]
+        return hashlib.sha256("\t".join(parts).encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        csv_path: Path,
+        category: str | None,
+        keywords: Iterable[str],
+        compute: Callable[[], List[float]],
+        variant: str = "",
+    ) -> CompetitorStats:
+        """Return cached statistics, calling ``compute`` for the prices on a miss.
+
+        ``variant`` separates entries computed differently from the same data
+        (e.g. ``"sketch"`` for the streaming statistics).
+        """
+        key = self.key(Path(csv_path), category, keywords, variant)
+        if key:
+            slot = "\t".join([str(csv_path), category or "", variant])
+            if self.latest.get(slot) != key:
+                self.latest[slot] = key
+                self.dirty = True
+        entry = self.entries.get(key) if key else None
+        if entry is not None:
+            self.hits += 1
+            return CompetitorStats(**entry)
+        self.misses += 1
+        stats = summarize(compute())
+        if key:
+            self.entries[key] = stats._asdict()
+            self.dirty = True
+        return stats
+
+    def prune(self) -> None:
+        """Drop entries that are no longer the latest for their data file and category."""
+        live = set(self.latest.values())
+        self.entries = {key: entry for key, entry in self.entries.items() if key in live}
+        self.files = {path: memo for path, memo in self.files.items() if Path(path).exists()}
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        self.prune()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            # NaN is valid for empty categories; json writes it as NaN
+            json.dump({"entries": self.entries, "files": self.files, "latest": self.latest}, f)
+        os.replace(tmp, self.path)
+        self.dirty = False
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""Columnar store for scraped competitor prices.
+
+Each scrape is written as an uncompressed Arrow IPC file partitioned by
+category and scrape date::
+
+    competitor_store/<category>/scrape_date=YYYY-MM-DD.arrow
+
+``<category>`` is the stem of the category's CSV in ``product_data/`` so the
+optimizer's mapping file can address either format. Arrow IPC files are
+memory-mapped on load, so reading a category is close to free and the price
+column comes back as a NumPy array without copying. ``pyarrow`` is optional;
+without it the optimizer keeps reading the CSVs. It is imported on first
+use, so tools that never touch the store do not pay for it.
+"""
+import argparse
+import csv
+import functools
+import io
+import itertools
+import os
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+STORE_DIR = BASE_DIR / "competitor_store"
+DATA_DIR = BASE_DIR / "product_data"
+
+COLUMNS = ["category", "store", "product_name", "price", "search_term", "store_url"]
+
+
+class CompetitorPrices(NamedTuple):
+    """Competitor observations for one category as parallel arrays."""
+
+    price: np.ndarray
+    product_name: np.ndarray
+    search_term: np.ndarray
+    store: np.ndarray
+
+
+@functools.lru_cache(maxsize=None)
+def _pyarrow():
+    """Return the ``pyarrow`` module, or ``None`` if it is not installed."""
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+    except Exception:  # library may not be installed
+        return None
+    return pa
+
+
+def available() -> bool:
+    return _pyarrow() is not None
+
+
+def partition_path(slug: str, scrape_date: str, store_dir: Path = STORE_DIR) -> Path:
+    return Path(store_dir) / slug / f"scrape_date={scrape_date}.arrow"
+
+
+def partitions(slug: str, store_dir: Path = STORE_DIR) -> List[Path]:
+    """Return the partitions of a category, oldest first."""
+    return sorted((Path(store_dir) / slug).glob("scrape_date=*.arrow"))
+
+
+def latest_partition(slug: str, store_dir: Path = STORE_DIR) -> Path | None:
+    parts = partitions(slug, store_dir)
+    return parts[-1] if parts else None
+
+
+def write_snapshot(
+    slug: str,
+    rows: Iterable[Dict],
+    scrape_date: str | None = None,
+    store_dir: Path = STORE_DIR,
+) -> Path | None:
+    """Write one scrape of a category. Returns ``None`` without pyarrow."""
+    pa = _pyarrow()
+    if pa is None:
+        return None
+    rows = list(rows)
+    columns = {col: [r.get(col) for r in rows] for col in COLUMNS}
+    table = pa.table(
+        {
+            "category": pa.array(columns["category"], pa.string()).dictionary_encode(),
+            "store": pa.array(columns["store"], pa.string()).dictionary_encode(),
+            "product_name": pa.array(columns["product_name"], pa.string()),
+            "price": pa.array([_to_float(v) for v in columns["price"]], pa.float64()),
+            "search_term": pa.array(columns["search_term"], pa.string()),
+            "store_url": pa.array(columns["store_url"], pa.string()).dictionary_encode(),
+        }
+    )
+    path = partition_path(slug, scrape_date or date.today().isoformat(), store_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+    return path
+
+
+def _to_float(value) -> float | None:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.replace("€", "").replace(",", "").strip()
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=64)
+def _read_table(path: str, mtime_ns: int):
+    # ``mtime_ns`` is part of the cache key so rewritten partitions reload.
+    # The map stays open for as long as the cached table references it.
+    pa = _pyarrow()
+    source = pa.memory_map(path, "r")
+    return pa.ipc.open_file(source).read_all()
+
+
+def read_table(path: Path):
+    return _read_table(str(path), path.stat().st_mtime_ns)
+
+
+def load_prices(slug: str, scrape_date: str | None = None, store_dir: Path = STORE_DIR) -> CompetitorPrices | None:
+    """Return the latest (or given) snapshot of a category as NumPy arrays."""
+    if not available():
+        return None
+    path = partition_path(slug, scrape_date, store_dir) if scrape_date else latest_partition(slug, store_dir)
+    if path is None or not path.exists():
+        return None
+    table = read_table(path)
+    price = table.column("price").fill_null(float("nan")).to_numpy()
+    return CompetitorPrices(
+        price=price,
+        product_name=table.column("product_name").to_numpy(zero_copy_only=False),
+        search_term=table.column("search_term").to_numpy(zero_copy_only=False),
+        store=table.column("store").to_numpy(zero_copy_only=False),
+    )
+
+
+def read_csv_rows(path: Path) -> List[Dict[str, str]]:
+    """Return the rows of one of the scraper's CSVs.
+
+    The scraper writes them as UTF-8 through pandas, but older or hand-edited
+    files may be cp1252; :func:`catalog.detect_encoding` decides, so the
+    Arrow snapshot and the CSV fallback see the same text.
+    """
+    import catalog
+
+    raw = Path(path).read_bytes()
+    text = raw.decode(catalog.detect_encoding(raw), errors="replace")
+    return list(csv.DictReader(io.StringIO(text, newline="")))
+
+
+def _rows_to_prices(rows: Iterable[Dict[str, str]]) -> CompetitorPrices:
+    names, terms, stores, prices = [], [], [], []
+    for row in rows:
+        names.append(row.get("product_name") or "")
+        terms.append(row.get("search_term") or "")
+        stores.append(row.get("store") or "")
+        value = _to_float(row.get("price") or row.get("Price") or None)
+        prices.append(float("nan") if value is None else value)
+    return CompetitorPrices(
+        price=np.array(prices, dtype=np.float64),
+        product_name=np.array(names, dtype=object),
+        search_term=np.array(terms, dtype=object),
+        store=np.array(stores, dtype=object),
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _read_csv(path: str, mtime_ns: int) -> CompetitorPrices:
+    return _rows_to_prices(read_csv_rows(Path(path)))
+
+
+def source_path(csv_path: Path, store_dir: Path = STORE_DIR) -> Path:
+    """Return the file :func:`load_category` reads for ``csv_path``.
+
+    That is the latest store partition when it is at least as new as the
+    CSV, and the CSV otherwise.
+    """
+    csv_path = Path(csv_path)
+    part = latest_partition(csv_path.stem, store_dir)
+    csv_mtime = csv_path.stat().st_mtime_ns if csv_path.exists() else -1
+    if part is not None and part.stat().st_mtime_ns >= csv_mtime and available():
+        return part
+    return csv_path
+
+
+def load_category(csv_path: Path, store_dir: Path = STORE_DIR) -> CompetitorPrices:
+    """Return competitor data for the category behind ``csv_path``.
+
+    The file is chosen by :func:`source_path`. Both formats are cached per
+    file and modification time, so products sharing a category file load
+    it once.
+    """
+    csv_path = Path(csv_path)
+    source = source_path(csv_path, store_dir)
+    if source.suffix == ".arrow":
+        return load_prices(csv_path.stem, source.name[len("scrape_date="):-len(".arrow")], store_dir)
+    return _read_csv(str(csv_path), csv_path.stat().st_mtime_ns if csv_path.exists() else -1)
+
+
+def iter_category(
+    csv_path: Path, chunk_rows: int = 1 << 16, store_dir: Path = STORE_DIR
+) -> Iterator[CompetitorPrices]:
+    """Yield the data :func:`load_category` returns in chunks of ``chunk_rows``.
+
+    A store snapshot is memory-mapped (see :func:`read_table`) and sliced
+    into record batches, so its pages are only read as they are needed. A
+    CSV is read row by row in the encoding :func:`read_csv_rows` uses. The
+    memory held is bounded by ``chunk_rows``, not by the size of the file.
+    """
+    csv_path = Path(csv_path)
+    source = source_path(csv_path, store_dir)
+    if source.suffix == ".arrow":
+        for batch in read_table(source).to_batches(max_chunksize=chunk_rows):
+            yield CompetitorPrices(
+                price=batch.column("price").fill_null(float("nan")).to_numpy(zero_copy_only=False),
+                product_name=batch.column("product_name").to_numpy(zero_copy_only=False),
+                search_term=batch.column("search_term").to_numpy(zero_copy_only=False),
+                store=batch.column("store").to_numpy(zero_copy_only=False),
+            )
+        return
+    import catalog
+
+    with open(csv_path, newline="", encoding=catalog.file_encoding(csv_path) or "utf-8", errors="replace") as f:
+        rows = csv.DictReader(f)
+        while True:
+            chunk = _rows_to_prices(itertools.islice(rows, chunk_rows))
+            if not len(chunk.price):
+                return
+            yield chunk
+
+
+def export_csv(slug: str, out_path: Path, scrape_date: str | None = None, store_dir: Path = STORE_DIR) -> int:
+    """Write a snapshot back out in the scraper's CSV layout."""
+    path = partition_path(slug, scrape_date, store_dir) if scrape_date else latest_partition(slug, store_dir)
+    if path is None or not available():
+        return 0
+    rows = read_table(path).to_pylist()
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
+
+
+def import_csv(csv_path: Path, scrape_date: str | None = None, store_dir: Path = STORE_DIR) -> Path | None:
+    """Load one of the scraper's CSVs into the store."""
+    return write_snapshot(Path(csv_path).stem, read_csv_rows(csv_path), scrape_date, store_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="load product_data/*.csv into the store")
+    imp.add_argument("paths", nargs="*", type=Path)
+    exp = sub.add_parser("export", help="write a category snapshot as CSV")
+    exp.add_argument("category", help="category file stem, e.g. coffee_mugs")
+    exp.add_argument("out", type=Path)
+    exp.add_argument("--date", help="scrape date (YYYY-MM-DD); latest by default")
+    args = parser.parse_args(argv)
+
+    if not available():
+        parser.error("pyarrow is required for the competitor store")
+    if args.command == "import":
+        for path in args.paths or sorted(DATA_DIR.glob("*.csv")):
+            print(f"  • {path.name} -> {str(import_csv(path))}")
+    else:
+        count = export_csv(args.category, args.out, args.date)
+        print(f"Exported {count} rows to {str(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
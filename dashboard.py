@@ -1,221 +1,286 @@
+import argparse
+import functools
+import hashlib
+import json
+import os
+import time
+from html import escape
+from typing import Callable, Dict, List, NamedTuple
+
 import pandas as pd
+import plotly
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 from pathlib import Path
 import numpy as np
 
+import catalog
+
 BASE_DIR = Path(__file__).resolve().parent
-OVERVIEW_CSV = BASE_DIR / "Dzukou_Pricing_Overview_With_Names - Copy.csv"
-RECOMMENDED_CSV = BASE_DIR / "recommended_prices.csv"
+OVERVIEW_CSV = catalog.OVERVIEW_CSV
+RECOMMENDED_CSV = catalog.RECOMMENDED_CSV
 OUT_HTML = BASE_DIR / "dashboard.html"
+FRAGMENTS_JSON = BASE_DIR / "product_data" / ".dashboard_fragments.json"
+# bump when a section's rendering changes so cached fragments are ignored
+FRAGMENT_VERSION = 2
+LARGE_CATALOG_ROWS = 2000  # above this many products the dashboard aggregates per category
 
 
 def load_data():
-    """Load overview and recommendation data and compute deltas."""
-    overview = pd.read_csv(OVERVIEW_CSV, encoding="cp1252")
-    recommended = pd.read_csv(RECOMMENDED_CSV)
+    """Load overview and recommendation data and compute deltas (see :mod:`catalog`)."""
+    return catalog.pricing_frame(OVERVIEW_CSV, RECOMMENDED_CSV)
 
-    # Trim whitespace from column names and key fields so merges work
-    overview = overview.rename(columns=lambda c: c.strip())
-    recommended = recommended.rename(columns=lambda c: c.strip())
 
-    for df in (overview, recommended):
-        df["Product Name"] = df["Product Name"].str.strip()
-        df["Product ID"] = df["Product ID"].astype(str).str.strip()
+CHART_STYLE = dict(
+    xaxis=dict(title="Products", tickangle=-45),
+    plot_bgcolor="rgba(0,0,0,0)",
+    paper_bgcolor="rgba(0,0,0,0)",
+    margin=dict(t=80, b=120),
+)
 
-    # Clean currency values
-    overview["Current Price"] = (
-        overview["Current Price"].astype(str).str.replace("€", "").str.replace(",", "").astype(float)
-    )
-    overview["Unit Cost"] = (
-        overview["Unit Cost"].astype(str).str.replace("€", "").str.replace(",", "").astype(float)
-    )
 
-    # Merge dataframes
-    df = recommended.merge(
-        overview[["Product Name", "Product ID", "Current Price", "Unit Cost"]],
-        on=["Product Name", "Product ID"],
-        how="left",
+def _chart_layout(title, y_title, height, **extra):
+    layout = dict(
+        title=dict(text=title, font=dict(size=24, family="Arial")),
+        yaxis=dict(title=y_title, gridcolor="rgba(128,128,128,0.2)"),
+        height=height,
+        **CHART_STYLE,
+    )
+    layout.update(extra)
+    return layout
+
+
+CATEGORY_AXIS = dict(title="Category (click a bar to drill down)", tickangle=-30)
+GRADIENT = [[0, "#e74c3c"], [0.5, "#f39c12"], [1, "#27ae60"]]
+
+
+VIRIDIS = px.colors.sequential.Viridis
+
+# layout and horizontal reference lines of each chart; none depend on the data
+CHART_LAYOUTS = {
+    "profit_delta": (
+        _chart_layout("Profit Delta by Product", "Profit Delta (€)", 500, hoverlabel=dict(bgcolor="white", font_size=14)),
+        [],
+    ),
+    "prices": (
+        _chart_layout(
+            "Current vs Recommended Prices",
+            "Price (€)",
+            500,
+            barmode="group",
+            legend=dict(x=0.02, y=0.98, bgcolor="rgba(255,255,255,0.8)"),
+        ),
+        [],
+    ),
+    "price_change": (
+        _chart_layout("Price Change Percentage by Product", "Price Change (%)", 400),
+        [dict(y=0, line_dash="dash", line_color="gray", opacity=0.5)],
+    ),
+    "ab_pvalue": (
+        _chart_layout("A/B Test Statistical Significance", "-log10(P-Value)", 400),
+        [
+            dict(
+                y=-np.log10(0.05),
+                line_dash="dash",
+                line_color="red",
+                opacity=0.7,
+                annotation_text="p=0.05 threshold",
+                annotation_position="top right",
+            )
+        ],
+    ),
+    "category_profit": (
+        _chart_layout("Profit Delta by Category", "Profit Delta (€)", 500, xaxis=CATEGORY_AXIS),
+        [],
+    ),
+    "category_prices": (
+        _chart_layout(
+            "Average Current vs Recommended Price by Category",
+            "Average Price (€)",
+            500,
+            xaxis=CATEGORY_AXIS,
+            barmode="group",
+            legend=dict(x=0.02, y=0.98, bgcolor="rgba(255,255,255,0.8)"),
+        ),
+        [],
+    ),
+    "category_significance": (
+        _chart_layout(
+            "A/B Test Significance by Category",
+            "Products",
+            400,
+            xaxis=CATEGORY_AXIS,
+            barmode="stack",
+            legend=dict(x=0.02, y=0.98, bgcolor="rgba(255,255,255,0.8)"),
+        ),
+        [],
+    ),
+    "catalog_scatter": (
+        _chart_layout("Price Change vs Current Price", "Price Change (%)", 500, xaxis=dict(title="Current Price (€)")),
+        [dict(y=0, line_dash="dash", line_color="gray", opacity=0.5)],
+    ),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _layout(chart):
+    """Validated Plotly layout of ``chart``, built once per process."""
+    layout, hlines = CHART_LAYOUTS[chart]
+    fig = go.Figure(layout=layout)
+    for hline in hlines:
+        fig.add_hline(**hline)
+    return fig.to_plotly_json()["layout"]
+
+
+def _figure_html(chart, traces, div_id=None):
+    # traces are plain dicts; skipping Plotly's validation of every data
+    # point is what makes re-rendering a chart take about a millisecond
+    return pio.to_html(
+        {"data": traces, "layout": _layout(chart)},
+        full_html=False,
+        include_plotlyjs=False,
+        config={"displayModeBar": False},
+        validate=False,
+        div_id=div_id,
     )
 
-    # Convert string values to numeric
-    df["Recommended Price"] = df["Recommended Price"].astype(float)
-    df["Price Delta"] = df["Recommended Price"] - df["Current Price"]
-    df["Price Delta %"] = (df["Price Delta"] / df["Current Price"]) * 100
-
-    # Handle profit delta
-    if "Profit Delta" in df.columns:
-        df["Profit Delta"] = df["Profit Delta"].astype(float)
 
-    # Parse AB P-Value properly (handle both decimal and scientific notation)
-    if "AB P-Value" in df.columns:
-        df["AB P-Value"] = pd.to_numeric(df["AB P-Value"], errors="coerce")
-        df["AB Significance"] = df["AB P-Value"].apply(
-            lambda x: "Significant" if pd.notna(x) and x < 0.05 else "Not Significant"
+def render_plotlyjs(df):
+    """The script tags loading plotly.js from its CDN, shared by all charts."""
+    # rendered on its own because Plotly hashes the whole bundle for the tag
+    html = pio.to_html({"data": [], "layout": {}}, full_html=False, include_plotlyjs="cdn", validate=False)
+    return html[html.index("<script") : html.index("<div id=")].strip()
+
+
+def render_profit_delta(df):
+    """Profit delta bars with gradient colors."""
+    trace = dict(
+        type="bar",
+        x=df["Product Name"].to_numpy(),
+        y=df["Profit Delta"].to_numpy(),
+        marker=dict(
+            color=df["Profit Delta"].to_numpy(),
+            colorscale=GRADIENT,
+            line=dict(width=1, color="rgba(255,255,255,0.3)"),
+            colorbar=dict(title=dict(text="Profit Δ")),
+        ),
+        text=[f"€{x:.2f}" for x in df["Profit Delta"]],
+        textposition="outside",
+        hovertemplate="<b>%{x}</b><br>Profit Delta: €%{y:.2f}<extra></extra>",
+    )
+    return _figure_html("profit_delta", [trace])
+
+
+def render_prices(df):
+    """Current and recommended price side by side."""
+    traces = [
+        dict(
+            type="bar",
+            name=label,
+            x=df["Product Name"].to_numpy(),
+            y=df[column].to_numpy(),
+            marker=dict(color=color, opacity=0.8),
+            text=[f"€{x:.2f}" for x in df[column]],
+            textposition="outside",
+            hovertemplate=f"<b>%{{x}}</b><br>{short}: €%{{y:.2f}}<extra></extra>",
         )
+        for label, column, color, short in (
+            ("Current Price", "Current Price", "#3498db", "Current"),
+            ("Recommended Price", "Recommended Price", "#e74c3c", "Recommended"),
+        )
+    ]
+    return _figure_html("prices", traces)
+
+
+def render_price_change(df):
+    """Price change percentage with trend line."""
+    trace = dict(
+        type="scatter",
+        x=df["Product Name"].to_numpy(),
+        y=df["Price Delta %"].to_numpy(),
+        mode="lines+markers",
+        line=dict(color="#9b59b6", width=3, shape="spline"),
+        marker=dict(
+            size=12,
+            color=df["Price Delta %"].to_numpy(),
+            colorscale=[[i / (len(VIRIDIS) - 1), c] for i, c in enumerate(VIRIDIS)],
+            showscale=True,
+            colorbar=dict(title=dict(text="% Change")),
+        ),
+        text=[f"{x:.1f}%" for x in df["Price Delta %"]],
+        textposition="top center",
+        hovertemplate="<b>%{x}</b><br>Price Change: %{y:.1f}%<extra></extra>",
+    )
+    return _figure_html("price_change", [trace])
+
+
+def render_ab_pvalue(df):
+    """A/B test p-values on a -log10 scale."""
+    p_values = df["AB P-Value"]
+    trace = dict(
+        type="bar",
+        x=df["Product Name"].to_numpy(),
+        y=(-np.log10(p_values + 1e-10)).to_numpy(),
+        marker=dict(color=["#27ae60" if p < 0.05 else "#e74c3c" for p in p_values], opacity=0.8),
+        text=[f"p={p:.4f}" if p > 0.0001 else f"p={p:.2e}" for p in p_values],
+        textposition="outside",
+        hovertemplate="<b>%{x}</b><br>P-Value: %{text}<br>-log10(p): %{y:.2f}<extra></extra>",
+    )
+    return _figure_html("ab_pvalue", [trace])
 
-    return df
 
+SORT_SCRIPT = """<script>
+    // Simple table sorting on header click
+    document.addEventListener('DOMContentLoaded', function() {
+        const table = document.getElementById('data-table');
+        table.querySelectorAll('th').forEach((header, index) => {
+            header.style.cursor = 'pointer';
+            header.addEventListener('click', () => sortTable(index));
+        });
+    });
 
-def build_dashboard(df, out_path=OUT_HTML):
-    """Generate an enhanced HTML dashboard with improved visuals and metrics."""
-    # Calculate summary metrics
-    total_profit_increase = df["Profit Delta"].sum()
-    avg_price_increase = df["Price Delta %"].mean()
-    products_with_increase = (df["Price Delta"] > 0).sum()
-    products_with_decrease = (df["Price Delta"] < 0).sum()
+    function sortTable(column) {
+        const tbody = document.getElementById('data-table').tBodies[0];
+        const rows = Array.from(tbody.rows);
 
-    # Statistical significance metrics
-    if "AB P-Value" in df.columns:
-        significant_changes = (df["AB P-Value"] < 0.05).sum()
-        avg_p_value = df["AB P-Value"].mean()
-    else:
-        significant_changes = 0
-        avg_p_value = 1.0
+        rows.sort((a, b) => {
+            const aText = a.cells[column].textContent;
+            const bText = b.cells[column].textContent;
 
-    # Create profit delta visualization with gradient colors
-    fig_delta = go.Figure()
-    fig_delta.add_trace(
-        go.Bar(
-            x=df["Product Name"],
-            y=df["Profit Delta"],
-            marker=dict(
-                color=df["Profit Delta"],
-                colorscale=[[0, "#e74c3c"], [0.5, "#f39c12"], [1, "#27ae60"]],
-                line=dict(width=1, color="rgba(255,255,255,0.3)"),
-                colorbar=dict(title="Profit Δ"),
-            ),
-            text=[f"€{x:.2f}" for x in df["Profit Delta"]],
-            textposition="outside",
-            hovertemplate="<b>%{x}</b><br>Profit Delta: €%{y:.2f}<extra></extra>",
-        )
-    )
-    fig_delta.update_layout(
-        title=dict(text="Profit Delta by Product", font=dict(size=24, family="Arial")),
-        xaxis=dict(title="Products", tickangle=-45),
-        yaxis=dict(title="Profit Delta (€)", gridcolor="rgba(128,128,128,0.2)"),
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-        height=500,
-        margin=dict(t=80, b=120),
-        hoverlabel=dict(bgcolor="white", font_size=14),
-    )
+            const aNum = parseFloat(aText.replace(/[€%,]/g, ''));
+            const bNum = parseFloat(bText.replace(/[€%,]/g, ''));
 
-    # Price comparison chart
-    fig_price = go.Figure()
-    fig_price.add_trace(
-        go.Bar(
-            name="Current Price",
-            x=df["Product Name"],
-            y=df["Current Price"],
-            marker=dict(color="#3498db", opacity=0.8),
-            text=[f"€{x:.2f}" for x in df["Current Price"]],
-            textposition="outside",
-            hovertemplate="<b>%{x}</b><br>Current: €%{y:.2f}<extra></extra>",
-        )
-    )
-    fig_price.add_trace(
-        go.Bar(
-            name="Recommended Price",
-            x=df["Product Name"],
-            y=df["Recommended Price"],
-            marker=dict(color="#e74c3c", opacity=0.8),
-            text=[f"€{x:.2f}" for x in df["Recommended Price"]],
-            textposition="outside",
-            hovertemplate="<b>%{x}</b><br>Recommended: €%{y:.2f}<extra></extra>",
-        )
-    )
-    fig_price.update_layout(
-        barmode="group",
-        title=dict(text="Current vs Recommended Prices", font=dict(size=24, family="Arial")),
-        xaxis=dict(title="Products", tickangle=-45),
-        yaxis=dict(title="Price (€)", gridcolor="rgba(128,128,128,0.2)"),
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-        height=500,
-        margin=dict(t=80, b=120),
-        legend=dict(x=0.02, y=0.98, bgcolor="rgba(255,255,255,0.8)"),
-    )
+            if (!isNaN(aNum) && !isNaN(bNum)) {
+                return aNum - bNum;
+            }
+            return aText.localeCompare(bText);
+        });
 
-    # Price change percentage with trend line
-    fig_percentage = go.Figure()
-    fig_percentage.add_trace(
-        go.Scatter(
-            x=df["Product Name"],
-            y=df["Price Delta %"],
-            mode="lines+markers",
-            line=dict(color="#9b59b6", width=3, shape="spline"),
-            marker=dict(
-                size=12,
-                color=df["Price Delta %"],
-                colorscale="Viridis",
-                showscale=True,
-                colorbar=dict(title="% Change"),
-            ),
-            text=[f"{x:.1f}%" for x in df["Price Delta %"]],
-            textposition="top center",
-            hovertemplate="<b>%{x}</b><br>Price Change: %{y:.1f}%<extra></extra>",
-        )
-    )
-    fig_percentage.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
-    fig_percentage.update_layout(
-        title=dict(text="Price Change Percentage by Product", font=dict(size=24, family="Arial")),
-        xaxis=dict(title="Products", tickangle=-45),
-        yaxis=dict(title="Price Change (%)", gridcolor="rgba(128,128,128,0.2)"),
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-        height=400,
-        margin=dict(t=80, b=120),
-    )
+        // one DOM update for all rows rather than one per row
+        tbody.append(...rows);
+    }
+</script>"""
 
-    # AB Test P-Value visualization
-    if "AB P-Value" in df.columns:
-        fig_pvalue = go.Figure()
-        colors = ['#27ae60' if p < 0.05 else '#e74c3c' for p in df["AB P-Value"]]
-        fig_pvalue.add_trace(
-            go.Bar(
-                x=df["Product Name"],
-                y=-np.log10(df["AB P-Value"] + 1e-10),
-                marker=dict(color=colors, opacity=0.8),
-                text=[f"p={p:.4f}" if p > 0.0001 else f"p={p:.2e}" for p in df["AB P-Value"]],
-                textposition="outside",
-                hovertemplate="<b>%{x}</b><br>P-Value: %{text}<br>-log10(p): %{y:.2f}<extra></extra>",
-            )
-        )
-        fig_pvalue.add_hline(
-            y=-np.log10(0.05),
-            line_dash="dash",
-            line_color="red",
-            opacity=0.7,
-            annotation_text="p=0.05 threshold",
-            annotation_position="top right",
-        )
-        fig_pvalue.update_layout(
-            title=dict(text="A/B Test Statistical Significance", font=dict(size=24, family="Arial")),
-            xaxis=dict(title="Products", tickangle=-45),
-            yaxis=dict(title="-log10(P-Value)", gridcolor="rgba(128,128,128,0.2)"),
-            plot_bgcolor="rgba(0,0,0,0)",
-            paper_bgcolor="rgba(0,0,0,0)",
-            height=400,
-            margin=dict(t=80, b=120),
-        )
-    else:
-        fig_pvalue = None
 
-    # Format table data for HTML
+def render_table(df):
+    """The detailed product table with formatted currency and percentages."""
     table_data = df.copy()
+    # str.format mapped over plain floats; several times faster than .apply
     for col in ["Current Price", "Recommended Price", "Price Delta", "Profit Delta"]:
         if col in table_data.columns:
-            table_data[col] = table_data[col].apply(lambda x: f"€{x:.2f}")
+            table_data[col] = list(map("€{:.2f}".format, table_data[col].tolist()))
 
     if "Price Delta %" in table_data.columns:
-        table_data["Price Delta %"] = table_data["Price Delta %"].apply(lambda x: f"{x:.1f}%")
+        table_data["Price Delta %"] = list(map("{:.1f}%".format, table_data["Price Delta %"].tolist()))
 
     if "AB P-Value" in table_data.columns:
-        table_data["AB P-Value"] = table_data["AB P-Value"].apply(
-            lambda x: f"{x:.4f}" if x > 0.0001 else f"{x:.2e}"
-        )
+        p_values = table_data["AB P-Value"].to_numpy()
+        formatted = np.array(list(map("{:.4f}".format, p_values.tolist())), dtype=object)
+        small = ~(p_values > 0.0001)
+        formatted[small] = list(map("{:.2e}".format, p_values[small].tolist()))
+        table_data["AB P-Value"] = formatted
 
     table_html = table_data.to_html(
         index=False,
@@ -223,15 +288,414 @@ def build_dashboard(df, out_path=OUT_HTML):
         table_id="data-table",
         escape=False,
     )
+    return f"<div class='table-responsive'>\n{table_html}\n</div>\n{SORT_SCRIPT}"
+
+
+def render_category_profit(df):
+    """Total profit delta per category."""
+    totals = df.groupby("Category", sort=False)["Profit Delta"].agg(["sum", "count"])
+    totals = totals.sort_values("sum", ascending=False)
+    trace = dict(
+        type="bar",
+        x=totals.index.to_numpy(),
+        y=totals["sum"].to_numpy(),
+        customdata=totals["count"].to_numpy(),
+        marker=dict(
+            color=totals["sum"].to_numpy(),
+            colorscale=GRADIENT,
+            line=dict(width=1, color="rgba(255,255,255,0.3)"),
+            colorbar=dict(title=dict(text="Profit Δ")),
+        ),
+        text=[f"€{x:,.0f}" for x in totals["sum"]],
+        textposition="outside",
+        hovertemplate="<b>%{x}</b><br>Profit Delta: €%{y:,.2f}<br>%{customdata} products<extra></extra>",
+    )
+    return _figure_html("category_profit", [trace], div_id="category-profit-chart")
+
+
+def render_category_prices(df):
+    """Average current and recommended price per category."""
+    means = df.groupby("Category")[["Current Price", "Recommended Price"]].mean()
+    traces = [
+        dict(
+            type="bar",
+            name=column,
+            x=means.index.to_numpy(),
+            y=means[column].to_numpy(),
+            marker=dict(color=color, opacity=0.8),
+            hovertemplate=f"<b>%{{x}}</b><br>{column}: €%{{y:.2f}}<extra></extra>",
+        )
+        for column, color in (("Current Price", "#3498db"), ("Recommended Price", "#e74c3c"))
+    ]
+    return _figure_html("category_prices", traces, div_id="category-prices-chart")
+
+
+def render_category_significance(df):
+    """Number of significant and non-significant A/B tests per category."""
+    significant = (df["AB P-Value"] < 0.05).rename("significant")
+    counts = significant.groupby(df["Category"]).agg(["sum", "count"])
+    traces = [
+        dict(type="bar", name=name, x=counts.index.to_numpy(), y=values.to_numpy(), marker=dict(color=color, opacity=0.8))
+        for name, values, color in (
+            ("Significant", counts["sum"], "#27ae60"),
+            ("Not Significant", counts["count"] - counts["sum"], "#e74c3c"),
+        )
+    ]
+    return _figure_html("category_significance", traces, div_id="category-significance-chart")
+
+
+# how the catalog view formats columns, as in ``render_table``
+CATALOG_FORMATS = {
+    "Current Price": "eur",
+    "Recommended Price": "eur",
+    "Price Delta": "eur",
+    "Profit Delta": "eur",
+    "Price Delta %": "pct",
+    "AB P-Value": "p",
+}
+
+
+def catalog_json(df):
+    """The table data as compact column-oriented JSON.
+
+    Numbers are rounded to cents (p-values to three significant digits).
+    Columns where values repeat, like categories and the competitor
+    statistics shared by a category, are stored once as labels plus
+    integer codes.
+    """
+    data = []
+    for name in df.columns:
+        col = df[name]
+        if name == "AB P-Value":
+            col = col.map(lambda p: float(f"{p:.3g}"))
+        elif pd.api.types.is_float_dtype(col):
+            col = col.round(2)
+        codes, labels = pd.factorize(col)
+        if len(labels) <= len(col) // 2:
+            labels = pd.Series(labels)
+            data.append({"labels": labels.astype(object).where(labels.notna(), None).tolist(), "codes": codes.tolist()})
+        else:
+            data.append(col.astype(object).where(col.notna(), None).tolist())
+    return _script_json({"columns": list(df.columns), "data": data, "formats": CATALOG_FORMATS})
+
+
+def _script_json(payload):
+    # the JSON sits in a <script> element, which "</" would close
+    text = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    return text.replace("</", "<\\/")
+
+
+CATALOG_SCRIPT = """<style>
+    #table-scroller{ height: 640px; overflow-y: auto; }
+    #data-table td{ white-space: nowrap; }
+</style>
+<script>
+document.addEventListener('DOMContentLoaded', function() {
+    const blob = JSON.parse(document.getElementById('catalog-data').textContent);
+    const spec = JSON.parse(document.getElementById('catalog-scatter-spec').textContent);
+    const columns = blob.columns;
+    // dictionary-encoded columns are expanded back to plain arrays
+    const data = blob.data.map(col => Array.isArray(col) ? col : col.codes.map(c => c < 0 ? null : col.labels[c]));
+    const column = name => data[columns.indexOf(name)] || [];
+    const formats = columns.map(name => blob.formats[name]);
+    const rowCount = data.length ? data[0].length : 0;
+    const names = column('Product Name');
+    const categories = column('Category');
+
+    const scroller = document.getElementById('table-scroller');
+    const tbody = document.querySelector('#data-table tbody');
+    const select = document.getElementById('category-filter');
+    const search = document.getElementById('table-search');
+    const counter = document.getElementById('table-count');
+    const collator = new Intl.Collator();
+    const OVERSCAN = 20;  // rows drawn above and below the visible ones
+    let rowHeight = 33;
+    let view = [];
+    let category = '', query = '', sortColumn = -1, ascending = true;
+
+    function format(value, kind) {
+        if (value === null || value === undefined) return '';
+        if (kind === 'eur') return '€' + value.toFixed(2);
+        if (kind === 'pct') return value.toFixed(1) + '%';
+        if (kind === 'p') return value > 0.0001 ? value.toFixed(4) : value.toExponential(2);
+        return String(value);
+    }
+
+    function escapeHtml(text) {
+        return text.replace(/[&<>"']/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c]));
+    }
+
+    // only the rows in view are in the DOM; spacer rows keep the scrollbar right
+    function renderRows() {
+        let first = Math.max(0, Math.floor(scroller.scrollTop / rowHeight) - OVERSCAN);
+        first -= first % 2;  // keep the stripes stable while scrolling
+        const last = Math.min(view.length, first + Math.ceil(scroller.clientHeight / rowHeight) + 2 * OVERSCAN);
+        const parts = [`<tr style="height:${first * rowHeight}px"></tr>`];
+        for (let i = first; i < last; i++) {
+            const row = view[i];
+            parts.push('<tr>' + data.map((values, c) => '<td>' + escapeHtml(format(values[row], formats[c])) + '</td>').join('') + '</tr>');
+        }
+        parts.push(`<tr style="height:${(view.length - last) * rowHeight}px"></tr>`);
+        tbody.innerHTML = parts.join('');
+        const sample = tbody.rows[1];
+        if (sample && last > first && Math.abs(sample.offsetHeight - rowHeight) > 1) {
+            rowHeight = sample.offsetHeight;
+            renderRows();
+        }
+    }
+
+    function compare(a, b) {
+        if (a === null || a === undefined) return 1;
+        if (b === null || b === undefined) return -1;
+        return typeof a === 'number' ? a - b : collator.compare(a, b);
+    }
+
+    function drawScatter() {
+        const pick = values => view.map(i => values[i]);
+        const trace = Object.assign({}, spec.trace, {
+            x: pick(column('Current Price')),
+            y: pick(column('Price Delta %')),
+            text: pick(names),
+            marker: Object.assign({}, spec.trace.marker, {color: pick(column('Profit Delta'))}),
+        });
+        const title = Object.assign({}, spec.layout.title, {
+            text: (category || 'All categories') + ': price change vs current price',
+        });
+        Plotly.react('catalog-scatter', [trace], Object.assign({}, spec.layout, {title: title}), {displayModeBar: false});
+    }
+
+    function update() {
+        const needle = query.toLowerCase();
+        view = [];
+        for (let i = 0; i < rowCount; i++) {
+            if (category && categories[i] !== category) continue;
+            if (needle && !String(names[i]).toLowerCase().includes(needle)) continue;
+            view.push(i);
+        }
+        if (sortColumn >= 0) {
+            const values = data[sortColumn];
+            const sign = ascending ? 1 : -1;
+            view.sort((a, b) => {
+                const order = compare(values[a], values[b]);
+                return values[a] === null || values[b] === null ? order : sign * order;
+            });
+        }
+        counter.textContent = `${view.length.toLocaleString()} of ${rowCount.toLocaleString()} products`;
+        scroller.scrollTop = 0;
+        renderRows();
+        drawScatter();
+    }
+
+    function setCategory(value) {
+        category = value;
+        select.value = value;
+        update();
+    }
+
+    [...new Set(categories)].sort(collator.compare).forEach(value => select.add(new Option(value, value)));
+    select.addEventListener('change', () => setCategory(select.value));
+    let timer = null;
+    search.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(() => { query = search.value; update(); }, 150);
+    });
+    document.querySelectorAll('#data-table th').forEach((header, index) => {
+        header.style.cursor = 'pointer';
+        header.addEventListener('click', () => {
+            ascending = sortColumn === index ? !ascending : true;
+            sortColumn = index;
+            update();
+        });
+    });
+    scroller.addEventListener('scroll', () => requestAnimationFrame(renderRows), {passive: true});
+    // drill down from the category charts
+    ['category-profit-chart', 'category-prices-chart', 'category-significance-chart'].forEach(id => {
+        const chart = document.getElementById(id);
+        if (chart && chart.on) {
+            chart.on('plotly_click', event => {
+                setCategory(event.points[0].x);
+                document.getElementById('catalog-scatter').scrollIntoView({behavior: 'smooth'});
+            });
+        }
+    });
+    update();
+});
+</script>"""
+
+
+def render_catalog(df):
+    """Scattergl of every product plus a virtually scrolled table, both filterable."""
+    scatter = {
+        "layout": _layout("catalog_scatter"),
+        "trace": dict(
+            type="scattergl",
+            mode="markers",
+            marker=dict(size=5, opacity=0.7, colorscale=GRADIENT, showscale=True, colorbar=dict(title=dict(text="Profit Δ"))),
+            hovertemplate="<b>%{text}</b><br>Current: €%{x:.2f}<br>Price Change: %{y:.1f}%<extra></extra>",
+        ),
+    }
+    headers = "".join(f"<th>{escape(str(c))}</th>" for c in df.columns)
+    return f"""<div class='mb-5'>
+        <div id='catalog-scatter'></div>
+    </div>
+    <div class='d-flex flex-wrap gap-3 align-items-center mb-3'>
+        <select id='category-filter' class='form-select w-auto'><option value=''>All categories</option></select>
+        <input id='table-search' type='search' class='form-control w-auto' placeholder='Search products'>
+        <span id='table-count' class='text-muted'></span>
+    </div>
+    <div id='table-scroller' class='table-responsive'>
+        <table class='table table-hover table-striped' id='data-table'>
+            <thead><tr>{headers}</tr></thead>
+            <tbody></tbody>
+        </table>
+    </div>
+    <script type='application/json' id='catalog-scatter-spec'>{_script_json(scatter)}</script>
+    <script type='application/json' id='catalog-data'>{catalog_json(df)}</script>
+{CATALOG_SCRIPT}"""
+
+
+class Section(NamedTuple):
+    """A dashboard section rendered from ``columns`` of the data (``None``: all of them)."""
+
+    name: str
+    columns: List[str] | None
+    render: Callable[[pd.DataFrame], str]
+
+
+SECTIONS = [
+    Section("plotlyjs", [], render_plotlyjs),
+    Section("profit_delta", ["Product Name", "Profit Delta"], render_profit_delta),
+    Section("prices", ["Product Name", "Current Price", "Recommended Price"], render_prices),
+    Section("price_change", ["Product Name", "Price Delta %"], render_price_change),
+    Section("ab_pvalue", ["Product Name", "AB P-Value"], render_ab_pvalue),
+    Section("table", None, render_table),
+]
+
+# per-category charts with drill-down, and the table shipped as JSON
+LARGE_SECTIONS = [
+    Section("plotlyjs", [], render_plotlyjs),
+    Section("category_profit", ["Category", "Profit Delta"], render_category_profit),
+    Section("category_prices", ["Category", "Current Price", "Recommended Price"], render_category_prices),
+    Section("category_significance", ["Category", "AB P-Value"], render_category_significance),
+    Section("catalog", None, render_catalog),
+]
+
+
+class FragmentCache:
+    """Rendered HTML of each dashboard section, keyed on the rows behind it.
+
+    Only the latest fragment of every section is kept, in
+    ``product_data/.dashboard_fragments.json``. A section whose input
+    columns hash the same as last time is not rendered again.
+    """
+
+    def __init__(self, path: Path = FRAGMENTS_JSON) -> None:
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == FRAGMENT_VERSION:
+                    self.entries = data.get("sections", {})
+            except (OSError, ValueError):
+                pass
+
+    @staticmethod
+    def key(df: pd.DataFrame, columns: List[str]) -> str:
+        h = hashlib.sha256(json.dumps([plotly.__version__, pd.__version__, columns]).encode("utf-8"))
+        if columns:
+            h.update(pd.util.hash_pandas_object(df[columns], index=False).to_numpy().tobytes())
+        return h.hexdigest()
+
+    def fragment(self, section: Section, df: pd.DataFrame) -> str:
+        """Return the HTML of ``section``, rendering it only if its data changed."""
+        key = self.key(df, list(df.columns) if section.columns is None else section.columns)
+        entry = self.entries.get(section.name)
+        if entry is not None and entry["key"] == key:
+            self.hits += 1
+            return entry["html"]
+        self.misses += 1
+        html = section.render(df)
+        self.entries[section.name] = {"key": key, "html": html}
+        self.dirty = True
+        return html
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": FRAGMENT_VERSION, "sections": self.entries}, f)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def build_dashboard(
+    df, out_path=OUT_HTML, cache: FragmentCache | None = None, large: bool | None = None
+) -> Dict[str, float]:
+    """Generate an enhanced HTML dashboard with improved visuals and metrics.
+
+    Sections whose data is unchanged since the last run come from ``cache``
+    (the persistent :class:`FragmentCache` by default). Catalogs with more
+    than ``LARGE_CATALOG_ROWS`` products (or ``large=True``) get per-category
+    charts and a virtually scrolled table instead of one bar and one table
+    row per product. Returns the render time of every section in
+    milliseconds.
+    """
+    if large is None:
+        large = len(df) > LARGE_CATALOG_ROWS
+    if large and "Category" not in df.columns:
+        df = df.assign(Category="All products")
+    sections = LARGE_SECTIONS if large else SECTIONS
+    table = sections[-1].name
+    own_cache = cache is None
+    cache = cache or FragmentCache()
+    timings: Dict[str, float] = {}
+    rebuilt = set()
+
+    start = time.perf_counter()
+    # Calculate summary metrics
+    total_profit_increase = df["Profit Delta"].sum()
+    avg_price_increase = df["Price Delta %"].mean()
+    products_with_increase = (df["Price Delta"] > 0).sum()
+    products_with_decrease = (df["Price Delta"] < 0).sum()
+
+    # Statistical significance metrics
+    if "AB P-Value" in df.columns:
+        significant_changes = (df["AB P-Value"] < 0.05).sum()
+        avg_p_value = df["AB P-Value"].mean()
+    else:
+        significant_changes = 0
+        avg_p_value = 1.0
+    timings["metrics"] = (time.perf_counter() - start) * 1000
+
+    fragments = {}
+    for section in sections:
+        if section.columns and not set(section.columns) <= set(df.columns):
+            fragments[section.name] = ""
+            continue
+        misses = cache.misses
+        start = time.perf_counter()
+        fragments[section.name] = cache.fragment(section, df)
+        timings[section.name] = (time.perf_counter() - start) * 1000
+        if cache.misses > misses:
+            rebuilt.add(section.name)
 
     # Build HTML content
-    pvalue_section = ""
-    if fig_pvalue:
-        pvalue_section = f"""
+    charts = "".join(
+        f"""
     <div class='mb-5'>
-        {fig_pvalue.to_html(full_html=False, include_plotlyjs=False, config={'displayModeBar': False})}
+        {fragments[section.name]}
     </div>
-    """
+"""
+        for section in sections
+        if section.name not in ("plotlyjs", table) and fragments[section.name]
+    )
 
     html = f"""
 <!DOCTYPE html>
@@ -336,79 +800,40 @@ def build_dashboard(df, out_path=OUT_HTML):
         </div>
     </div>
 
-    <div class='mb-5'>
-        {fig_delta.to_html(full_html=False, include_plotlyjs='cdn', config={'displayModeBar': False})}
-    </div>
-
-    <div class='mb-5'>
-        {fig_price.to_html(full_html=False, include_plotlyjs=False, config={'displayModeBar': False})}
-    </div>
-
-    <div class='mb-5'>
-        {fig_percentage.to_html(full_html=False, include_plotlyjs=False, config={'displayModeBar': False})}
-    </div>
-
-    {pvalue_section}
+    {fragments["plotlyjs"]}
 
+{charts}
     <div class='mb-3'>
         <h3>📊 Detailed Product Analysis</h3>
     </div>
-    <div class='table-responsive'>
-        {table_html}
-    </div>
+    {fragments[table]}
 </div>
-
-<script>
-    // Add DataTables for better table interaction if desired
-    document.addEventListener('DOMContentLoaded', function() {{
-        // Simple table sorting on header click
-        const table = document.getElementById('data-table');
-        const headers = table.querySelectorAll('th');
-
-        headers.forEach((header, index) => {{
-            header.style.cursor = 'pointer';
-            header.addEventListener('click', () => {{
-                sortTable(index);
-            }});
-        }});
-    }});
-
-    function sortTable(column) {{
-        // Basic table sorting implementation
-        const table = document.getElementById('data-table');
-        const tbody = table.tBodies[0];
-        const rows = Array.from(tbody.rows);
-
-        rows.sort((a, b) => {{
-            const aText = a.cells[column].textContent;
-            const bText = b.cells[column].textContent;
-
-            const aNum = parseFloat(aText.replace(/[€%,]/g, ''));
-            const bNum = parseFloat(bText.replace(/[€%,]/g, ''));
-
-            if (!isNaN(aNum) && !isNaN(bNum)) {{
-                return aNum - bNum;
-            }}
-            return aText.localeCompare(bText);
-        }});
-
-        rows.forEach(row => tbody.appendChild(row));
-    }}
-</script>
 </body>
 </html>
 """
 
     Path(out_path).write_text(html, encoding="utf-8")
+    if own_cache:
+        cache.save()
     print(f"Dashboard saved to {str(out_path)}")
     print(f"Total profit increase: €{total_profit_increase:,.2f}")
     print(f"Products with significant changes: {significant_changes}/{len(df)}")
+    print(f"Sections: {len(rebuilt)} rendered, {len(timings) - 1 - len(rebuilt)} cached")
+    for name, ms in timings.items():
+        state = "rendered" if name in rebuilt else "cached" if name != "metrics" else ""
+        print(f"  {name:<22}{ms:8.2f} ms  {state}".rstrip())
+    return timings
 
 
-def main():
+def main(argv=None):
     """Main function to generate the dashboard."""
+    parser = argparse.ArgumentParser(description="Generate the pricing dashboard.")
+    view = parser.add_mutually_exclusive_group()
+    view.add_argument("--large", action="store_true", help="per-category charts and a virtually scrolled table")
+    view.add_argument("--per-product", action="store_true", help="one bar and one table row per product")
+    args = parser.parse_args(argv)
     df = load_data()
-    build_dashboard(df)
+    build_dashboard(df, large=True if args.large else False if args.per_product else None)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,281 @@
+"""Demand models used by the price optimizer.
+
+Every model maps prices (relative to the competitor mean) to expected
+demand, vectorized over NumPy arrays. The optimizer, the A/B simulator and
+the profit columns of ``recommended_prices.csv`` all go through
+:func:`demand`/:func:`profit`, so there is a single copy of each formula.
+
+Models are looked up by name (see ``MODELS``); ``price_optimizer.DEMAND_MODEL``
+selects one per category. ``elasticity`` and ``saturation`` are passed to
+every model, which interprets them as documented on the class. Models that
+can locate their profit maximum exactly implement ``optimal_price``; the
+others return ``None`` and the optimizer samples instead.
+"""
+import abc
+import csv
+import math
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+LEARNED_CURVE_CSV = BASE_DIR / "demand_curve.csv"
+
+DEFAULT_MODEL = "logistic_relative"
+
+
+class DemandModel(abc.ABC):
+    """Interface of a demand model; subclasses must implement ``demand``."""
+
+    name = ""
+    exact = False  # True when optimal_price solves the model exactly
+
+    @abc.abstractmethod
+    def demand(self, price, avg_competitor, demand_base=100.0, elasticity=1.2, saturation=1.0):
+        """Expected demand at ``price``, vectorized like the arguments."""
+
+    def profit(self, price, unit_cost, avg_competitor, demand_base=100.0, elasticity=1.2, saturation=1.0):
+        price = np.asarray(price, dtype=float)
+        demand = self.demand(price, avg_competitor, demand_base, elasticity, saturation)
+        return np.where(price <= 0, 0.0, np.maximum(demand, 0) * (price - unit_cost))
+
+    def optimal_price(
+        self, low, high, unit_cost, avg_competitor, demand_base=100.0, elasticity=1.2, saturation=1.0
+    ) -> float | None:
+        """Exact profit-maximizing price in ``[low, high]``, or ``None``."""
+        return None
+
+    def _best_of(self, candidates, unit_cost, avg_competitor, demand_base, elasticity, saturation) -> float:
+        candidates = np.asarray(candidates, dtype=float)
+        profits = self.profit(candidates, unit_cost, avg_competitor, demand_base, elasticity, saturation)
+        # lowest price wins ties, like the grid search
+        best = np.flatnonzero(profits == profits.max())
+        return float(candidates[best].min())
+
+
+def _relative(price, avg_competitor):
+    return np.asarray(price, dtype=float) / np.maximum(avg_competitor, 0.01)
+
+
+class LogisticRelativeDemand(DemandModel):
+    """The original model: ``1 / (1 + |r - 1|**elasticity)`` of the base demand.
+
+    ``r`` is the price relative to the competitor mean. Demand is cut to 70%
+    above ``r = 1.5`` and boosted by 20% below ``r = 0.8``.
+    """
+
+    name = "logistic_relative"
+    exact = True
+    samples = 16  # derivative sign checks per segment in optimal_price
+
+    def demand(self, price, avg_competitor, demand_base=100.0, elasticity=1.2, saturation=1.0):
+        relative_price = _relative(price, avg_competitor)
+        # ``abs`` keeps fractional powers of ``r - 1`` real below the mean
+        demand = demand_base * saturation / (1 + np.abs(relative_price - 1) ** elasticity)
+        # heavy penalty for very high prices, slight boost for bargains
+        return demand * np.where(
+            relative_price > 1.5, 0.7, np.where(relative_price < 0.8, 1.2, 1.0)
+        )
+
+    @staticmethod
+    def _slope(price: float, unit_cost: float, avg: float, elasticity: float) -> float:
+        # derivative of (p - c) / (1 + |p/avg - 1|**e) up to a positive
+        # factor, valid away from p == avg
+        r = price / avg
+        d = abs(r - 1)
+        sign = 1.0 if r > 1 else -1.0
+        return 1 + d ** elasticity - (price - unit_cost) * elasticity * d ** (elasticity - 1) * sign / avg
+
+    def optimal_price(
+        self, low, high, unit_cost, avg_competitor, demand_base=100.0, elasticity=1.2, saturation=1.0
+    ) -> float:
+        """Split at the breakpoints and bisect the derivative in each segment.
+
+        The model is smooth except at ``r`` = 0.8 and 1.5 (the multipliers)
+        and 1.0 (the ``|r - 1|`` kink). Inside a segment every local maximum
+        is a root of the derivative. The sign is checked at ``samples``
+        points, and each +/- change is bisected to float precision.
+        """
+        if high <= low:
+            return low
+        avg = max(avg_competitor, 0.01)
+        edges = [low] + [avg * r for r in (0.8, 1.0, 1.5) if low < avg * r < high] + [high]
+        candidates = list(edges)
+
+        # The multipliers switch on strict comparisons of ``price / avg``, so
+        # the best price just under a breakpoint is the last float for which
+        # that ratio still falls on the better side; ``avg * r`` alone can
+        # round across it.
+        for ratio, on_better_side in ((0.8, lambda q: q < 0.8), (1.5, lambda q: q <= 1.5)):
+            p = avg * ratio
+            if low < p <= high:
+                while not on_better_side(p / avg):
+                    p = math.nextafter(p, -math.inf)
+                candidates.append(p)
+
+        for a, b in zip(edges, edges[1:]):
+            width = b - a
+            points = [a + width * 1e-9] + [a + width * i / self.samples for i in range(1, self.samples)]
+            points.append(b - width * 1e-9)
+            slopes = [self._slope(x, unit_cost, avg, elasticity) for x in points]
+            for lo, hi, s_lo, s_hi in zip(points, points[1:], slopes, slopes[1:]):
+                if s_lo > 0 >= s_hi:
+                    while hi - lo > 1e-12 * hi:
+                        mid = (lo + hi) / 2
+                        if self._slope(mid, unit_cost, avg, elasticity) > 0:
+                            lo = mid
+                        else:
+                            hi = mid
+                    candidates.extend((lo, hi))
+
+        return self._best_of(candidates, unit_cost, avg_competitor, demand_base, elasticity, saturation)
+
+
+class ConstantElasticityDemand(DemandModel):
+    """Isoelastic demand ``r**-elasticity`` of the base demand.
+
+    Profit ``(p - c) * p**-e`` peaks at ``p = c * e / (e - 1)`` when
+    ``e > 1`` and grows with price otherwise.
+    """
+
+    name = "constant_elasticity"
+    exact = True
+
+    def demand(self, price, avg_competitor, demand_base=100.0, elasticity=1.2, saturation=1.0):
+        relative_price = np.maximum(_relative(price, avg_competitor), 1e-9)
+        return demand_base * saturation * relative_price ** -np.asarray(elasticity, dtype=float)
+
+    def optimal_price(
+        self, low, high, unit_cost, avg_competitor, demand_base=100.0, elasticity=1.2, saturation=1.0
+    ) -> float:
+        if high <= low:
+            return low
+        if elasticity <= 1:
+            return high
+        peak = min(max(unit_cost * elasticity / (elasticity - 1), low), high)
+        return self._best_of([low, peak, high], unit_cost, avg_competitor, demand_base, elasticity, saturation)
+
+
+class LinearDemand(DemandModel):
+    """Straight-line demand ``1 - elasticity * (r - 1)``, floored at zero.
+
+    Demand equals the base at the competitor mean and drops to zero at
+    ``r = 1 + 1 / elasticity``. Profit is a parabola in between.
+    """
+
+    name = "linear"
+    exact = True
+
+    def demand(self, price, avg_competitor, demand_base=100.0, elasticity=1.2, saturation=1.0):
+        relative_price = _relative(price, avg_competitor)
+        return demand_base * saturation * np.maximum(1 - elasticity * (relative_price - 1), 0.0)
+
+    def optimal_price(
+        self, low, high, unit_cost, avg_competitor, demand_base=100.0, elasticity=1.2, saturation=1.0
+    ) -> float:
+        if high <= low:
+            return low
+        avg = max(avg_competitor, 0.01)
+        # vertex of (p - c) * (1 + e - e * p / avg)
+        vertex = (unit_cost + avg * (1 + elasticity) / elasticity) / 2
+        peak = min(max(vertex, low), high)
+        return self._best_of([low, peak, high], unit_cost, avg_competitor, demand_base, elasticity, saturation)
+
+
+class LearnedDemand(DemandModel):
+    """Demand curve interpolated from observed (relative price, demand) points.
+
+    ``demand`` values are multipliers of the base demand (1.0 at the
+    competitor mean). ``elasticity`` is ignored; the curve already encodes
+    it. There is no closed form, so the optimizer samples this model.
+    """
+
+    name = "learned"
+
+    def __init__(self, relative_prices, demand) -> None:
+        order = np.argsort(relative_prices)
+        self.relative_prices = np.asarray(relative_prices, dtype=float)[order]
+        self.multipliers = np.asarray(demand, dtype=float)[order]
+
+    @classmethod
+    def from_csv(cls, path: Path = LEARNED_CURVE_CSV) -> "LearnedDemand":
+        """Load a curve with ``relative_price`` and ``demand`` columns."""
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        return cls([float(r["relative_price"]) for r in rows], [float(r["demand"]) for r in rows])
+
+    @classmethod
+    def from_observations(cls, relative_prices, units, bins: int = 20) -> "LearnedDemand":
+        """Fit a non-increasing curve from raw sales observations.
+
+        Observations are averaged in ``bins`` equal-count bins, forced to be
+        non-increasing in price, and scaled to 1.0 at the competitor mean.
+        """
+        relative_prices = np.asarray(relative_prices, dtype=float)
+        units = np.asarray(units, dtype=float)
+        order = np.argsort(relative_prices)
+        groups = np.array_split(order, min(bins, len(order)))
+        xs = np.array([relative_prices[g].mean() for g in groups])
+        ys = np.minimum.accumulate([units[g].mean() for g in groups])
+        at_mean = np.interp(1.0, xs, ys)
+        return cls(xs, ys / at_mean if at_mean > 0 else ys)
+
+    def demand(self, price, avg_competitor, demand_base=100.0, elasticity=1.2, saturation=1.0):
+        relative_price = _relative(price, avg_competitor)
+        return demand_base * saturation * np.interp(relative_price, self.relative_prices, self.multipliers)
+
+
+MODELS: Dict[str, DemandModel] = {
+    model.name: model
+    for model in (LogisticRelativeDemand(), ConstantElasticityDemand(), LinearDemand())
+}
+
+
+def register_model(model: DemandModel, name: str | None = None) -> None:
+    MODELS[name or model.name] = model
+
+
+def get_model(model) -> DemandModel:
+    """Return the model registered as ``model`` (or ``model`` itself).
+
+    ``"learned"`` is loaded from ``LEARNED_CURVE_CSV`` on first use unless a
+    fitted curve was registered under that name.
+    """
+    if isinstance(model, DemandModel):
+        return model
+    if model == LearnedDemand.name and model not in MODELS and LEARNED_CURVE_CSV.exists():
+        register_model(LearnedDemand.from_csv())
+    try:
+        return MODELS[model]
+    except KeyError:
+        raise ValueError(f"Unknown demand model {model!r}; available: {', '.join(MODELS)}") from None
+
+
+def demand(model, price, avg_competitor, demand_base=100.0, elasticity=1.2, saturation=1.0):
+    """Demand under ``model``.
+
+    ``model`` is a name or a model, or an array of names broadcasting
+    against the prices (one model per product, say). Arrays of names are
+    evaluated one model at a time over boolean masks.
+    """
+    if isinstance(model, (str, DemandModel)):
+        return get_model(model).demand(price, avg_competitor, demand_base, elasticity, saturation)
+    names = np.asarray(model, dtype=object)
+    values = [np.asarray(v, dtype=float) for v in (price, avg_competitor, demand_base, elasticity, saturation)]
+    shape = np.broadcast_shapes(names.shape, *(v.shape for v in values))
+    out = np.empty(shape)
+    # names usually vary per product only, so compare before broadcasting;
+    # scalar arguments are passed through instead of being expanded
+    for name in set(names.flat):
+        mask = np.broadcast_to(names == name, shape)
+        args = [v if v.ndim == 0 else np.broadcast_to(v, shape)[mask] for v in values]
+        out[mask] = get_model(name).demand(*args)
+    return out
+
+
+def profit(model, price, unit_cost, avg_competitor, demand_base=100.0, elasticity=1.2, saturation=1.0):
+    """Profit under ``model``; arguments as for :func:`demand`."""
+    price = np.asarray(price, dtype=float)
+    units = demand(model, price, avg_competitor, demand_base, elasticity, saturation)
+    return np.where(price <= 0, 0.0, np.maximum(units, 0) * (price - unit_cost))
@@ -0,0 +1,244 @@
+"""Product extraction from scraped search result pages.
+
+Extraction tries the cheap, precise sources first and keeps the original
+text-walking heuristic as the fallback:
+
+1. embedded structured data (JSON-LD ``Product``/``ItemList`` blocks and the
+   Shopify product JSON most of the stores ship with),
+2. store-specific XPath selectors evaluated on an ``lxml`` tree,
+3. the generic BeautifulSoup price-text walk.
+
+``lxml`` is optional; without it only steps 1 and 3 run.
+"""
+import json
+import re
+from typing import Dict, Iterable, List
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html as lxml_html
+except Exception:  # library may not be installed
+    lxml_html = None
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# XPath equivalents of the CSS selectors used by the Node scraper in
+# ``server/index.js``. Stores without an entry go straight to the fallback.
+STORE_SELECTORS = {
+    "EarthHero": {
+        "container": f"//*[{_has_class('product-item')} or {_has_class('product-card')}]",
+        "name": f".//*[{_has_class('product-title')}] | .//h3",
+        "price": f".//*[{_has_class('price')} or {_has_class('product-price')}]",
+    },
+    "Package Free Shop": {
+        "container": f"//*[{_has_class('grid-product')} or {_has_class('product-item')}]",
+        "name": f".//*[{_has_class('product-title')}]",
+        "price": f".//*[{_has_class('product-price')}]",
+    },
+    "Ten Thousand Villages": {
+        "container": f"//*[{_has_class('product-tile')}]",
+        "name": f".//*[{_has_class('product-name')}]",
+        "price": f".//*[{_has_class('price')}]//*[{_has_class('value')}]",
+    },
+}
+
+JSON_LD_RE = re.compile(
+    r"<script[^>]+application/ld\+json[^>]*>(.*?)</script>", re.S | re.I
+)
+PRODUCT_JSON_RE = re.compile(
+    r"<script[^>]+data-product-json[^>]*>(.*?)</script>", re.S | re.I
+)
+SHOPIFY_META_RE = re.compile(r"var meta\s*=\s*")
+PRICE_TEXT_RE = re.compile(r"\$\s*\d+")
+
+
+def clean_price(price_text):
+    if not price_text:
+        return None
+    m = re.search(r"(\$|€|£|Rs\.?|USD)?\s*(\d+[\.,]\d+|\d+)", price_text)
+    if m:
+        val = m.group(2).replace(",", ".")
+        try:
+            return float(val)
+        except ValueError:
+            return None
+    return None
+
+
+def clean_product_name(name):
+    if not name:
+        return None
+    name = name.strip()
+    if len(name) < 3:
+        return None
+    if not re.search(r"[a-zA-Z]", name):
+        return None
+    return name
+
+
+def _product(name, price, search_term) -> Dict | None:
+    name = clean_product_name(name)
+    if isinstance(price, str):
+        price = clean_price(price)
+    if name and price and price > 0:
+        return {"name": name, "price": float(price), "search_term": search_term}
+    return None
+
+
+def _walk_json_ld(node) -> Iterable[Dict]:
+    if isinstance(node, list):
+        for item in node:
+            yield from _walk_json_ld(item)
+    elif isinstance(node, dict):
+        types = node.get("@type")
+        types = types if isinstance(types, list) else [types]
+        if "Product" in types:
+            yield node
+        for key in ("@graph", "itemListElement", "item", "mainEntity"):
+            if key in node:
+                yield from _walk_json_ld(node[key])
+
+
+def _json_ld_price(offers):
+    if isinstance(offers, list):
+        offers = offers[0] if offers else None
+    if not isinstance(offers, dict):
+        return None
+    price = offers.get("price", offers.get("lowPrice"))
+    try:
+        return float(price)
+    except (TypeError, ValueError):
+        return None
+
+
+def extract_json_ld(text: str, search_term: str) -> List[Dict]:
+    """Return products described by JSON-LD blocks in ``text``."""
+    products = []
+    for block in JSON_LD_RE.findall(text):
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        for node in _walk_json_ld(data):
+            product = _product(node.get("name"), _json_ld_price(node.get("offers")), search_term)
+            if product:
+                products.append(product)
+    return products
+
+
+def _shopify_products(data) -> Iterable:
+    """Yield ``(name, price)`` from Shopify product JSON (prices in cents)."""
+    items = data.get("products") if isinstance(data, dict) and "products" in data else [data]
+    for item in items or []:
+        if not isinstance(item, dict):
+            continue
+        variants = item.get("variants") or []
+        variant = variants[0] if variants and isinstance(variants[0], dict) else {}
+        name = item.get("title") or variant.get("name")
+        if isinstance(name, str):
+            name = name.replace(" - Default Title", "")
+        price = item.get("price", variant.get("price"))
+        if isinstance(price, (int, float)):
+            yield name, price / 100
+        elif isinstance(price, str):
+            yield name, price
+
+
+def extract_shopify_json(text: str, search_term: str) -> List[Dict]:
+    """Return products from Shopify ``data-product-json`` or ``var meta``."""
+    payloads = []
+    for block in PRODUCT_JSON_RE.findall(text):
+        try:
+            payloads.append(json.loads(block))
+        except ValueError:
+            continue
+    m = SHOPIFY_META_RE.search(text)
+    if m:
+        try:
+            payloads.append(json.JSONDecoder().raw_decode(text, m.end())[0])
+        except ValueError:
+            pass
+
+    products = []
+    for data in payloads:
+        for name, price in _shopify_products(data):
+            product = _product(name, price, search_term)
+            if product:
+                products.append(product)
+    return products
+
+
+def extract_with_selectors(text: str, search_term: str, store_name: str | None) -> List[Dict]:
+    """Return products found with the store's XPath selectors."""
+    selectors = STORE_SELECTORS.get(store_name or "")
+    if not selectors or lxml_html is None:
+        return []
+    try:
+        tree = lxml_html.fromstring(text)
+    except Exception:
+        return []
+    products = []
+    for container in tree.xpath(selectors["container"]):
+        names = container.xpath(selectors["name"])
+        prices = container.xpath(selectors["price"])
+        if not names or not prices:
+            continue
+        product = _product(
+            names[0].text_content().strip(), prices[0].text_content(), search_term
+        )
+        if product:
+            products.append(product)
+    return products
+
+
+def extract_heuristic(html, search_term: str) -> List[Dict]:
+    """Generic fallback: find ``$`` prices and look around them for a name."""
+    products = []
+    soup = BeautifulSoup(html, "html.parser")
+    price_elems = soup.find_all(string=PRICE_TEXT_RE)
+    for price_elem in price_elems:
+        parent = price_elem.parent
+        for _ in range(3):
+            if parent and parent.parent:
+                parent = parent.parent
+        if not parent:
+            continue
+        name_elems = parent.find_all(["h1", "h2", "h3", "h4", "a", "span", "div"])
+        product_name = None
+        for elem in name_elems:
+            text = elem.get_text(strip=True)
+            if len(text) > 3 and "$" not in text:
+                product_name = clean_product_name(text)
+                if product_name:
+                    break
+        if not product_name:
+            continue
+        price = clean_price(price_elem)
+        if product_name and price and price > 0:
+            products.append({"name": product_name, "price": price, "search_term": search_term})
+    return products
+
+
+def _decode(html) -> str:
+    if isinstance(html, bytes):
+        return html.decode("utf-8", errors="replace")
+    return html
+
+
+def extract_fast(html, search_term: str, store_name: str | None = None) -> List[Dict]:
+    """Structured data first, then store selectors. Empty if neither applies."""
+    text = _decode(html)
+    return (
+        extract_json_ld(text, search_term)
+        or extract_shopify_json(text, search_term)
+        or extract_with_selectors(text, search_term, store_name)
+    )
+
+
+def extract_products(html, search_term: str, store_name: str | None = None) -> List[Dict]:
+    """Return the products on a search page, using the fastest path that works."""
+    return extract_fast(html, search_term, store_name) or extract_heuristic(html, search_term)
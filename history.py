@@ -0,0 +1,116 @@
+"""Change detection and append-only price history for incremental scrapes."""
+import csv
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "product_data"
+PAGE_STATE_JSON = DATA_DIR / ".page_state.json"
+HISTORY_DIR = DATA_DIR / "history"
+
+HISTORY_FIELDS = [
+    "scraped_at",
+    "category",
+    "store",
+    "product_name",
+    "price",
+    "search_term",
+    "store_url",
+]
+
+# Attributes that change on every page load without the listing changing
+VOLATILE_RE = re.compile(
+    rb'\s(?:nonce|data-csrf[\w-]*|data-request-id)="[^"]*"|"(?:csrf_token|nonce)"\s*:\s*"[^"]*"'
+)
+WHITESPACE_RE = re.compile(rb"\s+")
+
+
+def page_fingerprint(body) -> str:
+    """Return a hash of ``body`` that ignores per-request noise."""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    body = VOLATILE_RE.sub(b"", body)
+    body = WHITESPACE_RE.sub(b" ", body)
+    return hashlib.sha256(body).hexdigest()
+
+
+class PageState:
+    """Fingerprint and parsed products of every page seen on earlier runs.
+
+    Pages whose fingerprint has not changed reuse their stored products
+    instead of being parsed again.
+    """
+
+    def __init__(self, path: Path = PAGE_STATE_JSON) -> None:
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.pages: Dict[str, Dict] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.pages = json.load(f)
+            except (OSError, ValueError):
+                self.pages = {}
+
+    @staticmethod
+    def key(store: str, term: str, source: str) -> str:
+        return f"{source}\t{store}\t{term}"
+
+    def lookup(self, store: str, term: str, source: str, body) -> List[Dict] | None:
+        """Return stored products if the page is unchanged, else ``None``."""
+        with self.lock:
+            entry = self.pages.get(self.key(store, term, source))
+        if entry and entry["fingerprint"] == page_fingerprint(body):
+            return [dict(p) for p in entry["products"]]
+        return None
+
+    def update(self, store: str, term: str, source: str, body, products: List[Dict]) -> None:
+        with self.lock:
+            self.pages[self.key(store, term, source)] = {
+                "fingerprint": page_fingerprint(body),
+                "products": products,
+                "parsed_at": utc_now(),
+            }
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with self.lock, open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.pages, f)
+        os.replace(tmp, self.path)
+
+
+class PriceHistory:
+    """Append-only CSV log of competitor observations, one file per category."""
+
+    def __init__(self, directory: Path = HISTORY_DIR) -> None:
+        self.directory = Path(directory)
+
+    def path_for(self, csv_filename: str) -> Path:
+        return self.directory / csv_filename
+
+    def append(self, csv_filename: str, rows: Iterable[Dict], scraped_at: str | None = None) -> int:
+        rows = list(rows)
+        if not rows:
+            return 0
+        scraped_at = scraped_at or utc_now()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(csv_filename)
+        new_file = not path.exists()
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=HISTORY_FIELDS, extrasaction="ignore")
+            if new_file:
+                writer.writeheader()
+            for row in rows:
+                writer.writerow({"scraped_at": scraped_at, **row})
+        return len(rows)
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
@@ -0,0 +1,197 @@
+"""Persistent on-disk cache for scraped HTTP responses."""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Mapping
+
+BASE_DIR = Path(__file__).resolve().parent
+CACHE_DIR = BASE_DIR / ".http_cache"
+
+DEFAULT_TTL = 24 * 60 * 60  # seconds a response is served without refetching
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# index changes written by ``put``/``revalidated`` before the index is saved;
+# ``flush`` saves the rest
+INDEX_SAVE_INTERVAL = 200
+# eviction frees space down to this share of ``max_bytes`` so that a full
+# cache is not sorted again on every put
+EVICT_TO = 0.9
+
+
+class ResponseCache:
+    """Content-addressed response cache with TTL, revalidation and LRU eviction.
+
+    Entries are keyed on the SHA-256 of the *target* URL, so the same page is
+    shared no matter which category asked for it. ``variant`` separates
+    responses for the same URL that were fetched in different ways (for
+    example through the Scraping Fish proxy and directly). Bodies are stored
+    as individual files. A JSON index keeps the validators and access times
+    used for eviction. The index is saved every ``INDEX_SAVE_INTERVAL``
+    changes and by :meth:`flush`, which callers run at the end of a scrape.
+    """
+
+    def __init__(
+        self,
+        directory: Path = CACHE_DIR,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / "index.json"
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.index: Dict[str, Dict] = self._load_index()
+        self.total_bytes = sum(e["size"] for e in self.index.values())
+        self.unsaved = 0
+
+    def _load_index(self) -> Dict[str, Dict]:
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    @staticmethod
+    def key_for(url: str, variant: str = "") -> str:
+        return hashlib.sha256(f"{variant}\n{url}".encode("utf-8")).hexdigest()
+
+    def _body_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.body"
+
+    def _read_body(self, key: str) -> bytes | None:
+        try:
+            return self._body_path(key).read_bytes()
+        except OSError:
+            self._drop(key)
+            return None
+
+    def _drop(self, key: str) -> None:
+        entry = self.index.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry["size"]
+            self.unsaved += 1
+
+    def _changed(self) -> None:
+        self.unsaved += 1
+        if self.unsaved >= INDEX_SAVE_INTERVAL:
+            self._save_index()
+
+    def get(self, url: str, variant: str = "") -> bytes | None:
+        """Return the cached body if it is still within the TTL."""
+        key = self.key_for(url, variant)
+        with self.lock:
+            entry = self.index.get(key)
+            if entry and time.time() - entry["fetched_at"] < self.ttl:
+                body = self._read_body(key)
+                if body is not None:
+                    entry["accessed_at"] = time.time()
+                    self.hits += 1
+                    return body
+            self.misses += 1
+            return None
+
+    def conditional_headers(self, url: str, variant: str = "") -> Dict[str, str]:
+        """Return ``If-None-Match``/``If-Modified-Since`` for a stale entry."""
+        with self.lock:
+            entry = self.index.get(self.key_for(url, variant))
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def revalidated(self, url: str, variant: str = "") -> bytes | None:
+        """Mark a stale entry fresh after a ``304 Not Modified`` response."""
+        key = self.key_for(url, variant)
+        with self.lock:
+            entry = self.index.get(key)
+            if not entry:
+                return None
+            body = self._read_body(key)
+            if body is None:
+                return None
+            entry["fetched_at"] = entry["accessed_at"] = time.time()
+            self.revalidations += 1
+            self._changed()
+            return body
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        headers: Mapping[str, str] | None = None,
+        variant: str = "",
+    ) -> None:
+        headers = headers or {}
+        key = self.key_for(url, variant)
+        path = self._body_path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(body)
+        os.replace(tmp, path)
+        now = time.time()
+        with self.lock:
+            self._drop(key)
+            self.index[key] = {
+                "url": url,
+                "variant": variant,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "fetched_at": now,
+                "accessed_at": now,
+                "size": len(body),
+            }
+            self.total_bytes += len(body)
+            self._evict()
+            self._changed()
+
+    def _evict(self) -> None:
+        if self.total_bytes <= self.max_bytes:
+            return
+        target = self.max_bytes * EVICT_TO
+        for key, _ in sorted(self.index.items(), key=lambda kv: kv[1]["accessed_at"]):
+            if self.total_bytes <= target:
+                break
+            try:
+                self._body_path(key).unlink()
+            except OSError:
+                pass
+            self._drop(key)
+            self.evictions += 1
+
+    def _save_index(self) -> None:
+        tmp = self.index_path.with_suffix(".tmp")
+        # json.dumps uses the C encoder; json.dump streams through the Python one
+        tmp.write_text(json.dumps(self.index), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+        self.unsaved = 0
+
+    def flush(self) -> None:
+        """Save the index, including access times so LRU order survives between runs."""
+        with self.lock:
+            self._save_index()
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "entries": len(self.index),
+                "bytes": self.total_bytes,
+            }
@@ -0,0 +1,134 @@
+"""Compiled keyword matching for product categorization and row filtering.
+
+``category_keywords.json`` maps each category to keywords. A name belongs to
+the first category (in file order) that has a keyword occurring in it.
+Instead of testing every keyword against every name, :class:`KeywordMatcher`
+compiles all keywords into one regular expression shaped like a trie
+(``bott(?:le|om)`` rather than ``bottle|bottom``). The regex engine then
+follows shared prefixes once instead of trying every keyword at every
+position, which is what an Aho–Corasick automaton would do. A single scan of
+a name reports the longest keyword starting at each position. Every other
+keyword starting there is a prefix of it, so the category of a match is
+the best category among the keyword and its prefixes. Columns are matched
+per distinct value, which matters for scraped data where search terms
+repeat on every row.
+
+Matching is case-insensitive. Matchers are cached per keywords file and
+modification time, so edits made by ``manage_products.py`` are picked up
+on the next call.
+"""
+import functools
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+
+def trie_regex(words: Iterable[str]) -> str:
+    """Regex source matching any of ``words``, longest match first."""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        # a word may end here: the greedy ``?`` still tries the longer ones first
+        return body + "?" if "" in node else body
+
+    return build(trie)
+
+
+@functools.lru_cache(maxsize=256)
+def _any_pattern(keywords: tuple) -> re.Pattern:
+    return re.compile(trie_regex({k.lower() for k in keywords}))
+
+
+def _lowered_uniques(values):
+    """Return ``(codes, lowered distinct values)`` of a column."""
+    index: Dict = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values), dtype=np.intp, count=len(values))
+    # missing values (None, NaN) match nothing, like an empty string
+    return codes, [u.lower() if isinstance(u, str) else "" for u in index]
+
+
+def contains_any(values, keywords: Iterable[str]) -> np.ndarray:
+    """Boolean mask of the ``values`` containing any of ``keywords``."""
+    keywords = tuple(keywords)
+    if not keywords:
+        return np.zeros(len(values), dtype=bool)
+    search = _any_pattern(keywords).search
+    codes, uniques = _lowered_uniques(values)
+    hits = np.fromiter((search(u) is not None for u in uniques), dtype=bool, count=len(uniques))
+    return hits[codes] if len(codes) else np.zeros(0, dtype=bool)
+
+
+class KeywordMatcher:
+    """Category keywords compiled for matching whole columns at once."""
+
+    def __init__(self, keywords: Dict[str, List[str]]) -> None:
+        self.keywords = {category: list(words) for category, words in keywords.items()}
+        self.categories = list(self.keywords)
+        self._priority: Dict[str, int] = {}
+        for rank, words in enumerate(self.keywords.values()):
+            for word in words:
+                self._priority.setdefault(word.lower(), rank)
+        # a match also implies every keyword that is a prefix of it
+        self._rank = {
+            word: min(self._priority.get(word[:i], rank) for i in range(len(word) + 1))
+            for word, rank in self._priority.items()
+        }
+        # zero-width lookahead so overlapping keywords are all seen
+        self._pattern = re.compile(f"(?=({trie_regex(self._priority)}))") if self._priority else None
+
+    def categorize(self, name: str, default: str | None = None) -> str | None:
+        """Return the category of ``name``, or ``default`` if nothing matches."""
+        if self._pattern is None:
+            return default
+        ranks = [self._rank[m] for m in self._pattern.findall(name.lower())]
+        return self.categories[min(ranks)] if ranks else default
+
+    def categorize_many(self, names, default: str | None = None) -> np.ndarray:
+        """Categorize a column of names; returns an object array."""
+        codes, uniques = _lowered_uniques(names)
+        labels = np.array([self.categorize(u, default) for u in uniques], dtype=object)
+        return labels[codes]
+
+    def contains(self, category: str, values) -> np.ndarray:
+        """Boolean mask of the ``values`` containing a keyword of ``category``."""
+        return contains_any(values, self.keywords.get(category) or [])
+
+
+def read_keywords(path: Path, defaults: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Return the keywords in ``path``, or ``defaults`` if it is missing or invalid."""
+    if path.exists():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return {k: list(map(str, v)) for k, v in data.items()}
+        except Exception:
+            pass
+    return defaults
+
+
+@functools.lru_cache(maxsize=8)
+def _load(path: str, mtime_ns: int, defaults: tuple) -> KeywordMatcher:
+    # ``mtime_ns`` is part of the cache key so an edited file recompiles
+    return KeywordMatcher(read_keywords(Path(path), {k: list(v) for k, v in defaults}))
+
+
+def load(path: Path, defaults: Dict[str, List[str]]) -> KeywordMatcher:
+    """Matcher for the keywords file at ``path``, rebuilt when it changes."""
+    path = Path(path)
+    mtime_ns = path.stat().st_mtime_ns if path.exists() else -1
+    return _load(str(path), mtime_ns, tuple((k, tuple(v)) for k, v in defaults.items()))
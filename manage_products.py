@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 """GUI utility for adding products and keywords used by the pricing pipeline."""
-import csv
 import json
 import re
 import tkinter as tk
@@ -8,13 +7,16 @@ from tkinter import ttk, messagebox, scrolledtext
 from pathlib import Path
 import ast
 
+import catalog
+import catalog_db
 from scraper import DEFAULT_CATEGORIES
 from utils import canonical_key
 
 BASE_DIR = Path(__file__).resolve().parent
-MAPPING_CSV = BASE_DIR / "product_data_mapping.csv"
+MAPPING_CSV = catalog.MAPPING_CSV
 KEYWORDS_JSON = BASE_DIR / "category_keywords.json"
-OVERVIEW_CSV = BASE_DIR / "Dzukou_Pricing_Overview_With_Names - Copy.csv"
+OVERVIEW_CSV = catalog.OVERVIEW_CSV
+DB_PATH = catalog_db.DB_PATH
 DATA_DIR = BASE_DIR / "product_data"
 SCRAPER_PY = BASE_DIR / "scraper.py"
 class ProductManagerGUI:
@@ -198,54 +200,64 @@ class ProductManagerGUI:
         keywords = [k.strip() for k in keywords_str.split(",") if k.strip()]
 
         try:
-            DATA_DIR.mkdir(exist_ok=True)
-
-            mapping = []
-            if MAPPING_CSV.exists():
-                with open(MAPPING_CSV, newline="") as f:
-                    mapping = list(csv.DictReader(f))
-
             # Use a single CSV per category so competitor data is grouped
             # regardless of product names
             file_name = self.sanitize_filename(category)
             data_file = DATA_DIR / file_name
-            if not data_file.exists():
-                data_file.write_text("category,store,product_name,price,search_term,store_url\n")
-
-            mapping.append({"Product Name": name, "Product ID": prod_id, "Data File": str(data_file)})
-
-            with open(MAPPING_CSV, "w", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=["Product Name", "Product ID", "Data File"])
-                writer.writeheader()
-                writer.writerows(mapping)
-
-            # update overview csv
-            overview_rows = []
-            if OVERVIEW_CSV.exists():
-                with open(OVERVIEW_CSV, newline="", encoding="cp1252") as f:
-                    overview_rows = list(csv.DictReader(f))
-
-            overview_rows.append({
-                "Product Name": name,
-                "Product ID": prod_id,
-                " Current Price ": f"{price_val}",
-                " Unit Cost ": f"{cost_val}"
-            })
-
-            with open(OVERVIEW_CSV, "w", newline="", encoding="cp1252") as f:
-                writer = csv.DictWriter(
-                    f,
-                    fieldnames=["Product Name", "Product ID", " Current Price ", " Unit Cost "],
-                )
-                writer.writeheader()
-                writer.writerows(overview_rows)
 
-            kw_data = self.load_keywords()
-            kws = kw_data.setdefault(category, [])
-            for kw in keywords:
-                if kw and kw not in kws:
-                    kws.append(kw)
-            self.save_keywords(kw_data)
+            conn = self.open_db()
+            try:
+                existing = catalog_db.product(conn, prod_id)
+                if existing is not None:
+                    messagebox.showerror("Error", f"Product ID {prod_id} is already used by '{existing.name}'")
+                    return
+                # The database rows roll back if anything below fails. The
+                # CSV rows are appended last, and both CSVs are cut back to
+                # their old size on failure (including a failed commit), so
+                # a retry does not add a second row. The keyword file and
+                # the empty data file may stay; a retry leaves them as is.
+                sizes = self.file_sizes([OVERVIEW_CSV, MAPPING_CSV])
+                try:
+                    with conn:
+                        catalog_db.add_product(conn, prod_id, name, price_val, cost_val, category, data_file)
+                        catalog_db.add_keywords(conn, category, keywords)
+
+                        DATA_DIR.mkdir(exist_ok=True)
+                        if not data_file.exists():
+                            data_file.write_text("category,store,product_name,price,search_term,store_url\n")
+
+                        # the keyword file is only rewritten when it changes
+                        kw_data = self.load_keywords()
+                        new_category = category not in kw_data
+                        kws = kw_data.setdefault(category, [])
+                        new_keywords = [kw for kw in dict.fromkeys(keywords) if kw not in kws]
+                        if new_category or new_keywords:
+                            kws.extend(new_keywords)
+                            self.save_keywords(kw_data)
+
+                        # the optimizer reads the CSVs; append instead of rewriting
+                        # them. The overview goes first: it is the file Excel locks.
+                        catalog.append_rows(
+                            OVERVIEW_CSV,
+                            catalog.OVERVIEW_HEADER,
+                            [{
+                                "Product Name": name,
+                                "Product ID": prod_id,
+                                " Current Price ": f"{price_val}",
+                                " Unit Cost ": f"{cost_val}"
+                            }],
+                            encoding="cp1252",
+                        )
+                        catalog.append_rows(
+                            MAPPING_CSV,
+                            catalog.MAPPING_COLUMNS,
+                            [{"Product Name": name, "Product ID": prod_id, "Data File": str(data_file)}],
+                        )
+                except BaseException:
+                    self.restore_sizes(sizes)
+                    raise
+            finally:
+                conn.close()
 
             # Update scraper.py with the new category
             scraper_updated = self.update_scraper_categories(category, keywords, file_name)
@@ -276,12 +288,38 @@ class ProductManagerGUI:
             messagebox.showerror("Error", f"Failed to add product: {str(e)}")
             self.status_var.set("Error occurred while adding product")
 
+    @staticmethod
+    def file_sizes(paths: list) -> dict:
+        """Return the size of each file, ``None`` for a missing one."""
+        return {path: path.stat().st_size if path.exists() else None for path in paths}
+
+    @staticmethod
+    def restore_sizes(sizes: dict) -> None:
+        """Cut files back to the sizes from :meth:`file_sizes`, removing new ones."""
+        for path, size in sizes.items():
+            if size is None:
+                path.unlink(missing_ok=True)
+            elif path.exists() and path.stat().st_size != size:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+
+    def open_db(self):
+        """Connect to the catalog database, importing the CSVs on first use."""
+        conn = catalog_db.connect(DB_PATH)
+        if catalog_db.product_count(conn) == 0:
+            catalog_db.import_csvs(conn, OVERVIEW_CSV, MAPPING_CSV, KEYWORDS_JSON, DATA_DIR)
+        return conn
+
     def update_status(self):
         try:
-            product_count = 0
-            if MAPPING_CSV.exists():
-                with open(MAPPING_CSV, newline="") as f:
-                    product_count = len(list(csv.DictReader(f)))
+            if DB_PATH.exists():
+                conn = catalog_db.connect(DB_PATH)
+                try:
+                    product_count = catalog_db.product_count(conn)
+                finally:
+                    conn.close()
+            else:
+                product_count = len(catalog.read_mapping_cached(MAPPING_CSV))
 
             category_count = 0
             if KEYWORDS_JSON.exists():
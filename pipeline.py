@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""Incremental end-to-end pipeline: scrape → stats → optimize → dashboard.
+
+The steps that used to be run by hand are modelled as a DAG of small tasks:
+
+* ``scrape:<category>`` – re-scrape one category (only when asked for)
+* ``stats:<data file>:<category>`` – clean and summarize competitor prices
+* ``optimize:<product id>`` – price one product from its category's stats
+* ``recommend`` – simulate profits and A/B tests, write ``recommended_prices.csv``
+* ``dashboard`` – render ``dashboard.html``
+
+Every task declares the files it reads and writes. A task's key is the
+hash of its parameters and of the contents of its inputs, including the
+code it runs. The key and the digests of its outputs are recorded in
+``product_data/.pipeline/state.json`` as soon as the task finishes. A task
+is skipped when its key and outputs are unchanged, so after a crash the
+next run resumes where it stopped. Refreshing one category re-runs only the
+tasks downstream of its data file. Independent tasks run in parallel
+worker processes.
+
+Example::
+
+    python pipeline.py                       # refresh whatever changed
+    python pipeline.py --scrape "Coffee Mugs"  # re-scrape one category
+    python pipeline.py --dry-run             # list the tasks that would run
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple
+
+import catalog
+import catalog_db
+import competitor_stats
+import competitor_store
+import price_optimizer as po
+from utils import canonical_key
+
+BASE_DIR = Path(__file__).resolve().parent
+PIPELINE_DIR = BASE_DIR / "product_data" / ".pipeline"
+STATE_JSON = PIPELINE_DIR / "state.json"
+DASHBOARD_HTML = BASE_DIR / "dashboard.html"
+
+# code each kind of task runs; editing it invalidates the task
+STATS_CODE = ["price_optimizer.py", "competitor_stats.py", "competitor_store.py", "keyword_matcher.py"]
+OPTIMIZE_CODE = ["price_optimizer.py", "demand_models.py", "competitor_stats.py"]
+DASHBOARD_CODE = ["dashboard.py"]
+
+
+class Task(NamedTuple):
+    """One node of the pipeline DAG.
+
+    ``func(*args)`` runs in a worker process and must write ``outputs``.
+    ``inputs`` are hashed when the task is about to run, after its
+    dependencies finished; a callable is evaluated at that point. Tasks
+    with the same ``exclusive`` tag never run at the same time.
+    """
+
+    name: str
+    func: Callable
+    args: tuple
+    inputs: List[Path] | Callable[[], List[Path]]
+    outputs: List[Path]
+    deps: List[str] = []
+    params: Dict = {}
+    exclusive: str | None = None
+    always: bool = False  # run even when the key is unchanged
+
+
+class PipelineState:
+    """Keys and output digests of finished tasks, persisted after each one."""
+
+    def __init__(self, path: Path = STATE_JSON) -> None:
+        self.path = Path(path)
+        self.tasks: Dict[str, Dict] = {}
+        self.files: Dict[str, Dict] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.tasks = data.get("tasks", {})
+                self.files = data.get("files", {})
+            except (OSError, ValueError):
+                pass
+
+    def digest(self, path: Path) -> str:
+        """Content hash of ``path``, memoized by size and modification time."""
+        path = Path(path)
+        if not path.exists():
+            return "missing"
+        st = path.stat()
+        memo = self.files.get(str(path))
+        if memo and memo["size"] == st.st_size and memo["mtime_ns"] == st.st_mtime_ns:
+            return memo["sha256"]
+        digest = competitor_stats.file_digest(path)
+        self.files[str(path)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        return digest
+
+    def key(self, task: Task) -> str:
+        inputs = task.inputs() if callable(task.inputs) else task.inputs
+        parts = {
+            "params": task.params,
+            "inputs": {str(Path(p).relative_to(BASE_DIR)) if Path(p).is_relative_to(BASE_DIR) else str(p):
+                       self.digest(p) for p in inputs},
+        }
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def fresh(self, task: Task, key: str) -> bool:
+        entry = self.tasks.get(task.name)
+        if entry is None or entry["key"] != key:
+            return False
+        return all(self.digest(p) == entry["outputs"].get(str(p)) for p in task.outputs)
+
+    def record(self, task: Task, key: str) -> None:
+        self.tasks[task.name] = {"key": key, "outputs": {str(p): self.digest(p) for p in task.outputs}}
+        self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"tasks": self.tasks, "files": self.files}, f)
+        os.replace(tmp, self.path)
+
+
+# --- task bodies (run in worker processes) ---------------------------------
+
+
+def _write_json(path: Path, data) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def run_scrape(category: str) -> None:
+    import scraper
+    from http_cache import ResponseCache
+
+    cache = ResponseCache()
+    s = scraper.ProductScraper(cache=cache, db_path=catalog_db.DB_PATH)
+    s.product_categories = {category: s.product_categories[category]}
+    s.results_by_category = {category: []}
+    s.scrape_all_stores()
+    s.save_category_csvs()
+    cache.flush()
+
+
+def run_stats(data_file: Path, category: str, out: Path) -> None:
+    stats = competitor_stats.summarize(po.read_prices(data_file, category))
+    _write_json(out, stats._asdict())
+
+
+def run_optimize(name: str, category: str, stats_json: Path, cur: float, unit: float, method: str, out: Path) -> None:
+    stats = competitor_stats.CompetitorStats(**_read_json(stats_json))
+    price = po.suggest_price(name, category, stats, cur, unit, method=method)
+    _write_json(out, {"price": price})
+
+
+def run_recommend(products: List[tuple], out: Path) -> None:
+    """``products`` are ``(product id, name, category, stats json, price json, info)``."""
+    rows, suggested = [], []
+    for product_id, name, category, stats_json, price_json, info in products:
+        stats = competitor_stats.CompetitorStats(**_read_json(stats_json))
+        rows.append(({"Product ID": product_id}, name, category, stats, info))
+        suggested.append(_read_json(price_json)["price"])
+    po.write_recommendations(rows, suggested, out, db_path=catalog_db.DB_PATH)
+
+
+def run_dashboard(out: Path) -> None:
+    import dashboard
+
+    dashboard.build_dashboard(dashboard.load_data(), out)
+
+
+# --- graph -----------------------------------------------------------------
+
+
+def _slug(text: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in text).strip("_").lower()
+
+
+def _code(files: Iterable[str]) -> List[Path]:
+    return [BASE_DIR / f for f in files]
+
+
+def build_tasks(scrape: Iterable[str] | None = None, method: str = "auto") -> List[Task]:
+    """Return the tasks of one pipeline run.
+
+    ``scrape`` names the categories to re-scrape (empty for all of them,
+    ``None`` for none). Names are matched by ``canonical_key``, as
+    ``ProductScraper.load_categories`` merges them; an unknown name raises
+    ``ValueError``.
+    """
+    tasks: List[Task] = []
+    scraped_by_file: Dict[Path, str] = {}
+    if scrape is not None:
+        import scraper
+
+        categories = scraper.ProductScraper(cache=None).product_categories
+        by_key = {canonical_key(name): name for name in categories}
+        requested = []
+        for name in list(scrape) or list(categories):
+            category = by_key.get(canonical_key(name))
+            if category is None:
+                raise ValueError(f"Unknown category {name!r}; available: {', '.join(categories)}")
+            if category not in requested:
+                requested.append(category)
+        for category in requested:
+            out = scraper.DATA_DIR / categories[category]["csv_filename"]
+            name = f"scrape:{category}"
+            tasks.append(Task(
+                name, run_scrape, (category,), [BASE_DIR / "category_keywords.json"], [out],
+                params={"category": category}, exclusive="network", always=True,
+            ))
+            scraped_by_file[out.resolve()] = name
+
+    stats_tasks: Dict[tuple, Task] = {}
+    products = []
+    for product in catalog.load(po.OVERVIEW_CSV, po.MAPPING_CSV).products:
+        name = product.name
+        data_file = (BASE_DIR / product.data_file).resolve()
+        category = po.categorize_product(name)
+        if (data_file, category) not in stats_tasks:
+            out = PIPELINE_DIR / "stats" / f"{data_file.stem}__{_slug(category)}.json"
+            stats_tasks[(data_file, category)] = Task(
+                f"stats:{data_file.stem}:{category}",
+                run_stats,
+                (data_file, category, out),
+                lambda data_file=data_file: [data_file, competitor_store.source_path(data_file)]
+                + _code(STATS_CODE) + [BASE_DIR / "category_keywords.json"],
+                [out],
+                deps=[scraped_by_file[data_file]] if data_file in scraped_by_file else [],
+                params={"category": category},
+            )
+        products.append((product.id, name, category, stats_tasks[(data_file, category)], product.info()))
+    tasks.extend(stats_tasks.values())
+
+    recommend_inputs, recommend_args, recommend_deps = [], [], []
+    for product_id, name, category, stats_task, info in products:
+        stats_json = stats_task.outputs[0]
+        out = PIPELINE_DIR / "prices" / f"{_slug(product_id)}.json"
+        tasks.append(Task(
+            f"optimize:{product_id}",
+            run_optimize,
+            (name, category, stats_json, info["current_price"], info["unit_cost"], method, out),
+            [stats_json] + _code(OPTIMIZE_CODE),
+            [out],
+            deps=[stats_task.name],
+            params={"name": name, "category": category, "info": info, "method": method},
+        ))
+        recommend_inputs += [stats_json, out]
+        recommend_args.append((product_id, name, category, stats_json, out, info))
+        recommend_deps += [stats_task.name, f"optimize:{product_id}"]
+
+    tasks.append(Task(
+        "recommend",
+        run_recommend,
+        (recommend_args, po.RECOMMENDED_CSV),
+        recommend_inputs + _code(OPTIMIZE_CODE),
+        [po.RECOMMENDED_CSV],
+        deps=sorted(set(recommend_deps)),
+        params={"products": [a[:3] for a in recommend_args]},
+    ))
+    tasks.append(Task(
+        "dashboard",
+        run_dashboard,
+        (DASHBOARD_HTML,),
+        [po.RECOMMENDED_CSV, po.OVERVIEW_CSV] + _code(DASHBOARD_CODE),
+        [DASHBOARD_HTML],
+        deps=["recommend"],
+    ))
+    return tasks
+
+
+# --- scheduler -------------------------------------------------------------
+
+
+def run(
+    tasks: List[Task],
+    state: PipelineState | None = None,
+    workers: int | None = None,
+    force: bool = False,
+    dry_run: bool = False,
+    executor: str = "process",
+) -> Dict[str, str]:
+    """Run ``tasks`` in dependency order and return each task's outcome.
+
+    Outcomes are ``"ran"``, ``"unchanged"``, ``"failed"`` or ``"blocked"``
+    (a dependency failed). With ``dry_run`` nothing executes; tasks are
+    reported as ``"would run"`` when their key changed or a dependency
+    would run.
+    """
+    state = state or PipelineState()
+    by_name = {t.name: t for t in tasks}
+    for task in tasks:
+        missing = [d for d in task.deps if d not in by_name]
+        if missing:
+            raise ValueError(f"{task.name} depends on unknown tasks: {', '.join(missing)}")
+    outcome: Dict[str, str] = {}
+    running: Dict = {}
+    busy_tags = set()
+    pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+
+    with pool_cls(max_workers=workers or os.cpu_count() or 1) as pool:
+        while len(outcome) < len(tasks):
+            progressed = False
+            for task in tasks:
+                if task.name in outcome or any(r[0].name == task.name for r in running.values()):
+                    continue
+                deps = [outcome.get(d) for d in task.deps]
+                if any(d is None for d in deps):
+                    continue
+                if any(d in ("failed", "blocked") for d in deps):
+                    outcome[task.name] = "blocked"
+                    progressed = True
+                    continue
+                if task.exclusive and task.exclusive in busy_tags:
+                    continue
+                progressed = True
+                if dry_run:
+                    changed = task.always or force or not state.fresh(task, state.key(task))
+                    outcome[task.name] = "would run" if changed or "would run" in deps else "unchanged"
+                    continue
+                key = state.key(task)
+                if not (task.always or force) and state.fresh(task, key):
+                    outcome[task.name] = "unchanged"
+                    continue
+                future = pool.submit(task.func, *task.args)
+                running[future] = (task, key, time.perf_counter())
+                if task.exclusive:
+                    busy_tags.add(task.exclusive)
+            if progressed or not running:
+                if not running and not progressed and len(outcome) < len(tasks):
+                    raise ValueError("Dependency cycle among: " + ", ".join(
+                        t.name for t in tasks if t.name not in outcome))
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task, key, start = running.pop(future)
+                busy_tags.discard(task.exclusive)
+                try:
+                    future.result()
+                except Exception as exc:
+                    outcome[task.name] = "failed"
+                    print(f"  ✗ {task.name}: {exc}")
+                    continue
+                state.record(task, key)
+                outcome[task.name] = "ran"
+                print(f"  ✓ {task.name} ({time.perf_counter() - start:.2f}s)")
+    return outcome
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scrape",
+        nargs="*",
+        metavar="CATEGORY",
+        help="re-scrape these categories first (all of them when none are given)",
+    )
+    parser.add_argument(
+        "--optimizer",
+        choices=["auto", *po.OPTIMIZERS],
+        default="auto",
+        help="per-product optimizer (default: analytic for the built-in demand model)",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="run every task even if unchanged")
+    parser.add_argument("--dry-run", action="store_true", help="list the tasks that would run")
+    args = parser.parse_args(argv)
+
+    try:
+        tasks = build_tasks(args.scrape, args.optimizer)
+    except ValueError as exc:
+        parser.error(str(exc))
+    outcome = run(tasks, workers=args.workers, force=args.force, dry_run=args.dry_run)
+    if args.dry_run:
+        for task in tasks:
+            print(f"  {outcome[task.name]:>9}  {task.name}")
+    counts = {k: sum(v == k for v in outcome.values()) for k in dict.fromkeys(outcome.values())}
+    print("Pipeline: " + ", ".join(f"{n} {k}" for k, n in counts.items()))
+    if any(v in ("failed", "blocked") for v in outcome.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
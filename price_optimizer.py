@@ -1,26 +1,29 @@
 #!/usr/bin/env python3
 """Price optimizer for Dzukou products."""
 
+import argparse
 import csv
+import functools
 import os
 import re
 import statistics
-import json
-import random
-from scipy import stats
 from pathlib import Path
 from typing import Dict, List
 
-try:
-    from skopt import gp_minimize
-    from skopt.space import Real
-except Exception:  # library may not be installed
-    gp_minimize = None
-    Real = None
+import numpy as np
+
+import competitor_store
+import competitor_stats
+import demand_models
+import keyword_matcher
+import price_sketch
 
 BASE_DIR = Path(__file__).resolve().parent
 
 PRICE_STEP = 0.25  # granularity for optimizer
+REFINE_POINTS = 41  # points in the optimizer's second pass around the best step
+WARM_START_POINTS = 5  # best evaluations of a similar product used to seed the GP
+EI_STOP_THRESHOLD = 1e-3  # stop once expected improvement < this share of the best profit
 
 # Cap ratio relative to the mean competitor price. This is calculated
 # dynamically from competitor price dispersion so recommendations stay
@@ -39,9 +42,7 @@ def clean_prices(prices: List[float]) -> List[float]:
     """Remove outliers and invalid data from scraped prices."""
     valid = [p for p in prices if 0 < p < 10000]
     if len(valid) >= 4:
-        # compute quartiles separately for clarity
-        q1 = statistics.quantiles(valid, n=4)[0]
-        q3 = statistics.quantiles(valid, n=4)[2]
+        q1, _, q3 = statistics.quantiles(valid, n=4)
         iqr = q3 - q1
         low = q1 - 1.5 * iqr
         high = q3 + 1.5 * iqr
@@ -62,6 +63,7 @@ def optimize_price(
     demand_base: float = 100.0,
     saturation: float = 1.0,
     mean_cap_ratio: float | None = None,
+    model=demand_models.DEFAULT_MODEL,
 ) -> float:
     """Search for a price that maximizes estimated profit.
 
@@ -75,15 +77,16 @@ def optimize_price(
     """
     base = unit_cost * (1 + margin)
 
-    if not prices:
+    summary = competitor_stats.summarize(prices)
+    if not summary.count:
         avg = current_price
         competitor_high = current_price
         competitor_low = current_price
     else:
-        avg = statistics.mean(prices)
-        competitor_high = max(prices)
-        competitor_low = min(prices)
-    stdev = statistics.stdev(prices) if len(prices) > 1 else 0.0
+        avg = summary.mean
+        competitor_high = summary.max
+        competitor_low = summary.min
+    stdev = summary.stdev
     if mean_cap_ratio is None:
         mean_cap_ratio = compute_mean_cap(avg, stdev)
 
@@ -95,32 +98,110 @@ def optimize_price(
     if high < low:
         high = low
 
-    best_price = base
-    best_profit = -1e9
-
     # grid search with adaptive resolution so very wide ranges don't take too
     # long. the step is adjusted if more than 100 steps would be required.
     steps = int((high - low) / price_step) + 1
     if steps > 100:
         price_step = (high - low) / 100
+        steps = 101
+
+    # evaluate the whole grid at once; building it from integer offsets keeps
+    # the points exact instead of accumulating float error step by step
+    grid = low + np.arange(steps) * price_step
+    grid = grid[grid <= high + 1e-9]
+    profits = simulate_profit(grid, unit_cost, avg, demand_base, elasticity, saturation, model)
+    best = int(np.argmax(profits))
+
+    # second, finer pass over the neighbourhood of the coarse optimum
+    fine = np.linspace(
+        max(low, grid[best] - price_step),
+        min(high, grid[best] + price_step),
+        REFINE_POINTS,
+    )
+    fine_profits = simulate_profit(fine, unit_cost, avg, demand_base, elasticity, saturation, model)
+    best_price = float(fine[np.argmax(fine_profits)])
 
-    price = low
-    while price <= high:
-        profit = simulate_profit(
-            price,
+    best_price = max(best_price, base)
+    return round_price(best_price)
+
+
+def profit_maximizing_price(
+    low: float,
+    high: float,
+    unit_cost: float,
+    avg_competitor: float,
+    demand_base: float = 100.0,
+    elasticity: float = 1.2,
+    saturation: float = 1.0,
+    model=demand_models.DEFAULT_MODEL,
+) -> float | None:
+    """Return the price in ``[low, high]`` that maximizes :func:`simulate_profit`.
+
+    Delegates to the demand model's exact solver; ``None`` if it has none.
+    """
+    return demand_models.get_model(model).optimal_price(
+        low, high, unit_cost, avg_competitor, demand_base, elasticity, saturation
+    )
+
+
+def analytic_optimize_price(
+    prices: List[float],
+    current_price: float,
+    unit_cost: float,
+    margin: float,
+    elasticity: float = 1.2,
+    max_markup: float = 1.8,
+    max_increase: float = 0.30,
+    max_decrease: float = 0.25,
+    demand_base: float = 100.0,
+    saturation: float = 1.0,
+    mean_cap_ratio: float | None = None,
+    model=demand_models.DEFAULT_MODEL,
+) -> float:
+    """Exact optimum of the demand model within the usual bounds.
+
+    Same bounds and rounding as :func:`optimize_price`, but the maximum is
+    found with :func:`profit_maximizing_price` instead of sampling. Models
+    without an exact solver fall back to :func:`optimize_price`.
+    """
+    if not demand_models.get_model(model).exact:
+        return optimize_price(
+            prices,
+            current_price,
             unit_cost,
-            avg,
-            demand_base,
-            elasticity,
-            saturation,
+            margin,
+            elasticity=elasticity,
+            max_markup=max_markup,
+            max_increase=max_increase,
+            max_decrease=max_decrease,
+            demand_base=demand_base,
+            saturation=saturation,
+            mean_cap_ratio=mean_cap_ratio,
+            model=model,
         )
-        if profit > best_profit:
-            best_profit = profit
-            best_price = price
-        price += price_step
+    base = unit_cost * (1 + margin)
 
-    best_price = max(best_price, base)
-    return round_price(best_price)
+    summary = competitor_stats.summarize(prices)
+    if not summary.count:
+        avg = current_price
+        competitor_high = current_price
+        competitor_low = current_price
+    else:
+        avg = summary.mean
+        competitor_high = summary.max
+        competitor_low = summary.min
+    stdev = summary.stdev
+    if mean_cap_ratio is None:
+        mean_cap_ratio = compute_mean_cap(avg, stdev)
+
+    low = max(base, competitor_low * 0.9, current_price * (1 - max_decrease))
+    high = max(current_price, competitor_high, avg, base) * max_markup
+    high = min(high, current_price * (1 + max_increase), avg * mean_cap_ratio)
+    if high < low:
+        high = low
+
+    best_price = profit_maximizing_price(low, high, unit_cost, avg, demand_base, elasticity, saturation, model)
+    return round_price(max(best_price, base))
 
 
 def bayesian_optimize_price(
@@ -136,9 +217,23 @@ def bayesian_optimize_price(
     saturation: float = 1.0,
     mean_cap_ratio: float | None = None,
     n_calls: int = 25,
+    warm_start: List[tuple] | None = None,
+    ei_threshold: float | None = None,
+    evaluations: List[tuple] | None = None,
+    model=demand_models.DEFAULT_MODEL,
 ) -> float:
-    """Use Bayesian optimization to maximize profit."""
-    if gp_minimize is None:
+    """Use Bayesian optimization to maximize profit.
+
+    ``warm_start`` holds ``(relative_price, profit)`` pairs from a similar
+    product. Its best points, mapped onto this product's competitor mean,
+    replace most of the random initial points. With ``ei_threshold`` the
+    search stops once the expected improvement anywhere in the range falls
+    below that share of the best profit so far. If ``evaluations`` is a
+    list, every evaluated point is appended to it in the same
+    ``(relative_price, profit)`` form.
+    """
+    skopt = _skopt()
+    if skopt is None:
         # fall back to grid search when skopt is unavailable
         return optimize_price(
             prices,
@@ -152,18 +247,20 @@ def bayesian_optimize_price(
             demand_base=demand_base,
             saturation=saturation,
             mean_cap_ratio=mean_cap_ratio,
+            model=model,
         )
 
     base = unit_cost * (1 + margin)
-    if not prices:
+    summary = competitor_stats.summarize(prices)
+    if not summary.count:
         avg = current_price
         competitor_high = current_price
         competitor_low = current_price
     else:
-        avg = statistics.mean(prices)
-        competitor_high = max(prices)
-        competitor_low = min(prices)
-    stdev = statistics.stdev(prices) if len(prices) > 1 else 0.0
+        avg = summary.mean
+        competitor_high = summary.max
+        competitor_low = summary.min
+    stdev = summary.stdev
     if mean_cap_ratio is None:
         mean_cap_ratio = compute_mean_cap(avg, stdev)
 
@@ -173,6 +270,7 @@ def bayesian_optimize_price(
     if high <= low:
         return round_price(max(low, base))
 
+    gp_minimize, _, Real = skopt
     space = [Real(low, high)]
 
     def objective(x: List[float]) -> float:
@@ -184,16 +282,42 @@ def bayesian_optimize_price(
             demand_base,
             elasticity,
             saturation,
+            model,
         )
         return -profit
 
+    n_initial = max(5, n_calls // 4)
+    x0 = None
+    if warm_start:
+        # relative prices transfer between products priced against the same
+        # competitors; keep the most profitable ones that fall in range
+        best_first = sorted(warm_start, key=lambda e: -e[1])
+        x0 = []
+        for ratio, _ in best_first:
+            p = min(max(ratio * avg, low), high)
+            if all(abs(p - q[0]) > 1e-6 for q in x0):
+                x0.append([p])
+            if len(x0) == WARM_START_POINTS:
+                break
+        n_initial = max(1, n_initial - len(x0))
+
+    callbacks = []
+    if ei_threshold is not None:
+        callbacks.append(_ei_stopper(ei_threshold, low, high))
+
     res = gp_minimize(
         objective,
         space,
         n_calls=n_calls,
-        n_random_starts=max(5, n_calls // 4),
+        n_initial_points=n_initial,
+        x0=x0,
         random_state=42,
+        callback=callbacks or None,
     )
+    if evaluations is not None:
+        evaluations.extend(
+            (x[0] / max(avg, 0.01), -y) for x, y in zip(res.x_iters, res.func_vals)
+        )
 
     best_price = res.x[0]
     best_price = max(best_price, base)
@@ -203,10 +327,40 @@ def bayesian_optimize_price(
     return round_price(best_price)
 
 
+@functools.lru_cache(maxsize=None)
+def _skopt():
+    """Return ``(gp_minimize, gaussian_ei, Real)``, or ``None`` without scikit-optimize.
+
+    scikit-optimize (and the SciPy it pulls in) takes about a second to
+    import, so it is only loaded once a Bayesian search runs.
+    """
+    try:
+        from skopt import gp_minimize
+        from skopt.acquisition import gaussian_ei
+        from skopt.space import Real
+    except Exception:  # library may not be installed
+        return None
+    return gp_minimize, gaussian_ei, Real
+
+
+def _ei_stopper(threshold: float, low: float, high: float):
+    """gp_minimize callback that stops when expected improvement is tiny."""
+    grid = [[p] for p in np.linspace(low, high, 200)]
+
+    def callback(res) -> bool:
+        if not res.models:
+            return False
+        ei = _skopt()[1](res.space.transform(grid), res.models[-1], y_opt=res.fun)
+        return float(np.max(ei)) < threshold * max(abs(res.fun), 1.0)
+
+    return callback
+
+
 
 
 OVERVIEW_CSV = BASE_DIR / "Dzukou_Pricing_Overview_With_Names - Copy.csv"
 MAPPING_CSV = BASE_DIR / "product_data_mapping.csv"
+RECOMMENDED_CSV = BASE_DIR / "recommended_prices.csv"
 
 # Minimum profit margins by category
 PROFIT_MARGINS = {
@@ -261,6 +415,25 @@ DEMAND_SATURATION = {
     "Towels": 1.0,
 }
 
+# Demand model per category, by name in ``demand_models.MODELS``
+# ("logistic_relative", "constant_elasticity", "linear" or "learned").
+# Categories not listed use ``demand_models.DEFAULT_MODEL``.
+DEMAND_MODEL = {
+    "Sunglasses": "logistic_relative",
+    "Bottles": "logistic_relative",
+    "Coffee mugs": "logistic_relative",
+    "Phone accessories": "logistic_relative",
+    "Notebook": "logistic_relative",
+    "Lunchbox": "logistic_relative",
+    "Premium shawls": "logistic_relative",
+    "Eri silk shawls": "logistic_relative",
+    "Cotton scarf": "logistic_relative",
+    "Other scarves and shawls": "logistic_relative",
+    "Cushion covers": "logistic_relative",
+    "Coasters & placements": "logistic_relative",
+    "Towels": "logistic_relative",
+}
+
 # Maximum markup relative to the average competitor price
 MAX_MARKUP = {
     "Sunglasses": 1.8,
@@ -347,79 +520,77 @@ KEYWORDS_JSON = BASE_DIR / "category_keywords.json"
 
 def load_category_keywords() -> Dict[str, List[str]]:
     """Return category keywords loaded from ``KEYWORDS_JSON`` if present."""
-    path = KEYWORDS_JSON
-    if path.exists():
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            if isinstance(data, dict):
-                return {k: list(map(str, v)) for k, v in data.items()}
-        except Exception:
-            pass
-    return DEFAULT_CATEGORY_KEYWORDS
+    return keyword_matcher.read_keywords(KEYWORDS_JSON, DEFAULT_CATEGORY_KEYWORDS)
+
 
+DEFAULT_CATEGORY = "Other scarves and shawls"  # default to shawls if unknown
 
-CATEGORY_KEYWORDS = load_category_keywords()
+
+def category_matcher() -> keyword_matcher.KeywordMatcher:
+    """Compiled matcher for ``KEYWORDS_JSON``, rebuilt when the file changes."""
+    return keyword_matcher.load(KEYWORDS_JSON, DEFAULT_CATEGORY_KEYWORDS)
+
+
+def __getattr__(name: str):
+    # ``CATEGORY_KEYWORDS`` used to be read at import; it is now loaded on
+    # first access and follows edits of ``KEYWORDS_JSON``
+    if name == "CATEGORY_KEYWORDS":
+        return category_matcher().keywords
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def categorize_product(name: str) -> str:
-    name_l = name.lower()
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        for kw in keywords:
-            if kw in name_l:
-                return category
-    return "Other scarves and shawls"  # default to shawls if unknown
+    return category_matcher().categorize(name, DEFAULT_CATEGORY)
+
+
+def categorize_products(names) -> np.ndarray:
+    """Categorize a whole column of product names in one pass."""
+    return category_matcher().categorize_many(names, DEFAULT_CATEGORY)
 
 
 def read_overview() -> Dict[str, Dict[str, float]]:
-    data = {}
-    # The overview CSV may come from Excel and often uses Windows-1252 encoding
-    with open(OVERVIEW_CSV, newline="", encoding="cp1252") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            name = row["Product Name"].strip()
-            cur_price = float(row[" Current Price "].replace("€", "").strip())
-            unit_cost = float(row[" Unit Cost "].replace("€", "").strip())
-            data[name] = {"current_price": cur_price, "unit_cost": unit_cost}
-    return data
+    """Current price and unit cost per product name (see :mod:`catalog`)."""
+    import catalog  # loads pandas, so it is not imported with this module
 
+    return {name: product.info() for name, product in catalog.load(OVERVIEW_CSV, MAPPING_CSV).by_name.items()}
 
-def read_prices(csv_path: Path, category: str | None = None) -> List[float]:
-    """Return cleaned competitor prices from a CSV file.
 
-    The files scraped for competitor pricing often include unrelated
-    products. When ``category`` is provided, rows whose product name does
-    not contain any of the configured keywords for that category are
-    discarded before the price cleaning step.
+def _keep_mask(data: competitor_store.CompetitorPrices, category: str | None) -> np.ndarray:
+    mask = (data.price > 0) & (data.price < 10000)
+    if category:
+        matcher = category_matcher()
+        if matcher.keywords.get(category):
+            mask &= matcher.contains(category, data.product_name) | matcher.contains(category, data.search_term)
+    return mask
+
+
+def read_prices(csv_path: Path, category: str | None = None) -> List[float]:
+    """Return cleaned competitor prices for a category data file.
+
+    Data comes from the columnar competitor store when it holds a snapshot
+    at least as new as ``csv_path`` and from the CSV otherwise (see
+    ``competitor_store.load_category``). The files scraped for competitor
+    pricing often include unrelated products. When ``category`` is provided,
+    rows whose product name does not contain any of the configured keywords
+    for that category are discarded before the price cleaning step.
     """
 
-    prices = []
-    keywords: List[str] | None = None
-    if category:
-        words = CATEGORY_KEYWORDS.get(category)
-        if words:
-            keywords = [w.lower() for w in words]
-
-    with open(csv_path, newline="", encoding="cp1252") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if keywords:
-                name_field = (row.get("product_name") or "").lower()
-                term_field = (row.get("search_term") or "").lower()
-                if not any(k in name_field or k in term_field for k in keywords):
-                    continue
-
-            price = row.get("price") or row.get("Price")
-            if not price:
-                continue
-            price = price.replace("€", "").replace(",", "").strip()
-            try:
-                value = float(price)
-            except ValueError:
-                continue
-            if 0 < value < 10000:
-                prices.append(value)
-    return clean_prices(prices)
+    data = competitor_store.load_category(csv_path)
+    return clean_prices(data.price[_keep_mask(data, category)].tolist())
+
+
+def read_price_summary(csv_path: Path, category: str | None = None) -> competitor_stats.CompetitorStats:
+    """Statistics of the prices :func:`read_prices` would return, in fixed memory.
+
+    The data is read in chunks (``competitor_store.iter_category``), each
+    filtered like ``read_prices`` and fed to one
+    :class:`price_sketch.PriceSketch`, which does the cleaning. No price
+    list is kept (see ``price_sketch`` for the error bounds).
+    """
+    sketch = price_sketch.PriceSketch()
+    for data in competitor_store.iter_category(csv_path):
+        sketch.update(data.price[_keep_mask(data, category)])
+    return sketch.summary()
 
 
 def fallback_price(avg: float, min_p: float, cur: float, unit: float, margin: float) -> float:
@@ -430,39 +601,104 @@ def fallback_price(avg: float, min_p: float, cur: float, unit: float, margin: fl
 
 
 def simulate_profit(
-    price: float,
+    price,
     unit_cost: float,
-    avg_competitor: float,
+    avg_competitor,
     demand_base: float = 100.0,
-    elasticity: float = 1.2,
-    saturation: float = 1.0,
-) -> float:
-    """Estimate profit using a logistic demand model with market dynamics."""
-    if price <= 0:
-        return 0.0
-
-    # Price competitiveness factor
-    relative_price = price / max(avg_competitor, 0.01)
-
-    # Demand calculation with saturation and elasticity
-    # When ``relative_price`` is below 1 the ``(relative_price - 1)`` term
-    # becomes negative. Raising a negative number to a fractional power would
-    # result in a complex value which breaks later calculations. Using the
-    # absolute difference keeps the demand model smooth while avoiding complex
-    # results.
-    demand = demand_base * saturation / (
-        1 + abs(relative_price - 1) ** elasticity
+    elasticity=1.2,
+    saturation=1.0,
+    model=demand_models.DEFAULT_MODEL,
+):
+    """Estimate profit under a demand model (see :mod:`demand_models`).
+
+    ``price`` may be a scalar or a NumPy array (as may the other arguments,
+    as long as they broadcast). Scalars return a ``float``, arrays an array
+    of profits. ``model`` is a model name, or an array of names to use a
+    different model per element.
+    """
+    profit = demand_models.profit(
+        model, price, unit_cost, avg_competitor, demand_base, elasticity, saturation
+    )
+    return float(profit) if profit.ndim == 0 else profit
+
+
+AB_TEST_SEED = 0  # seed for the A/B simulation in main, keeps reruns comparable
+BOOTSTRAP_CHUNK = 4_000_000  # resampled values held in memory at once
+
+
+def _bootstrap_means(rng: np.random.Generator, samples: np.ndarray, replicates: int) -> np.ndarray:
+    """Means of ``replicates`` resamples (with replacement) along the last axis."""
+    n = samples.shape[-1]
+    chunk = max(1, BOOTSTRAP_CHUNK // samples.size)
+    means = []
+    for start in range(0, replicates, chunk):
+        idx = rng.integers(0, n, size=(min(chunk, replicates - start), n))
+        means.append(samples[..., idx].mean(axis=-1))
+    return np.concatenate(means, axis=-1)
+
+
+def simulate_ab_tests(
+    current_price,
+    new_price,
+    unit_cost,
+    avg_competitor,
+    demand_base=100.0,
+    elasticity=1.2,
+    saturation=1.0,
+    noise: float = 0.1,
+    n: int = 1000,
+    seed: int | None = None,
+    rng: np.random.Generator | None = None,
+    bootstrap: int = 0,
+    confidence: float = 0.95,
+    model=demand_models.DEFAULT_MODEL,
+) -> Dict[str, np.ndarray]:
+    """Simulate A/B tests for arrays of products and candidate prices.
+
+    All price and model arguments broadcast against each other, so a single
+    call can test every product (and every candidate price of every
+    product). The demand noise for both arms is drawn in one call from a
+    ``numpy.random.Generator`` built from ``seed`` unless ``rng`` is given.
+
+    Returns arrays shaped like the broadcast inputs. With ``bootstrap`` > 0
+    the result also holds a percentile confidence interval of the profit
+    delta (``ci_low``/``ci_high``) from ``bootstrap`` resamples of each arm.
+    """
+    rng = rng if rng is not None else np.random.default_rng(seed)
+    current_price, new_price, unit_cost, avg_competitor, demand_base, elasticity, saturation = (
+        np.broadcast_arrays(
+            *(np.asarray(v, dtype=float) for v in (
+                current_price, new_price, unit_cost, avg_competitor,
+                demand_base, elasticity, saturation,
+            ))
+        )
     )
+    base_a = demand_models.demand(model, current_price, avg_competitor, demand_base, elasticity, saturation)
+    base_b = demand_models.demand(model, new_price, avg_competitor, demand_base, elasticity, saturation)
 
-    # Additional market adjustments
-    if relative_price > 1.5:  # heavy penalty for very high prices
-        demand *= 0.7
-    elif relative_price < 0.8:  # slight boost for bargains
-        demand *= 1.2
+    draws = np.maximum(rng.normal(1.0, noise, size=current_price.shape + (2, n)), 0.0)
+    profits_control = draws[..., 0, :] * (base_a * (current_price - unit_cost))[..., None]
+    profits_test = draws[..., 1, :] * (base_b * (new_price - unit_cost))[..., None]
 
-    demand = max(0, demand)
+    mean_a = profits_control.mean(axis=-1)
+    mean_b = profits_test.mean(axis=-1)
+    from scipy import stats  # imported on first use; it is slow to load
 
-    return demand * (price - unit_cost)
+    _, p_value = stats.ttest_ind(profits_test, profits_control, axis=-1, equal_var=False)
+    result = {
+        "profit_control": mean_a,
+        "profit_test": mean_b,
+        "profit_delta": mean_b - mean_a,
+        "p_value": np.asarray(p_value, dtype=float),
+    }
+    if bootstrap > 0:
+        deltas = (
+            _bootstrap_means(rng, profits_test, bootstrap)
+            - _bootstrap_means(rng, profits_control, bootstrap)
+        )
+        tail = (1 - confidence) / 2 * 100
+        result["ci_low"], result["ci_high"] = np.percentile(deltas, [tail, 100 - tail], axis=-1)
+    return result
 
 
 def run_ab_test(
@@ -475,29 +711,26 @@ def run_ab_test(
     saturation: float = 1.0,
     noise: float = 0.1,
     n: int = 1000,
+    seed: int | None = None,
+    bootstrap: int = 0,
+    model=demand_models.DEFAULT_MODEL,
 ) -> Dict[str, float]:
     """Simulate an A/B test comparing two prices."""
-    profits_control = []
-    profits_test = []
-    for _ in range(n):
-        base_a = demand_base * saturation / (1 + (current_price / max(avg_competitor, 0.01)) ** elasticity)
-        base_b = demand_base * saturation / (1 + (new_price / max(avg_competitor, 0.01)) ** elasticity)
-        demand_a = base_a * max(0.0, random.gauss(1.0, noise))
-        demand_b = base_b * max(0.0, random.gauss(1.0, noise))
-        profits_control.append(demand_a * (current_price - unit_cost))
-        profits_test.append(demand_b * (new_price - unit_cost))
-
-    mean_a = statistics.mean(profits_control)
-    mean_b = statistics.mean(profits_test)
-    stat, p_value = stats.ttest_ind(profits_test, profits_control, equal_var=False)
-    return {
-        "profit_control": mean_a,
-        "profit_test": mean_b,
-        "profit_delta": mean_b - mean_a,
-        "p_value": float(p_value),
-    }
-
-
+    result = simulate_ab_tests(
+        current_price,
+        new_price,
+        unit_cost,
+        avg_competitor,
+        demand_base=demand_base,
+        elasticity=elasticity,
+        saturation=saturation,
+        noise=noise,
+        n=n,
+        seed=seed,
+        bootstrap=bootstrap,
+        model=model,
+    )
+    return {key: float(value) for key, value in result.items()}
 
 
 def suggest_price(
@@ -506,23 +739,38 @@ def suggest_price(
     prices: List[float],
     cur: float,
     unit: float,
+    warm_start: List[tuple] | None = None,
+    ei_threshold: float | None = None,
+    evaluations: List[tuple] | None = None,
+    method: str = "auto",
 ) -> float:
+    """Recommend a price for one product.
+
+    ``method`` picks the optimizer: ``"analytic"``, ``"bayesian"`` or
+    ``"grid"``. ``"auto"`` uses the analytic solver when the category's
+    demand model has an exact one and the grid search otherwise. The
+    warm-start and early-stopping options only apply to the Bayesian search.
+    """
     margin = PROFIT_MARGINS.get(category, 0.30)
     elasticity = DEMAND_ELASTICITY.get(category, 1.2)
     max_markup = MAX_MARKUP.get(category, 1.8)
     max_increase = MAX_INCREASE.get(category, MAX_INCREASE["default"])
     max_decrease = MAX_DECREASE.get(category, MAX_DECREASE["default"])
+    model = DEMAND_MODEL.get(category, demand_models.DEFAULT_MODEL)
 
-    if not prices:
+    summary = competitor_stats.summarize(prices)
+    if not summary.count:
         return round_price(max(unit * (1 + margin), cur))
 
-    avg = statistics.mean(prices)
-    median = statistics.median(prices)
-    stdev = statistics.stdev(prices) if len(prices) > 1 else 0.0
-    min_p = min(prices)
-    max_p = max(prices)
-    price = bayesian_optimize_price(
-        prices,
+    avg = summary.mean
+    stdev = summary.stdev
+    options = {}
+    if method == "auto":
+        method = "analytic" if demand_models.get_model(model).exact else "grid"
+    if method == "bayesian":
+        options = {"warm_start": warm_start, "ei_threshold": ei_threshold, "evaluations": evaluations}
+    price = OPTIMIZERS[method](
+        summary,
         cur,
         unit,
         margin,
@@ -532,6 +780,8 @@ def suggest_price(
         max_decrease=max_decrease,
         saturation=DEMAND_SATURATION.get(category, 1.0),
         mean_cap_ratio=compute_mean_cap(avg, stdev),
+        model=model,
+        **options,
     )
     base = unit * (1 + margin)
     price = max(price, base)
@@ -541,84 +791,360 @@ def suggest_price(
     return round_price(price)
 
 
-def main():
-    overview = read_overview()
+def _suggest_price_task(args):
+    """Process-pool entry point: returns the price and the evaluations."""
+    evaluations = []
+    price = suggest_price(
+        *args[:5], warm_start=args[5], ei_threshold=args[6], evaluations=evaluations, method="bayesian"
+    )
+    return price, evaluations
+
+
+def suggest_prices(
+    products: List[tuple],
+    workers: int | None = None,
+    warm_start: bool = True,
+    ei_threshold: float | None = EI_STOP_THRESHOLD,
+    method: str = "auto",
+) -> List[float]:
+    """Run :func:`suggest_price` for many products.
+
+    ``products`` holds ``(name, category, prices, current_price, unit_cost)``
+    tuples. Results come back in input order. The analytic and grid
+    optimizers are fast enough to run inline. The Bayesian search runs in a
+    process pool: the first product of each category is optimized cold, and
+    once it finishes the rest of the category is submitted with its
+    evaluations as a warm start.
+    """
+    if method != "bayesian":
+        return [suggest_price(*product, method=method) for product in products]
+    workers = workers or os.cpu_count() or 1
+    by_category: Dict[str, List[int]] = {}
+    for i, product in enumerate(products):
+        by_category.setdefault(product[1], []).append(i)
+
+    results: List[float | None] = [None] * len(products)
+
+    def task(i, seed_evaluations=None):
+        return tuple(products[i]) + (seed_evaluations if warm_start else None, ei_threshold)
+
+    if workers <= 1:
+        for indices in by_category.values():
+            price, evaluations = _suggest_price_task(task(indices[0]))
+            results[indices[0]] = price
+            for i in indices[1:]:
+                results[i] = _suggest_price_task(task(i, evaluations))[0]
+        return results
+
+    # multiprocessing is only imported when a pool is actually used
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(_suggest_price_task, task(indices[0])): (indices[0], indices[1:])
+                   for indices in by_category.values()}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, followers = pending.pop(future)
+                price, evaluations = future.result()
+                results[i] = price
+                for j in followers:
+                    pending[pool.submit(_suggest_price_task, task(j, evaluations))] = (j, [])
+    return results
+
+
+OPTIMIZERS = {
+    "analytic": analytic_optimize_price,
+    "bayesian": bayesian_optimize_price,
+    "grid": optimize_price,
+}
+
+CATALOG_GRID_POINTS = 201  # candidate prices per row in optimize_rows
+
+
+def round_prices(prices):
+    """Vectorized :func:`round_price` for NumPy arrays."""
+    rounded = np.round(np.asarray(prices, dtype=float) * 2) / 2
+    return np.where(rounded > 50, np.floor(rounded) - 0.01, rounded - 0.01)
+
+
+def catalog_frames(products):
+    """Build the inputs of :func:`optimize_catalog` from per-product data.
+
+    ``products`` yields ``(product_id, name, category, prices, info)`` where
+    ``info`` holds ``current_price`` and ``unit_cost`` as returned by
+    :func:`read_overview`.
+    """
+    import pandas as pd  # only the batch API needs pandas
+
+    rows, stats = [], {}
+    for product_id, name, category, prices, info in products:
+        rows.append({
+            "Product ID": product_id,
+            "Product Name": name,
+            "Category": category,
+            "Current Price": info["current_price"],
+            "Unit Cost": info["unit_cost"],
+        })
+        summary = competitor_stats.summarize(prices)
+        stats[product_id] = {
+            "count": summary.count,
+            "mean": summary.mean,
+            "stdev": summary.stdev,
+            "min": summary.min,
+            "max": summary.max,
+        }
+    return pd.DataFrame(rows), pd.DataFrame.from_dict(stats, orient="index")
+
+
+def catalog_arrays(products_df, competitor_stats) -> Dict[str, np.ndarray]:
+    """Per-product parameter arrays for :func:`optimize_rows`.
+
+    Arguments as for :func:`optimize_catalog`. Category settings are looked
+    up in the module's dictionaries, so callers can override single arrays
+    (a different elasticity, say) before optimizing.
+    """
+    import pandas as pd  # only the batch API needs pandas
+
+    stats = pd.DataFrame(competitor_stats).reindex(products_df["Product ID"])
+    category = products_df["Category"]
+    cur = products_df["Current Price"].to_numpy(dtype=float)
+    count = stats["count"].fillna(0).to_numpy(dtype=float)
+    has_prices = count > 0
+
+    def per_category(table, default, dtype=float):
+        return category.map(lambda c: table.get(c, default)).to_numpy(dtype=dtype)
+
+    return {
+        "cur": cur,
+        "unit": products_df["Unit Cost"].to_numpy(dtype=float),
+        "avg": np.where(has_prices, stats["mean"].to_numpy(dtype=float), cur),
+        "comp_low": np.where(has_prices, stats["min"].to_numpy(dtype=float), cur),
+        "comp_high": np.where(has_prices, stats["max"].to_numpy(dtype=float), cur),
+        "stdev": np.nan_to_num(stats["stdev"].to_numpy(dtype=float)),
+        "has_prices": has_prices,
+        "margin": per_category(PROFIT_MARGINS, 0.30),
+        "elasticity": per_category(DEMAND_ELASTICITY, 1.2),
+        "saturation": per_category(DEMAND_SATURATION, 1.0),
+        "model": per_category(DEMAND_MODEL, demand_models.DEFAULT_MODEL, object),
+        "markup": per_category(MAX_MARKUP, 1.8),
+        "max_inc": per_category(MAX_INCREASE, MAX_INCREASE["default"]),
+        "max_dec": per_category(MAX_DECREASE, MAX_DECREASE["default"]),
+    }
+
+
+def optimize_rows(
+    cur, unit, avg, comp_low, comp_high, stdev, has_prices,
+    margin, elasticity, saturation, model, markup, max_inc, max_dec,
+) -> np.ndarray:
+    """Recommended price for every row of equally long parameter arrays.
+
+    Every row gets ``CATALOG_GRID_POINTS`` candidate prices, and profit is
+    evaluated on the rows × candidates matrix in a single broadcast call.
+    The limits (margin, ``max_inc``/``max_dec``, ``markup`` and the
+    :func:`compute_mean_cap` ratio) are applied as boolean masks over that
+    matrix. A second, finer matrix pass refines around each row's best
+    candidate. The result mirrors :func:`optimize_price` followed by the
+    clamps in :func:`suggest_price`.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_cap = np.where(avg > 0, np.minimum(1.0 + stdev / avg * 0.5, 1.3), 1.3)
+
+    # bounds as in optimize_price; each one also becomes a mask below
+    base = unit * (1 + margin)
+    floor_price = np.maximum.reduce([base, comp_low * 0.9, cur * (1 - max_dec)])
+    ceiling = np.minimum.reduce([
+        np.maximum.reduce([cur, comp_high, avg, base]) * markup,
+        cur * (1 + max_inc),
+        avg * mean_cap,
+    ])
+    ceiling = np.maximum(ceiling, floor_price)
+
+    def masked_profits(candidates):
+        profits = simulate_profit(
+            candidates, unit[:, None], avg[:, None], 100.0, elasticity[:, None], saturation[:, None],
+            model[:, None],
+        )
+        allowed = (
+            (candidates >= base[:, None])
+            & (candidates >= (cur * (1 - max_dec))[:, None])
+            & (candidates <= (cur * (1 + max_inc))[:, None])
+            & (candidates <= (avg * mean_cap)[:, None])
+            & (candidates >= floor_price[:, None] - 1e-9)
+            & (candidates <= ceiling[:, None] + 1e-9)
+        )
+        return np.where(allowed, profits, -np.inf)
+
+    rows = np.arange(len(cur))
+    t = np.linspace(0.0, 1.0, CATALOG_GRID_POINTS)
+    step = (ceiling - floor_price) / (CATALOG_GRID_POINTS - 1)
+    candidates = floor_price[:, None] + t * (ceiling - floor_price)[:, None]
+    best = candidates[rows, np.argmax(masked_profits(candidates), axis=1)]
+
+    fine = np.linspace(
+        np.maximum(floor_price, best - step), np.minimum(ceiling, best + step), 41, axis=1
+    )
+    fine_profits = masked_profits(fine)
+    best = np.where(
+        np.isfinite(fine_profits.max(axis=1)),
+        fine[rows, np.argmax(fine_profits, axis=1)],
+        best,
+    )
+
+    # final clamps in the same order as suggest_price; they also settle rows
+    # where the limits conflict and no candidate survived the masks
+    price = np.maximum(best, base)
+    price = np.minimum(price, cur * (1 + max_inc))
+    price = np.maximum(price, cur * (1 - max_dec))
+    price = np.minimum(price, avg * mean_cap)
+    price = round_prices(price)
+    # products without competitor data keep at least their current price
+    return np.where(has_prices, price, round_prices(np.maximum(base, cur)))
+
+
+def optimize_catalog(products_df, competitor_stats):
+    """Recommend prices for a whole catalog in one set of array operations.
+
+    ``products_df`` needs ``Product ID``, ``Category``, ``Current Price`` and
+    ``Unit Cost`` columns. ``competitor_stats`` is a DataFrame (or mapping)
+    indexed by Product ID with ``count``, ``mean``, ``stdev``, ``min`` and
+    ``max`` of the cleaned competitor prices. See :func:`optimize_rows` for
+    how the prices are found.
+    """
+    import pandas as pd  # only the batch API needs pandas
+
+    arrays = catalog_arrays(products_df, competitor_stats)
+    price = optimize_rows(**arrays)
+    cur, unit, avg = arrays["cur"], arrays["unit"], arrays["avg"]
+    elasticity, saturation, model = arrays["elasticity"], arrays["saturation"], arrays["model"]
+    profit_cur = simulate_profit(cur, unit, avg, 100.0, elasticity, saturation, model)
+    profit_new = simulate_profit(price, unit, avg, 100.0, elasticity, saturation, model)
+    return pd.DataFrame({
+        "Product ID": products_df["Product ID"].to_numpy(),
+        "Product Name": products_df["Product Name"].to_numpy() if "Product Name" in products_df else None,
+        "Category": products_df["Category"].to_numpy(),
+        "Recommended Price": price,
+        "Profit Current": profit_cur,
+        "Profit Recommended": profit_new,
+        "Profit Delta": profit_new - profit_cur,
+    })
+
+
+def load_products(cache: competitor_stats.StatsCache | None = None, streaming: bool = False) -> List[tuple]:
+    """Return ``(mapping_row, name, category, stats, info)`` per product.
+
+    ``stats`` is a :class:`competitor_stats.CompetitorStats`, which every
+    optimizer accepts in place of a price list. With a ``cache`` the
+    statistics of unchanged data files come from it. Products in the
+    mapping file without an entry in the overview CSV are skipped.
+    ``streaming`` summarizes prices with :func:`read_price_summary`
+    instead of the exact statistics.
+    """
+    import catalog  # loads pandas, so it is not imported with this module
+
+    read = read_price_summary if streaming else read_prices
+    products = []
+    for product in catalog.load(OVERVIEW_CSV, MAPPING_CSV).products:
+        name = product.name
+        data_file = Path(product.data_file)
+        category = categorize_product(name)
+        if cache is None:
+            stats = competitor_stats.summarize(read(data_file, category))
+        else:
+            stats = cache.get(
+                data_file,
+                category,
+                category_matcher().keywords.get(category) or [],
+                lambda: read(data_file, category),
+                variant="sketch" if streaming else "",
+            )
+        products.append((product.mapping_row(), name, category, stats, product.info()))
+    return products
+
+
+def write_recommendations(
+    products: List[tuple], suggested: List[float], out_path: Path = RECOMMENDED_CSV, db_path: Path | None = None
+):
+    """Write ``recommended_prices.csv`` for ``products`` priced at ``suggested``.
+
+    ``products`` are the tuples of :func:`load_products`. Profits and the
+    A/B test are simulated here. With ``db_path`` the rows are also recorded
+    in that catalog database, if it exists. Returns the number of rows and
+    the total profit at the current and the recommended prices.
+    """
     results = []
     total_current = 0.0
     total_recommended = 0.0
-    with open(MAPPING_CSV, newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            name = row["Product Name"].strip()
-            data_file = Path(row["Data File"].strip())
-            info = overview.get(name)
-            if not info:
-                continue
-            category = categorize_product(name)
-            prices = read_prices(data_file, category=category)
-            price = suggest_price(
-                name,
-                category,
-                prices,
-                info["current_price"],
-                info["unit_cost"],
-            )
-            avg = statistics.mean(prices) if prices else info["current_price"]
-            median = statistics.median(prices) if prices else info["current_price"]
-            stdev = statistics.stdev(prices) if len(prices) > 1 else 0.0
-            min_p = min(prices) if prices else info["current_price"]
-            max_p = max(prices) if prices else info["current_price"]
-
-            saturation = DEMAND_SATURATION.get(category, 1.0)
-            profit_cur = simulate_profit(
-                info["current_price"],
-                info["unit_cost"],
-                avg,
-                saturation=saturation,
-            )
-            profit_new = simulate_profit(
-                price,
-                info["unit_cost"],
-                avg,
-                saturation=saturation,
-            )
 
-            ab = run_ab_test(
-                info["current_price"],
-                price,
-                info["unit_cost"],
-                avg,
-                elasticity=DEMAND_ELASTICITY.get(category, 1.2),
-                saturation=saturation,
-            )
+    # one batched simulation for the whole catalog
+    ab_tests = simulate_ab_tests(
+        [info["current_price"] for _, _, _, _, info in products],
+        suggested,
+        [info["unit_cost"] for _, _, _, _, info in products],
+        [stats.mean if stats.count else info["current_price"] for _, _, _, stats, info in products],
+        elasticity=[DEMAND_ELASTICITY.get(category, 1.2) for _, _, category, _, _ in products],
+        saturation=[DEMAND_SATURATION.get(category, 1.0) for _, _, category, _, _ in products],
+        seed=AB_TEST_SEED,
+        model=[DEMAND_MODEL.get(category, demand_models.DEFAULT_MODEL) for _, _, category, _, _ in products],
+    )
 
-            total_current += profit_cur
-            total_recommended += profit_new
-
-            results.append({
-                "Product Name": name,
-                "Product ID": row["Product ID"],
-                "Recommended Price": f"{price:.2f}",
-                "Category": category,
-                "Avg Competitor Price": f"{avg:.2f}",
-                "Min Competitor Price": f"{min_p:.2f}",
-                "Max Competitor Price": f"{max_p:.2f}",
-                "Median Competitor Price": f"{median:.2f}",
-                "Std Competitor Price": f"{stdev:.2f}",
-                "Competitor Count": len(prices),
-                "Profit Current": f"{profit_cur:.2f}",
-                "Profit Recommended": f"{profit_new:.2f}",
-                "Profit Delta": f"{(profit_new - profit_cur):.2f}",
-                "AB Profit Control": f"{ab['profit_control']:.2f}",
-                "AB Profit Test": f"{ab['profit_test']:.2f}",
-                "AB Profit Delta": f"{ab['profit_delta']:.2f}",
-                # Use scientific notation to avoid displaying extremely small
-                # p-values as zero when rounded. Four decimal places caused
-                # all values to appear as 0.0000, so show the raw magnitude
-                # with exponent format.
-                "AB P-Value": f"{ab['p_value']:.3e}",
-            })
-    out_path = BASE_DIR / "recommended_prices.csv"
+    for i, ((row, name, category, stats, info), price) in enumerate(zip(products, suggested)):
+        has_prices = stats.count > 0
+        avg = stats.mean if has_prices else info["current_price"]
+        median = stats.median if has_prices else info["current_price"]
+        stdev = stats.stdev
+        min_p = stats.min if has_prices else info["current_price"]
+        max_p = stats.max if has_prices else info["current_price"]
+
+        # the same demand parameters as the optimizer and the A/B test
+        elasticity = DEMAND_ELASTICITY.get(category, 1.2)
+        saturation = DEMAND_SATURATION.get(category, 1.0)
+        model = DEMAND_MODEL.get(category, demand_models.DEFAULT_MODEL)
+        profit_cur = simulate_profit(
+            info["current_price"],
+            info["unit_cost"],
+            avg,
+            elasticity=elasticity,
+            saturation=saturation,
+            model=model,
+        )
+        profit_new = simulate_profit(
+            price,
+            info["unit_cost"],
+            avg,
+            elasticity=elasticity,
+            saturation=saturation,
+            model=model,
+        )
+
+        ab = {key: float(values[i]) for key, values in ab_tests.items()}
+
+        total_current += profit_cur
+        total_recommended += profit_new
+
+        results.append({
+            "Product Name": name,
+            "Product ID": row["Product ID"],
+            "Recommended Price": f"{price:.2f}",
+            "Category": category,
+            "Avg Competitor Price": f"{avg:.2f}",
+            "Min Competitor Price": f"{min_p:.2f}",
+            "Max Competitor Price": f"{max_p:.2f}",
+            "Median Competitor Price": f"{median:.2f}",
+            "Std Competitor Price": f"{stdev:.2f}",
+            "Competitor Count": stats.count,
+            "Profit Current": f"{profit_cur:.2f}",
+            "Profit Recommended": f"{profit_new:.2f}",
+            "Profit Delta": f"{(profit_new - profit_cur):.2f}",
+            "AB Profit Control": f"{ab['profit_control']:.2f}",
+            "AB Profit Test": f"{ab['profit_test']:.2f}",
+            "AB Profit Delta": f"{ab['profit_delta']:.2f}",
+            # Use scientific notation to avoid displaying extremely small
+            # p-values as zero when rounded. Four decimal places caused
+            # all values to appear as 0.0000, so show the raw magnitude
+            # with exponent format.
+            "AB P-Value": f"{ab['p_value']:.3e}",
+        })
     with open(out_path, "w", newline="") as f:
         writer = csv.DictWriter(
             f,
@@ -644,10 +1170,65 @@ def main():
         )
         writer.writeheader()
         writer.writerows(results)
-    print(f"Saved {len(results)} recommendations to {str(out_path)}")
+    if db_path is not None:
+        import catalog_db  # loads pandas, so it is not imported with this module
+
+        catalog_db.record("recommendations", results, path=db_path)
+    return len(results), total_current, total_recommended
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="price the whole catalog at once with optimize_catalog",
+    )
+    parser.add_argument(
+        "--optimizer",
+        choices=["auto", *OPTIMIZERS],
+        default="auto",
+        help="per-product optimizer (default: analytic for the built-in demand model)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="processes for the Bayesian search (default: all cores)",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="clean and summarize competitor prices with a fixed-memory sketch",
+    )
+    args = parser.parse_args(argv)
+
+    stats_cache = competitor_stats.StatsCache()
+    products = load_products(stats_cache, args.streaming)
+    stats_cache.save()
+
+    if args.batch:
+        recommended = optimize_catalog(
+            *catalog_frames([(row["Product ID"], name, category, stats, info)
+                             for row, name, category, stats, info in products])
+        )
+        suggested = recommended["Recommended Price"].tolist()
+    else:
+        suggested = suggest_prices(
+            [(name, category, stats, info["current_price"], info["unit_cost"])
+             for row, name, category, stats, info in products],
+            workers=args.workers,
+            method=args.optimizer,
+        )
+
+    import catalog_db  # loads pandas, so it is not imported with this module
+
+    count, total_current, total_recommended = write_recommendations(products, suggested, db_path=catalog_db.DB_PATH)
+    print(f"Saved {count} recommendations to {str(RECOMMENDED_CSV)}")
     print(
         f"Total estimated profit now: {total_current:.2f} -> {total_recommended:.2f} (delta {(total_recommended-total_current):.2f})"
     )
+    print(f"Competitor stats: {stats_cache.hits} cached, {stats_cache.misses} computed")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,266 @@
+"""Streaming, fixed-memory cleaning and statistics for competitor prices.
+
+:func:`price_optimizer.clean_prices` sorts every price to find the
+quartiles. That is fine for a category snapshot, but not for multi-million
+row histories. :class:`PriceSketch` reads prices in chunks and keeps one
+slot per logarithmic price bucket (the DDSketch layout). Each slot holds
+the count, mean, sum of squared deviations (Welford/Chan), min and max of
+the prices that fell into it. The memory is fixed by the accuracy
+(about 1,400 buckets at 0.5%), not by the number of prices. Two sketches
+merge by combining their slots, so sketches built per store and scrape date
+can be added up into any coarser view.
+
+Error bounds, compared with ``clean_prices`` plus exact statistics, for
+prices in ``[MIN_PRICE, MAX_PRICE)``:
+
+* Every order statistic (and so every quartile and the median) is within
+  ``RELATIVE_ACCURACY`` (0.5%) of the exact value of the same rank. A bucket
+  holding a single distinct price returns it exactly.
+* The IQR fences are therefore within ``4 * RELATIVE_ACCURACY * Q3`` of the
+  exact fences.
+* Buckets are kept or dropped whole. Only prices in the two buckets that
+  contain a fence can be classified differently from the exact path, and
+  such prices lie within a factor ``(1 + a) / (1 - a)`` of the fence.
+* Count, mean, standard deviation, min and max are exact over the kept
+  buckets. They differ from the exact path only through those boundary
+  prices.
+
+``python benchmarks/check_price_sketch.py`` measures the errors and the
+speed against the exact path.
+"""
+import itertools
+import math
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+import competitor_stats
+import competitor_store
+import keyword_matcher
+
+RELATIVE_ACCURACY = 0.005
+MIN_PRICE = 0.01  # smaller prices share the lowest bucket
+MAX_PRICE = 10000.0  # exclusive, like the validity filter of clean_prices
+SKETCH_CHUNK = 1 << 16  # prices converted to an array at a time
+
+
+class PriceSketch:
+    """Mergeable summary of a stream of prices.
+
+    ``update`` takes arrays or any iterable of prices. Invalid prices
+    (``<= 0``, ``>= MAX_PRICE`` or NaN) are ignored, as in ``clean_prices``.
+    """
+
+    def __init__(self, relative_accuracy: float = RELATIVE_ACCURACY) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.offset = math.ceil(math.log(MIN_PRICE) / self._log_gamma)
+        size = math.ceil(math.log(MAX_PRICE) / self._log_gamma) - self.offset + 1
+        self.counts = np.zeros(size, dtype=np.int64)
+        self.means = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.mins = np.full(size, np.inf)
+        self.maxs = np.full(size, -np.inf)
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def _index(self, values: np.ndarray) -> np.ndarray:
+        # bucket i holds (gamma**(i - 1), gamma**i]
+        idx = np.ceil(np.log(values) / self._log_gamma).astype(np.int64) - self.offset
+        return np.clip(idx, 0, len(self.counts) - 1)
+
+    def _combine(self, counts, means, m2) -> None:
+        # Chan et al.'s pairwise update of count, mean and M2 per bucket
+        total = self.counts + counts
+        nz = total > 0
+        delta = means - self.means
+        weight = np.divide(counts, total, out=np.zeros(len(total)), where=nz)
+        self.m2 = self.m2 + m2 + delta * delta * self.counts * weight
+        self.means = np.where(nz, self.means + delta * weight, 0.0)
+        self.counts = total
+
+    def update(self, prices) -> "PriceSketch":
+        if hasattr(prices, "__len__"):
+            prices = np.asarray(prices, dtype=float)
+            for start in range(0, len(prices), SKETCH_CHUNK * 16):
+                self._update_array(prices[start:start + SKETCH_CHUNK * 16])
+            return self
+        it = iter(prices)
+        while True:
+            chunk = np.fromiter(itertools.islice(it, SKETCH_CHUNK), dtype=float)
+            if not chunk.size:
+                return self
+            self._update_array(chunk)
+
+    def _update_array(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=float)
+        values = values[(values > 0) & (values < MAX_PRICE)]
+        if not values.size:
+            return
+        idx = self._index(values)
+        size = len(self.counts)
+        counts = np.bincount(idx, minlength=size)
+        sums = np.bincount(idx, weights=values, minlength=size)
+        means = np.divide(sums, counts, out=np.zeros(size), where=counts > 0)
+        m2 = np.bincount(idx, weights=(values - means[idx]) ** 2, minlength=size)
+        self._combine(counts, means, m2)
+        np.minimum.at(self.mins, idx, values)
+        np.maximum.at(self.maxs, idx, values)
+
+    def merge(self, other: "PriceSketch") -> "PriceSketch":
+        """Add ``other`` (built with the same accuracy) into this sketch."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        self._combine(other.counts, other.means, other.m2)
+        np.minimum(self.mins, other.mins, out=self.mins)
+        np.maximum(self.maxs, other.maxs, out=self.maxs)
+        return self
+
+    def _value_at(self, rank: int, cumulative: np.ndarray) -> float:
+        """Estimate the ``rank``-th smallest (0-based) price counted in ``cumulative``."""
+        i = int(np.searchsorted(cumulative, rank, side="right"))
+        if self.mins[i] == self.maxs[i]:
+            return float(self.mins[i])
+        estimate = 2 * self.gamma ** (i + self.offset) / (self.gamma + 1)
+        return float(min(max(estimate, self.mins[i]), self.maxs[i]))
+
+    def _quantiles(self, probabilities):
+        # same interpolation as ``statistics.quantiles`` (method="exclusive")
+        cumulative = np.cumsum(self.counts)
+        n = int(cumulative[-1])
+        out = []
+        for p in probabilities:
+            position = p * (n + 1)
+            j = min(max(int(position), 1), n - 1)
+            lo = self._value_at(j - 1, cumulative)
+            hi = self._value_at(j, cumulative)
+            out.append(lo + (hi - lo) * (position - j))
+        return out
+
+    def quantile(self, p: float) -> float:
+        """Estimated ``p``-quantile of all valid prices (at least two needed)."""
+        return self._quantiles([p])[0]
+
+    def fences(self) -> Tuple[float, float]:
+        """IQR outlier fences, as in ``clean_prices``."""
+        if self.count < 4:
+            return 0.0, MAX_PRICE
+        q1, q3 = self._quantiles([0.25, 0.75])
+        iqr = q3 - q1
+        return q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+    def summary(self) -> competitor_stats.CompetitorStats:
+        """Statistics of the prices within the fences.
+
+        ``prices`` is empty: a sketch does not keep individual prices.
+        """
+        low, high = self.fences()
+        counts = np.where((self.means >= low) & (self.means <= high), self.counts, 0)
+        n = int(counts.sum())
+        if not n:
+            return competitor_stats.summarize([])
+        mean = float((counts * self.means).sum() / n)
+        m2 = float(np.where(counts > 0, self.m2 + counts * (self.means - mean) ** 2, 0.0).sum())
+        cumulative = np.cumsum(counts)
+        median = self._value_at(n // 2, cumulative)
+        if n % 2 == 0:
+            median = (self._value_at(n // 2 - 1, cumulative) + median) / 2
+        kept = np.flatnonzero(counts)
+        return competitor_stats.CompetitorStats(
+            prices=[],
+            count=n,
+            mean=mean,
+            median=median,
+            stdev=math.sqrt(m2 / (n - 1)) if n > 1 else 0.0,
+            min=float(self.mins[kept[0]]),
+            max=float(self.maxs[kept[-1]]),
+        )
+
+    def to_dict(self) -> Dict:
+        """JSON-friendly form holding only the non-empty buckets."""
+        nz = np.flatnonzero(self.counts)
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "index": nz.tolist(),
+            "counts": self.counts[nz].tolist(),
+            "means": self.means[nz].tolist(),
+            "m2": self.m2[nz].tolist(),
+            "mins": self.mins[nz].tolist(),
+            "maxs": self.maxs[nz].tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PriceSketch":
+        sketch = cls(data["relative_accuracy"])
+        idx = np.asarray(data["index"], dtype=np.int64)
+        sketch.counts[idx] = data["counts"]
+        for name in ("means", "m2", "mins", "maxs"):
+            getattr(sketch, name)[idx] = data[name]
+        return sketch
+
+
+def merge_sketches(sketches: Iterable[PriceSketch]) -> PriceSketch:
+    merged = PriceSketch()
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
+
+
+def _keyword_mask(names, terms, keywords: Iterable[str] | None) -> np.ndarray:
+    keywords = list(keywords or [])
+    if not keywords:
+        return np.ones(len(names), dtype=bool)
+    return keyword_matcher.contains_any(names, keywords) | keyword_matcher.contains_any(terms, keywords)
+
+
+def sketch_history(
+    path: Path,
+    keywords: Iterable[str] | None = None,
+    chunk_rows: int = 500_000,
+) -> Dict[Tuple[str, str], PriceSketch]:
+    """Sketch a price history CSV per ``(store, scrape date)``.
+
+    The file (``product_data/history/<category>.csv``) is read in chunks of
+    ``chunk_rows``, so memory does not grow with its length. With
+    ``keywords``, rows whose product name and search term contain none of
+    them are skipped, as in ``read_prices``.
+    """
+    import pandas as pd  # only the partition readers need pandas
+
+    sketches: Dict[Tuple[str, str], PriceSketch] = {}
+    columns = ["scraped_at", "store", "product_name", "price", "search_term"]
+    for chunk in pd.read_csv(path, usecols=columns, dtype=str, chunksize=chunk_rows):
+        prices = pd.to_numeric(chunk["price"].str.replace(r"[€,\s]", "", regex=True), errors="coerce")
+        chunk = chunk.assign(price=prices, scrape_date=chunk["scraped_at"].str[:10])
+        chunk = chunk[_keyword_mask(chunk["product_name"], chunk["search_term"], keywords)]
+        for (store, day), group in chunk.groupby(["store", "scrape_date"], sort=False):
+            sketches.setdefault((store, day), PriceSketch()).update(group["price"].to_numpy())
+    return sketches
+
+
+def sketch_partitions(
+    slug: str,
+    keywords: Iterable[str] | None = None,
+    store_dir: Path = competitor_store.STORE_DIR,
+) -> Dict[Tuple[str, str], PriceSketch]:
+    """Sketch every competitor-store snapshot of a category per ``(store, scrape date)``."""
+    import pandas as pd  # only the partition readers need pandas
+
+    sketches: Dict[Tuple[str, str], PriceSketch] = {}
+    for path in competitor_store.partitions(slug, store_dir):
+        day = path.stem[len("scrape_date="):]
+        data = competitor_store.load_prices(slug, day, store_dir)
+        frame = pd.DataFrame({
+            "store": data.store,
+            "product_name": data.product_name,
+            "search_term": data.search_term,
+            "price": data.price,
+        })
+        frame = frame[_keyword_mask(frame["product_name"], frame["search_term"], keywords)]
+        for store, group in frame.groupby("store", sort=False):
+            sketches.setdefault((store, day), PriceSketch()).update(group["price"].to_numpy())
+    return sketches
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""Resident pricing service with an HTTP/JSON API.
+
+Running ``price_optimizer.py`` for every request pays for a cold start
+(SciPy, scikit-optimize) and a reload of every CSV. This service loads the
+overview, the product mapping and the competitor statistics once, keeps
+them in memory, and answers quotes in about a millisecond.
+
+Endpoints (JSON in and out)::
+
+    GET  /health          status and number of known products
+    GET  /products        known products with their competitor statistics
+    POST /quote           one product -> one quote
+    POST /quote/batch     {"products": [...]} -> {"quotes": [...]}
+    POST /competitors     push competitor prices for a category
+    POST /reload          re-read the CSVs (e.g. after a scrape)
+
+A product is ``{"id": ...}`` or ``{"name": ...}`` of a known product, or an
+ad-hoc ``{"name", "category", "currentPrice", "unitCost"}``. Given fields
+override the stored ones, so what-if quotes need no file changes. Include
+``"competitorPrices"`` (numbers, or rows with ``price``, ``product_name``
+and ``search_term``) to price against those prices instead of the stored
+statistics. ``/competitors`` takes ``{"category", "prices", "mode"}``
+(``"replace"`` or ``"append"``). Pushed prices replace the scraped data for
+that category until the next ``/reload``.
+
+Run it with ``python pricing_service.py --port 8765``.
+"""
+import argparse
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import numpy as np
+
+import competitor_stats
+import demand_models
+import price_optimizer as po
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY = 16 * 1024 * 1024  # bytes accepted per request
+
+
+class ServiceError(ValueError):
+    """A bad request; reported to the client with HTTP 400."""
+
+
+def _to_price(value) -> float:
+    try:
+        return float(str(value).replace("€", "").replace(",", "").strip())
+    except ValueError:
+        return float("nan")
+
+
+def _competitor_rows(category: str, rows) -> List[float]:
+    """Clean pushed competitor prices the way ``read_prices`` cleans scraped ones."""
+    if not isinstance(rows, list):
+        raise ServiceError("competitor prices must be a list")
+    if rows and isinstance(rows[0], dict):
+        prices = np.array([_to_price(r.get("price")) for r in rows])
+        names = [str(r.get("product_name") or "") for r in rows]
+        terms = [str(r.get("search_term") or "") for r in rows]
+        matcher = po.category_matcher()
+        if matcher.keywords.get(category) and any(names + terms):
+            keep = matcher.contains(category, names) | matcher.contains(category, terms)
+            prices = prices[keep]
+    else:
+        try:
+            prices = np.array(rows, dtype=float)
+        except (TypeError, ValueError):
+            raise ServiceError("competitor prices must be numbers") from None
+    return po.clean_prices(prices[(prices > 0) & (prices < 10000)].tolist())
+
+
+class PricingService:
+    """In-memory catalog, competitor statistics and quoting."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.reload()
+
+    def reload(self) -> int:
+        """Re-read the overview, the mapping and the competitor data."""
+        cache = competitor_stats.StatsCache()
+        products = po.load_products(cache)
+        cache.save()
+        by_id, by_name, stats, category_stats = {}, {}, {}, {}
+        for row, name, category, summary, info in products:
+            product = {
+                "id": row["Product ID"],
+                "name": name,
+                "category": category,
+                "currentPrice": info["current_price"],
+                "unitCost": info["unit_cost"],
+            }
+            by_id[product["id"]] = product
+            by_name[name] = product
+            stats[product["id"]] = summary
+            # ad-hoc products of a category use its first data file
+            category_stats.setdefault(category, summary)
+        with self.lock:
+            self.by_id, self.by_name = by_id, by_name
+            self.stats, self.category_stats = stats, category_stats
+            self.pushed: Dict[str, competitor_stats.CompetitorStats] = {}
+        return len(by_id)
+
+    def competitor_summary(self, product: Dict) -> competitor_stats.CompetitorStats:
+        """Pushed prices of the category, else the product's own data file."""
+        category = product["category"]
+        return (
+            self.pushed.get(category)
+            or self.stats.get(product.get("id"))
+            or self.category_stats.get(category)
+            or competitor_stats.summarize([])
+        )
+
+    def push_competitors(self, category: str, rows, mode: str = "replace") -> competitor_stats.CompetitorStats:
+        """Store pushed competitor prices for ``category`` and return their statistics."""
+        if mode not in ("replace", "append"):
+            raise ServiceError("mode must be 'replace' or 'append'")
+        prices = _competitor_rows(category, rows)
+        with self.lock:
+            if mode == "append":
+                current = self.pushed.get(category) or self.category_stats.get(category)
+                if current is not None and current.count and not current.prices:
+                    raise ServiceError(f"no individual prices stored for {category!r}; use mode 'replace'")
+                prices = po.clean_prices((current.prices if current else []) + prices)
+            summary = competitor_stats.summarize(prices)
+            self.pushed[category] = summary
+        return summary
+
+    def resolve(self, spec: Dict) -> Dict:
+        """Merge a request's product fields over the stored product."""
+        if not isinstance(spec, dict):
+            raise ServiceError("a product must be a JSON object")
+        stored = self.by_id.get(str(spec.get("id"))) or self.by_name.get(str(spec.get("name", "")).strip()) or {}
+        product = {**stored, **{k: v for k, v in spec.items() if v is not None}}
+        if "name" not in product:
+            raise ServiceError(f"unknown product {spec.get('id')!r}")
+        product.setdefault("category", po.categorize_product(product["name"]))
+        for field in ("currentPrice", "unitCost"):
+            try:
+                product[field] = float(product[field])
+            except (KeyError, TypeError, ValueError):
+                raise ServiceError(f"{product['name']!r}: {field} is missing or not a number") from None
+            if not product[field] > 0:
+                raise ServiceError(f"{product['name']!r}: {field} must be positive")
+        return product
+
+    def quote(self, spec: Dict) -> Dict:
+        product = self.resolve(spec)
+        category = product["category"]
+        if "competitorPrices" in product:
+            summary = competitor_stats.summarize(_competitor_rows(category, product["competitorPrices"]))
+        else:
+            summary = self.competitor_summary(product)
+        cur, unit = product["currentPrice"], product["unitCost"]
+        price = po.suggest_price(product["name"], category, summary, cur, unit)
+
+        avg = summary.mean if summary.count else cur
+        elasticity = po.DEMAND_ELASTICITY.get(category, 1.2)
+        saturation = po.DEMAND_SATURATION.get(category, 1.0)
+        model = po.DEMAND_MODEL.get(category, demand_models.DEFAULT_MODEL)
+        profit_cur = po.simulate_profit(cur, unit, avg, elasticity=elasticity, saturation=saturation, model=model)
+        profit_new = po.simulate_profit(price, unit, avg, elasticity=elasticity, saturation=saturation, model=model)
+        return {
+            "productId": product.get("id"),
+            "productName": product["name"],
+            "category": category,
+            "currentPrice": cur,
+            "recommendedPrice": price,
+            "priceChange": (price - cur) / cur * 100 if cur else 0.0,
+            "profitCurrent": profit_cur,
+            "profitRecommended": profit_new,
+            "profitDelta": profit_new - profit_cur,
+            "competitorCount": summary.count,
+            "avgCompetitorPrice": avg,
+            "minCompetitorPrice": summary.min if summary.count else cur,
+            "maxCompetitorPrice": summary.max if summary.count else cur,
+        }
+
+    def quote_batch(self, specs) -> List[Dict]:
+        if not isinstance(specs, list):
+            raise ServiceError("'products' must be a list")
+        return [self.quote(spec) for spec in specs]
+
+    def products(self) -> List[Dict]:
+        out = []
+        for product in self.by_id.values():
+            summary = self.competitor_summary(product)
+            out.append({
+                **product,
+                "competitorCount": summary.count,
+                "avgCompetitorPrice": summary.mean if summary.count else None,
+            })
+        return out
+
+
+def _json_safe(value):
+    # NaN is not valid JSON; statistics of empty categories become null
+    if isinstance(value, float) and value != value:
+        return None
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    return value
+
+
+def make_handler(service: PricingService):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so clients reuse connections
+
+        def setup(self) -> None:
+            super().setup()
+            # headers and body are separate writes; without this, Nagle's
+            # algorithm and delayed ACKs add ~40 ms to every response
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def _send(self, status: int, payload) -> None:
+            body = json.dumps(_json_safe(payload), default=float).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if self.close_connection:
+                self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_body(self) -> bytes:
+            """Read the whole request body, so the next request on the connection starts clean.
+
+            A body that cannot be read (bad length, too large, chunked) is
+            left unread and the connection is closed after the response.
+            """
+            if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+                self.close_connection = True
+                raise ServiceError("chunked request bodies are not supported; send Content-Length")
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                self.close_connection = True
+                raise ServiceError("invalid Content-Length")
+            if length > MAX_BODY:
+                self.close_connection = True
+                raise ServiceError("request body too large")
+            return self.rfile.read(length) if length else b""
+
+        def _body(self) -> Dict:
+            if not self.raw_body:
+                return {}
+            try:
+                body = json.loads(self.raw_body)
+            except ValueError:
+                raise ServiceError("request body is not valid JSON") from None
+            if not isinstance(body, dict):
+                raise ServiceError("request body must be a JSON object")
+            return body
+
+        def _dispatch(self, routes) -> None:
+            try:
+                self.raw_body = self._read_body()
+            except ServiceError as exc:
+                self._send(400, {"error": str(exc)})
+                return
+            route = routes.get(self.path.split("?", 1)[0].rstrip("/") or "/")
+            if route is None:
+                self._send(404, {"error": f"no route {self.command} {self.path}"})
+                return
+            start = time.perf_counter()
+            try:
+                payload = route()
+            except ServiceError as exc:
+                self._send(400, {"error": str(exc)})
+                return
+            except Exception as exc:  # keep serving after unexpected errors
+                self._send(500, {"error": f"{type(exc).__name__}: {exc}"})
+                return
+            payload["elapsedMs"] = (time.perf_counter() - start) * 1000
+            self._send(200, payload)
+
+        def do_GET(self) -> None:
+            self._dispatch({
+                "/health": lambda: {"status": "ok", "products": len(service.by_id)},
+                "/products": lambda: {"products": service.products()},
+            })
+
+        def do_POST(self) -> None:
+            self._dispatch({
+                "/quote": lambda: service.quote(self._body()),
+                "/quote/batch": lambda: {"quotes": service.quote_batch(self._body().get("products"))},
+                "/competitors": self._competitors,
+                "/reload": lambda: {"products": service.reload()},
+            })
+
+        def _competitors(self) -> Dict:
+            body = self._body()
+            if not body.get("category"):
+                raise ServiceError("'category' is required")
+            summary = service.push_competitors(body["category"], body.get("prices"), body.get("mode", "replace"))
+            return {"category": body["category"], **summary._asdict(), "prices": None}
+
+        def log_message(self, format, *args) -> None:
+            pass  # one line per quote would drown the console
+
+    return Handler
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, service: PricingService | None = None) -> ThreadingHTTPServer:
+    """Return a server bound to ``host:port``; call ``serve_forever`` on it."""
+    service = service or PricingService()
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+    server = serve(args.host, args.port)
+    print(f"Pricing service on http://{args.host}:{server.server_port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
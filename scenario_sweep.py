@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Sensitivity sweeps over the optimizer's category parameters.
+
+Answers questions like "what if Bottles elasticity were 1.4" without editing
+``price_optimizer.py``. Every combination of the given parameter grids is a
+scenario. Each scenario is applied to every selected product, and all
+scenario × product rows are priced together with
+:func:`price_optimizer.optimize_rows`, split into chunks across worker
+processes. The result is a tidy table: one row per scenario and product,
+holding the recommended price and its profit.
+
+Example::
+
+    python scenario_sweep.py --elasticity 0.8:1.6:9 --saturation 0.8,1.0 \\
+        --categories Bottles "Coffee mugs" --out sweep.csv
+"""
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+import price_optimizer as po
+
+BASE_DIR = Path(__file__).resolve().parent
+SWEEP_CSV = BASE_DIR / "scenario_sweep.csv"
+SWEEP_CHUNK_ROWS = 20_000  # scenario × product rows priced per task
+
+# sweepable parameter -> key in the arrays of ``price_optimizer.catalog_arrays``
+PARAMETERS = {
+    "elasticity": "elasticity",
+    "saturation": "saturation",
+    "margin": "margin",
+    "max_increase": "max_inc",
+    "max_decrease": "max_dec",
+}
+
+
+def parse_grid(text: str) -> List[float]:
+    """Parse ``"1.0,1.2,1.4"`` or ``"start:stop:count"`` (inclusive)."""
+    if ":" in text:
+        start, stop, count = text.split(":")
+        return [float(v) for v in np.linspace(float(start), float(stop), int(count))]
+    return [float(v) for v in text.split(",") if v.strip()]
+
+
+def scenario_table(grids: Dict[str, Iterable[float]]) -> pd.DataFrame:
+    """One row per combination of the grids, numbered by ``scenario``."""
+    names = list(grids)
+    combos = list(itertools.product(*(list(grids[n]) for n in names)))
+    table = pd.DataFrame(combos, columns=names)
+    table.insert(0, "scenario", np.arange(len(table)))
+    return table
+
+
+def _price_chunk(arrays: Dict[str, np.ndarray]):
+    price = po.optimize_rows(**arrays)
+    args = (arrays["unit"], arrays["avg"], 100.0, arrays["elasticity"], arrays["saturation"], arrays["model"])
+    return price, po.simulate_profit(arrays["cur"], *args), po.simulate_profit(price, *args)
+
+
+def sweep(
+    products_df,
+    competitor_stats,
+    grids: Dict[str, Iterable[float]],
+    categories: Iterable[str] | None = None,
+    workers: int | None = None,
+    chunk_rows: int = SWEEP_CHUNK_ROWS,
+) -> pd.DataFrame:
+    """Price every product under every scenario.
+
+    ``products_df``/``competitor_stats`` are the inputs of
+    :func:`price_optimizer.optimize_catalog` (see
+    :func:`price_optimizer.catalog_frames`). ``grids`` maps names in
+    ``PARAMETERS`` to the values to try. Parameters that are not swept keep
+    their per-category settings. Profits are computed under each scenario's
+    own elasticity and saturation.
+    """
+    unknown = set(grids) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+    if categories is not None:
+        products_df = products_df[products_df["Category"].isin(list(categories))]
+    products_df = products_df.reset_index(drop=True)
+    scenarios = scenario_table(grids)
+    n_products, n_scenarios = len(products_df), len(scenarios)
+
+    # rows are scenario-major: all products of scenario 0, then scenario 1, ...
+    base = po.catalog_arrays(products_df, competitor_stats)
+    arrays = {key: np.tile(values, n_scenarios) for key, values in base.items()}
+    for name, key in PARAMETERS.items():
+        if name in grids:
+            arrays[key] = np.repeat(scenarios[name].to_numpy(dtype=float), n_products)
+
+    total = n_products * n_scenarios
+    chunks = [
+        {key: values[start:start + chunk_rows] for key, values in arrays.items()}
+        for start in range(0, total, chunk_rows)
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(chunks)) if chunks else 1
+    if workers <= 1:
+        results = [_price_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_price_chunk, chunks))
+    price, profit_cur, profit_new = (
+        np.concatenate([r[i] for r in results]) if results else np.empty(0) for i in range(3)
+    )
+
+    table = scenarios.loc[scenarios.index.repeat(n_products)].reset_index(drop=True)
+    for column in ("Product ID", "Product Name", "Category"):
+        table[column] = np.tile(products_df[column].to_numpy(), n_scenarios)
+    table["Recommended Price"] = price
+    table["Profit Current"] = profit_cur
+    table["Profit Recommended"] = profit_new
+    table["Profit Delta"] = profit_new - profit_cur
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for name in PARAMETERS:
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            dest=name,
+            type=parse_grid,
+            help="values as a,b,c or start:stop:count",
+        )
+    parser.add_argument("--categories", nargs="+", help="only sweep these categories")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--out", type=Path, default=SWEEP_CSV)
+    args = parser.parse_args(argv)
+
+    grids = {name: getattr(args, name) for name in PARAMETERS if getattr(args, name)}
+    if not grids:
+        parser.error("give at least one parameter grid, e.g. --elasticity 0.8:1.6:9")
+
+    products = po.load_products()
+    frames = po.catalog_frames(
+        [(row["Product ID"], name, category, prices, info) for row, name, category, prices, info in products]
+    )
+    table = sweep(*frames, grids, categories=args.categories, workers=args.workers)
+    table.to_csv(args.out, index=False, float_format="%.4f")
+    n_scenarios = table["scenario"].nunique() if len(table) else 0
+    print(f"Saved {len(table)} rows ({n_scenarios} scenarios) to {str(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
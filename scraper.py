@@ -1,16 +1,25 @@
 #!/usr/bin/env python3
 """Scrape competitor pricing data for each product category."""
+import argparse
+import asyncio
 import json
 import logging
-import random
 import re
+import threading
 import time
 import urllib.parse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Tuple
 
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+
+import catalog_db
+import competitor_store
+import extractors
+from history import PageState, PriceHistory, utc_now
+from http_cache import DEFAULT_TTL, ResponseCache
 from utils import canonical_key
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -27,6 +36,27 @@ logger = logging.getLogger(__name__)
 SCRAPING_FISH_API_KEY = "p78IIwfssgglRGGvhdw6Aj8wwZKMinBpAD8y436l5ha3drW6gn9yfyRiDrSmFiwmUi3GF4dHR9F43LJRDo"
 SCRAPING_FISH_BASE_URL = "https://scraping.narf.ai/api/v1/"
 
+# Per-store politeness. Each store gets its own token bucket so requests to
+# one shop never wait on another. The default rate of one request every three
+# seconds matches the old ``random.uniform(2, 4)`` sleep between terms. A store
+# config may override these with ``rate``, ``burst`` and ``concurrency`` keys.
+STORE_RATE = 1 / 3  # requests per second
+STORE_BURST = 1
+STORE_CONCURRENCY = 2
+
+# Raw pages waiting for a parser process. Fetchers block once this many are
+# queued, so memory stays bounded when parsing falls behind.
+PARSE_QUEUE_SIZE = 32
+PARSE_QUEUE_REPORT_INTERVAL = 10.0  # seconds between queue depth log lines
+
+DEFAULT_STORES = {
+    "Made Trade": {"url": "https://www.madetrade.com", "search_pattern": "/search?q={}"},
+    "EarthHero": {"url": "https://earthhero.com", "search_pattern": "/search?q={}"},
+    "Package Free Shop": {"url": "https://packagefreeshop.com", "search_pattern": "/search?q={}"},
+    "Ten Thousand Villages": {"url": "https://www.tenthousandvillages.com", "search_pattern": "/search?q={}"},
+    "Zero Waste Store": {"url": "https://zerowastestoreonline.com", "search_pattern": "/search?q={}"},
+}
+
 
 def sanitize_filename(text: str) -> str:
     base = re.sub(r"\W+", "_", text.lower()).strip("_")
@@ -152,24 +182,181 @@ DEFAULT_CATEGORIES = {
 }
 
 
+class TokenBucket:
+    """Thread-safe token bucket pacing the requests sent to one store."""
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds the caller must wait.
+
+        Tokens may go negative so concurrent callers queue up behind each
+        other instead of all waking at the same moment.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def wait(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def term_key(term: str) -> str:
+    """Normalise a search term so equivalent spellings share one request."""
+    return " ".join(term.lower().split())
+
+
+class ScrapePlan(NamedTuple):
+    """Unique fetches for a run keyed by ``(store, term_key)``."""
+
+    fetches: Dict[Tuple[str, str], str]
+    requested: int
+
+    @property
+    def saved(self) -> int:
+        return self.requested - len(self.fetches)
+
+
+def dedupe_products(products: Iterable[Dict]) -> List[Dict]:
+    """Drop near-duplicate listings that share a name prefix and price."""
+    unique = []
+    seen = set()
+    for p in products:
+        key = (p["name"].lower()[:20], round(p["price"], 0))
+        if key not in seen:
+            seen.add(key)
+            unique.append(p)
+    return unique
+
+
+class ParsePipeline:
+    """Bounded queue feeding raw pages to a pool of parser processes.
+
+    Fetchers ``await parse(...)``; when the queue is full they block, which
+    keeps downloads from racing ahead of parsing. ``depth`` and
+    ``max_depth`` expose the current and peak backlog.
+    """
+
+    def __init__(self, workers: int, maxsize: int = PARSE_QUEUE_SIZE) -> None:
+        self.workers = workers
+        self.queue = asyncio.Queue(maxsize)
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.tasks: List[asyncio.Task] = []
+        self.max_depth = 0
+        self.parsed = 0
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def start(self) -> None:
+        self.tasks = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+        self.tasks.append(asyncio.create_task(self._report()))
+
+    async def parse(self, body, term, store_name) -> List[Dict]:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((body, term, store_name, future))
+        self.max_depth = max(self.max_depth, self.depth)
+        return await future
+
+    async def _consume(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            body, term, store_name, future = await self.queue.get()
+            try:
+                products = await loop.run_in_executor(
+                    self.executor, extractors.extract_products, body, term, store_name
+                )
+                self.parsed += 1
+                future.set_result(products)
+            except Exception as exc:
+                future.set_exception(exc)
+            finally:
+                self.queue.task_done()
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(PARSE_QUEUE_REPORT_INTERVAL)
+            logger.info(
+                "Parse queue depth %d/%d (peak %d), %d pages parsed",
+                self.depth,
+                self.queue.maxsize,
+                self.max_depth,
+                self.parsed,
+            )
+
+    async def close(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.executor.shutdown()
+
+
 class ProductScraper:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        stores: Dict[str, Dict] | None = None,
+        csv_dir: Path = DATA_DIR,
+        scraping_fish_url: str | None = SCRAPING_FISH_BASE_URL,
+        cache: ResponseCache | None = None,
+        incremental: bool = False,
+        store_dir: Path | None = competitor_store.STORE_DIR,
+        db_path: Path | None = None,
+    ) -> None:
         self.session = requests.Session()
+        # Optional response cache shared by both fetch paths
+        self.cache = cache
 
-        self.stores = {
-            "Made Trade": {"url": "https://www.madetrade.com", "search_pattern": "/search?q={}"},
-            "EarthHero": {"url": "https://earthhero.com", "search_pattern": "/search?q={}"},
-            "Package Free Shop": {"url": "https://packagefreeshop.com", "search_pattern": "/search?q={}"},
-            "Ten Thousand Villages": {"url": "https://www.tenthousandvillages.com", "search_pattern": "/search?q={}"},
-            "Zero Waste Store": {"url": "https://zerowastestoreonline.com", "search_pattern": "/search?q={}"},
+        # ``stores`` and ``scraping_fish_url`` can be overridden to point the
+        # scraper at a local stand-in server; ``None`` disables the proxy.
+        self.stores = dict(DEFAULT_STORES if stores is None else stores)
+        self.scraping_fish_url = scraping_fish_url
+        # Keep enough pooled connections for every concurrent fetch thread
+        pool_size = max(10, sum(
+            cfg.get("concurrency", STORE_CONCURRENCY) for cfg in self.stores.values()
+        ))
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.limiters = {
+            name: TokenBucket(
+                cfg.get("rate", STORE_RATE), cfg.get("burst", STORE_BURST)
+            )
+            for name, cfg in self.stores.items()
         }
 
         self.product_categories = self.load_categories()
 
-        self.csv_dir = DATA_DIR
+        self.csv_dir = Path(csv_dir)
         self.csv_dir.mkdir(exist_ok=True)
+        # Columnar snapshots for the optimizer; ``None`` writes CSVs only
+        self.store_dir = store_dir
+        # SQLite catalog that also records the observations (only once it
+        # has been created); ``None``, the default, writes files only
+        self.db_path = db_path
         self.results_by_category = {cat: [] for cat in self.product_categories}
 
+        # Incremental mode skips parsing pages whose fingerprint is unchanged
+        # and appends fresh observations to a per-category history log.
+        self.page_state = PageState(self.csv_dir / ".page_state.json") if incremental else None
+        self.history = PriceHistory(self.csv_dir / "history") if incremental else None
+        self.changed_pages = set()
+        self.unchanged_pages = 0
+
     def load_categories(self):
         """Return merged categories from defaults and keywords."""
         merged = {}
@@ -210,56 +397,75 @@ class ProductScraper:
         }
 
     def clean_price(self, price_text):
-        if not price_text:
-            return None
-        m = re.search(r"(\$|€|£|Rs\.?|USD)?\s*(\d+[\.,]\d+|\d+)", price_text)
-        if m:
-            val = m.group(2).replace(",", ".")
-            try:
-                return float(val)
-            except ValueError:
-                return None
-        return None
+        return extractors.clean_price(price_text)
 
     def clean_product_name(self, name):
-        if not name:
-            return None
-        name = name.strip()
-        if len(name) < 3:
-            return None
-        if not re.search(r"[a-zA-Z]", name):
+        return extractors.clean_product_name(name)
+
+    def extract_products_from_html(self, html, search_term, store_name=None):
+        """Parse a search page, falling back to the generic price-text walk."""
+        return extractors.extract_products(html, search_term, store_name)
+
+    def cached_page(self, body, term, store_name, source):
+        """Return products stored for an unchanged page, or ``None``."""
+        if self.page_state is None:
             return None
-        return name
+        products = self.page_state.lookup(store_name, term_key(term), source, body)
+        if products is not None:
+            self.unchanged_pages += 1
+            logger.info("Unchanged page for '%s' in %s, skipping parse", term, store_name)
+        return products
 
-    def extract_products_from_html(self, html, search_term):
-        products = []
-        soup = BeautifulSoup(html, "html.parser")
-        price_elems = soup.find_all(string=re.compile(r"\$\s*\d+"))
-        for price_elem in price_elems:
-            parent = price_elem.parent
-            for _ in range(3):
-                if parent and parent.parent:
-                    parent = parent.parent
-            if not parent:
-                continue
-            name_elems = parent.find_all(["h1", "h2", "h3", "h4", "a", "span", "div"])
-            product_name = None
-            for elem in name_elems:
-                text = elem.get_text(strip=True)
-                if len(text) > 3 and "$" not in text:
-                    product_name = self.clean_product_name(text)
-                    if product_name:
-                        break
-            if not product_name:
-                continue
-            price = self.clean_price(price_elem)
-            if product_name and price and price > 0:
-                products.append({"name": product_name, "price": price, "search_term": search_term})
+    def remember_page(self, body, term, store_name, source, products):
+        self.changed_pages.add((store_name, term_key(term)))
+        if self.page_state is not None:
+            self.page_state.update(store_name, term_key(term), source, body, products)
+
+    def parse_page(self, body, term, store_name, source):
+        products = self.cached_page(body, term, store_name, source)
+        if products is None:
+            products = self.extract_products_from_html(body, term, store_name)
+            self.remember_page(body, term, store_name, source, products)
         return products
 
-    def scrape_with_scrapingfish(self, store_name, store_cfg, term):
-        """Scrape using Scraping Fish API."""
-        products = []
+    def throttle(self, store_name):
+        """Block until the store's rate limiter allows another request."""
+        limiter = self.limiters.get(store_name)
+        if limiter:
+            limiter.wait()
+
+    def fetch(self, store_name, target_url, request_url=None, params=None, timeout=10, variant=""):
+        """Return ``(status_code, body)`` for ``target_url``.
+
+        Fresh cache entries are served without touching the network or the
+        store's rate limiter. Stale entries are revalidated with their
+        ``ETag``/``Last-Modified`` validators.
+        """
+        cache = self.cache
+        headers = {}
+        if cache:
+            body = cache.get(target_url, variant)
+            if body is not None:
+                logger.info("Cache hit: %s", target_url)
+                return 200, body
+            headers = cache.conditional_headers(target_url, variant)
+
+        self.throttle(store_name)
+        resp = self.session.get(
+            request_url or target_url, params=params, headers=headers, timeout=timeout
+        )
+        if resp.status_code == 304 and cache:
+            body = cache.revalidated(target_url, variant)
+            if body is not None:
+                return 200, body
+        if resp.status_code == 200 and cache:
+            cache.put(target_url, resp.content, resp.headers, variant)
+        return resp.status_code, resp.content
+
+    def fetch_with_scrapingfish(self, store_name, store_cfg, term):
+        """Return the raw search page fetched through Scraping Fish, or ``None``."""
+        if not self.scraping_fish_url:
+            return None
         try:
             # Construct the target URL with search term
             target_url = store_cfg["url"] + store_cfg["search_pattern"].format(urllib.parse.quote(term))
@@ -272,58 +478,83 @@ class ProductScraper:
             }
             
             logger.info("Scraping Fish requesting: %s", target_url)
-            response = self.session.get(SCRAPING_FISH_BASE_URL, params=params, timeout=30)
+            status, body = self.fetch(
+                store_name,
+                target_url,
+                request_url=self.scraping_fish_url,
+                params=params,
+                timeout=30,
+                variant="scrapingfish",
+            )
             
-            if response.status_code == 200:
-                products = self.extract_products_from_html(response.content, term)
-                logger.info("Found %d products via Scraping Fish", len(products))
-            else:
-                logger.error("Scraping Fish API error: %s", response.status_code)
+            if status == 200:
+                return body
+            logger.error("Scraping Fish API error: %s", status)
         except Exception as exc:
             logger.error("Error with Scraping Fish API: %s", exc)
-        return products
+        return None
 
-    def scrape_with_requests(self, store_name, store_cfg, term):
-        products = []
+    def fetch_with_requests(self, store_name, store_cfg, term):
+        """Return the raw search page fetched directly, or ``None``."""
         try:
             url = store_cfg["url"] + store_cfg["search_pattern"].format(urllib.parse.quote(term))
             logger.info("Requesting: %s", url)
-            resp = self.session.get(url, timeout=10)
-            if resp.status_code == 200:
-                products = self.extract_products_from_html(resp.content, term)
-                logger.info("Found %d products via requests", len(products))
+            status, body = self.fetch(store_name, url)
+            if status == 200:
+                return body
         except Exception as exc:
             logger.error("Error with requests: %s", exc)
+        return None
+
+    def scrape_with_scrapingfish(self, store_name, store_cfg, term):
+        """Scrape using Scraping Fish API."""
+        products = []
+        body = self.fetch_with_scrapingfish(store_name, store_cfg, term)
+        if body is not None:
+            products = self.parse_page(body, term, store_name, "scrapingfish")
+            logger.info("Found %d products via Scraping Fish", len(products))
         return products
 
-    def scrape_store(self, store_name, store_cfg, category, terms):
-        all_products = []
-        for term in terms:
-            logger.info("Searching for '%s' in %s", term, store_name)
-            
-            # Try Scraping Fish API first, fallback to requests if needed
-            products = self.scrape_with_scrapingfish(store_name, store_cfg, term)
-            if not products:
-                logger.info("Scraping Fish failed, trying direct requests...")
-                products = self.scrape_with_requests(store_name, store_cfg, term)
-            
-            if products:
-                all_products.extend(products)
-            
-            # Add delay to be respectful to the API
-            time.sleep(random.uniform(2, 4))
-            
-        unique = []
-        seen = set()
-        for p in all_products:
-            key = (p["name"].lower()[:20], round(p["price"], 0))
-            if key not in seen:
-                seen.add(key)
-                unique.append(p)
-        return unique
+    def scrape_with_requests(self, store_name, store_cfg, term):
+        products = []
+        body = self.fetch_with_requests(store_name, store_cfg, term)
+        if body is not None:
+            products = self.parse_page(body, term, store_name, "direct")
+            logger.info("Found %d products via requests", len(products))
+        return products
 
-    def scrape_all_stores(self):
-        logger.info("Starting product scraping...")
+    def scrape_term(self, store_name, store_cfg, term):
+        logger.info("Searching for '%s' in %s", term, store_name)
+
+        # Try Scraping Fish API first, fallback to requests if needed
+        products = self.scrape_with_scrapingfish(store_name, store_cfg, term)
+        if not products:
+            logger.info("Scraping Fish failed, trying direct requests...")
+            products = self.scrape_with_requests(store_name, store_cfg, term)
+        return products
+
+    def record_products(self, category, store_name, store_cfg, products):
+        for product in products:
+            self.results_by_category[category].append(
+                {
+                    "category": category,
+                    "store": store_name,
+                    "product_name": product["name"],
+                    "price": product["price"],
+                    "search_term": product["search_term"],
+                    "store_url": store_cfg["url"],
+                }
+            )
+
+    def plan_requests(self):
+        """Collect the unique (store, term) fetches needed for this run.
+
+        Several categories share search terms, so each pair is fetched once
+        and its products are fanned out to every category that asked for it.
+        Terms are matched case-insensitively after trimming whitespace.
+        """
+        fetches = {}
+        requested = 0
         for category, info in self.product_categories.items():
             terms = info["search_terms"]
             if not terms:
@@ -331,32 +562,152 @@ class ProductScraper:
                     "No search terms for category '%s', skipping", category
                 )
                 continue
+            for store_name in self.stores:
+                for term in terms:
+                    requested += 1
+                    fetches.setdefault((store_name, term_key(term)), term)
+        plan = ScrapePlan(fetches, requested)
+        logger.info(
+            "Planned %d unique requests for %d category lookups (%d saved)",
+            len(plan.fetches),
+            plan.requested,
+            plan.saved,
+        )
+        return plan
+
+    def fan_out(self, pages):
+        """Distribute fetched pages to every category that requested them.
+
+        ``pages`` maps ``(store, term_key)`` to the products parsed from that
+        page. Categories are filled in the same category/store/term order as
+        a sequential crawl so the CSVs are stable between modes.
+        """
+        for category, info in self.product_categories.items():
+            terms = info["search_terms"]
             for store_name, store_cfg in self.stores.items():
-                logger.info("Checking %s...", store_name)
+                all_products = []
+                for term in terms:
+                    for product in pages.get((store_name, term_key(term)), []):
+                        all_products.append({**product, "search_term": term})
+                self.record_products(
+                    category, store_name, store_cfg, dedupe_products(all_products)
+                )
+
+    def scrape_all_stores(self):
+        logger.info("Starting product scraping...")
+        plan = self.plan_requests()
+        pages = {}
+        for (store_name, key), term in plan.fetches.items():
+            store_cfg = self.stores[store_name]
+            try:
+                pages[(store_name, key)] = self.scrape_term(store_name, store_cfg, term)
+            except requests.exceptions.RequestException as exc:
+                logger.error("Network error with %s: %s", store_name, exc)
+            except Exception as exc:
+                logger.error("Error scraping %s for '%s': %s", store_name, term, exc)
+        self.fan_out(pages)
+        return plan
+
+    async def scrape_all_stores_async(self, parse_workers=0, queue_size=PARSE_QUEUE_SIZE):
+        """Scrape every store in parallel while keeping per-store politeness.
+
+        Each store has its own token bucket and at most ``concurrency``
+        requests in flight. The blocking ``requests`` calls run in a thread
+        pool; results are recorded in the same category/store order as
+        :meth:`scrape_all_stores` so the CSVs come out identical.
+
+        With ``parse_workers`` > 0, fetch threads only download pages and a
+        :class:`ParsePipeline` of worker processes parses them, so network
+        waits and parsing overlap across all cores.
+        """
+        logger.info("Starting concurrent product scraping...")
+        plan = self.plan_requests()
+        loop = asyncio.get_running_loop()
+        limits = {
+            name: cfg.get("concurrency", STORE_CONCURRENCY)
+            for name, cfg in self.stores.items()
+        }
+        semaphores = {name: asyncio.Semaphore(n) for name, n in limits.items()}
+        workers = sum(limits.values()) or 1
+        pipeline = ParsePipeline(parse_workers, queue_size) if parse_workers > 0 else None
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+
+            async def download(fetcher, store_name, store_cfg, term):
+                async with semaphores[store_name]:
+                    return await loop.run_in_executor(pool, fetcher, store_name, store_cfg, term)
+
+            async def parse(body, term, store_name, source):
+                products = self.cached_page(body, term, store_name, source)
+                if products is None:
+                    products = await pipeline.parse(body, term, store_name)
+                    self.remember_page(body, term, store_name, source, products)
+                return products
+
+            async def fetch_and_parse(store_name, store_cfg, term):
+                logger.info("Searching for '%s' in %s", term, store_name)
+                products = []
+                body = await download(self.fetch_with_scrapingfish, store_name, store_cfg, term)
+                if body is not None:
+                    products = await parse(body, term, store_name, "scrapingfish")
+                if not products:
+                    body = await download(self.fetch_with_requests, store_name, store_cfg, term)
+                    if body is not None:
+                        products = await parse(body, term, store_name, "direct")
+                return products
+
+            async def fetch(store_name, term):
+                store_cfg = self.stores[store_name]
                 try:
-                    products = self.scrape_store(store_name, store_cfg, category, terms)
-                    for product in products:
-                        self.results_by_category[category].append(
-                            {
-                                "category": category,
-                                "store": store_name,
-                                "product_name": product["name"],
-                                "price": product["price"],
-                                "search_term": product["search_term"],
-                                "store_url": store_cfg["url"],
-                            }
+                    if pipeline:
+                        return await fetch_and_parse(store_name, store_cfg, term)
+                    async with semaphores[store_name]:
+                        return await loop.run_in_executor(
+                            pool, self.scrape_term, store_name, store_cfg, term
                         )
                 except requests.exceptions.RequestException as exc:
                     logger.error("Network error with %s: %s", store_name, exc)
                 except Exception as exc:
-                    logger.error("Error scraping %s for %s: %s", store_name, category, exc)
-                time.sleep(random.uniform(2.0, 4.0))
+                    logger.error("Error scraping %s for '%s': %s", store_name, term, exc)
+                return []
+
+            keys = list(plan.fetches)
+            if pipeline:
+                pipeline.start()
+            try:
+                results = await asyncio.gather(
+                    *(fetch(store_name, plan.fetches[(store_name, key)]) for store_name, key in keys)
+                )
+            finally:
+                if pipeline:
+                    await pipeline.close()
+
+        if pipeline:
+            logger.info(
+                "Parsed %d pages; peak parse queue depth %d/%d",
+                pipeline.parsed,
+                pipeline.max_depth,
+                queue_size,
+            )
+        self.fan_out(dict(zip(keys, results)))
+        return plan
 
     def save_category_csvs(self):
         saved = []
+        scraped_at = utc_now()
+        appended = 0
         for category, products in self.results_by_category.items():
             csv_name = self.product_categories[category]["csv_filename"]
             path = self.csv_dir / csv_name
+            if self.history is not None:
+                appended += self.history.append(
+                    csv_name,
+                    (
+                        p for p in products
+                        if (p["store"], term_key(p["search_term"])) in self.changed_pages
+                    ),
+                    scraped_at,
+                )
             if products:
                 df = pd.DataFrame(products)
                 df.to_csv(path, index=False)
@@ -364,16 +715,60 @@ class ProductScraper:
             else:
                 pd.DataFrame(columns=["category", "store", "product_name", "price", "search_term", "store_url"]).to_csv(path, index=False)
                 logger.info("Created empty file: %s", str(path))
+            if self.store_dir is not None:
+                competitor_store.write_snapshot(
+                    Path(csv_name).stem, products, store_dir=self.store_dir
+                )
+            if self.db_path is not None:
+                catalog_db.record("observations", path, products, scraped_at, path=self.db_path)
             saved.append(path)
         print("\nCategory files created:")
         for p in saved:
             count = len(pd.read_csv(p)) if p.exists() else 0
             print(f"  • {p.name}: {count} products")
         print(f"\nAll files saved to: {str(self.csv_dir)}/ directory")
+        if self.page_state is not None:
+            self.page_state.save()
+            print(
+                f"Incremental: {len(self.changed_pages)} pages changed, "
+                f"{self.unchanged_pages} unchanged; {appended} observations "
+                f"appended to {str(self.history.directory)}/"
+            )
 
 
-def main():
-    scraper = ProductScraper()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="scrape all stores in parallel with per-store rate limits",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        help="parse pages in this many worker processes (implies --concurrent)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only re-parse changed pages and append observations to product_data/history/",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_TTL,
+        help="seconds a cached response is reused without refetching",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always fetch pages from the network",
+    )
+    args = parser.parse_args(argv)
+
+    cache = None if args.no_cache else ResponseCache(ttl=args.cache_ttl)
+    scraper = ProductScraper(cache=cache, incremental=args.incremental, db_path=catalog_db.DB_PATH)
     print(
         "Starting Category-Specific Product Scraper\n"
         f"Searching {len(scraper.product_categories)} product categories across {len(scraper.stores)} stores\n"
@@ -381,8 +776,22 @@ def main():
     for cat, info in scraper.product_categories.items():
         print(f"  • {cat}: {info['csv_filename']}")
     print()
-    scraper.scrape_all_stores()
+    if args.concurrent or args.parse_workers > 0:
+        plan = asyncio.run(scraper.scrape_all_stores_async(parse_workers=args.parse_workers))
+    else:
+        plan = scraper.scrape_all_stores()
     scraper.save_category_csvs()
+    print(
+        f"Fetched {len(plan.fetches)} unique pages for {plan.requested} "
+        f"category lookups ({plan.saved} requests saved)"
+    )
+    if cache:
+        cache.flush()
+        stats = cache.stats()
+        print(
+            f"HTTP cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['revalidations']} revalidated, {stats['entries']} entries"
+        )
 
 
 if __name__ == "__main__":
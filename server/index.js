@@ -249,6 +249,42 @@ const mockScrapeStore = async (storeName, products) => {
   })
 }
 
+// Resident Python pricing service (python pricing_service.py); the mock
+// below is only used when it is not running
+const PRICING_SERVICE_URL = process.env.PRICING_SERVICE_URL || 'http://127.0.0.1:8765'
+
+const serviceOptimizePrices = async (productList) => {
+  const { data } = await axios.post(`${PRICING_SERVICE_URL}/quote/batch`, {
+    products: productList.map(product => {
+      const competitorPrices = scrapingStatus.results.filter(r =>
+        r.category.toLowerCase() === product.category.toLowerCase()
+      )
+      return {
+        id: product.id,
+        name: product.name,
+        category: product.category,
+        currentPrice: parseFloat(product.currentPrice),
+        unitCost: parseFloat(product.unitCost),
+        // without fresh scrape results the service uses its own competitor data
+        ...(competitorPrices.length > 0 && { competitorPrices })
+      }
+    })
+  }, { timeout: 5000 })
+
+  return data.quotes.map(quote => ({
+    productName: quote.productName,
+    productId: quote.productId,
+    category: quote.category,
+    currentPrice: quote.currentPrice.toFixed(2),
+    recommendedPrice: quote.recommendedPrice.toFixed(2),
+    priceChange: quote.priceChange.toFixed(1),
+    profitImpact: quote.profitDelta.toFixed(2),
+    confidence: Math.abs(quote.priceChange) > 10 ? 'High' : 'Medium',
+    competitorCount: quote.competitorCount,
+    avgCompetitorPrice: quote.avgCompetitorPrice.toFixed(2)
+  }))
+}
+
 // Mock optimization function
 const mockOptimizePrice = (product, competitorPrices) => {
   const currentPrice = parseFloat(product.currentPrice)
@@ -542,14 +578,19 @@ app.post('/api/scraper/stop', (req, res) => {
 app.post('/api/optimizer/start', async (req, res) => {
   try {
     const { products: productList, settings } = req.body
-    
-    // Mock optimization process
-    const recommendations = productList.map(product => {
-      const competitorPrices = scrapingStatus.results.filter(r => 
-        r.category.toLowerCase() === product.category.toLowerCase()
-      )
-      return mockOptimizePrice(product, competitorPrices)
-    })
+
+    let recommendations
+    try {
+      recommendations = await serviceOptimizePrices(productList)
+    } catch (error) {
+      console.warn(`Pricing service unavailable (${error.message}), using mock optimizer`)
+      recommendations = productList.map(product => {
+        const competitorPrices = scrapingStatus.results.filter(r =>
+          r.category.toLowerCase() === product.category.toLowerCase()
+        )
+        return mockOptimizePrice(product, competitorPrices)
+      })
+    }
 
     const totalProfitIncrease = recommendations.reduce((sum, rec) => 
       sum + parseFloat(rec.profitImpact), 0